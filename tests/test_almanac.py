@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+from yaegi.calculations.panchang import PanchangGenerator
+from yaegi.core.almanac import Almanac
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.boundaries import solve_panchang_timelines
+from yaegi.core.conversions import datetime_to_julian_day
+
+
+class TestAlmanac:
+    def setup_method(self):
+        self.almanac = Almanac.build(2023, 2025)
+        self.jd = datetime_to_julian_day(datetime(2024, 5, 17, 9, 30))
+
+    def test_lookup_matches_solver(self):
+        timelines = solve_panchang_timelines(AstronomyEngine(), self.jd, self.jd)
+        for name, timeline in timelines.items():
+            index, start, end = self.almanac.element_at(name, self.jd)
+            expected = timeline.at(self.jd)
+            assert index == expected[0]
+            assert start == pytest.approx(expected[1], abs=2 / 86400)
+            assert end == pytest.approx(expected[2], abs=2 / 86400)
+
+    def test_first_boundaries_before_epoch_day(self):
+        # Both years open in a nakshatra that began over a day before Jan 1
+        engine = AstronomyEngine()
+        for year in (2007, 2017):
+            almanac = Almanac.build(year, year)
+            timelines = solve_panchang_timelines(
+                engine, almanac.start_jd, almanac.end_jd
+            )
+            for name in ("tithi", "nakshatra"):
+                start = almanac.element_at(name, almanac.start_jd)[1]
+                assert start == pytest.approx(timelines[name].starts[0], abs=2 / 86400)
+
+    def test_pack_rejects_out_of_range_boundaries(self):
+        with pytest.raises(ValueError):
+            Almanac._pack(np.array([self.jd - 1.0, self.jd]), self.jd)
+
+    def test_save_and_memory_map(self, tmp_path):
+        path = str(tmp_path / "almanac.bin")
+        self.almanac.save(path)
+        loaded = Almanac.load(path)
+        assert (loaded.start_year, loaded.end_year) == (2023, 2025)
+        for name in self.almanac.ticks:
+            assert (loaded.ticks[name] == self.almanac.ticks[name]).all()
+        assert loaded.element_at("tithi", self.jd) == self.almanac.element_at(
+            "tithi", self.jd
+        )
+
+    def test_extend_matches_fresh_build(self):
+        extended = Almanac.build(2024, 2024).extended(2023, 2025)
+        for name in self.almanac.ticks:
+            assert (extended.ticks[name] == self.almanac.ticks[name]).all()
+            assert (extended.indices[name] == self.almanac.indices[name]).all()
+
+    def test_outside_coverage(self):
+        with pytest.raises(ValueError):
+            self.almanac.element_at("tithi", self.jd + 3 * 365)
+
+    def test_panchang_generator_uses_almanac(self):
+        generator = PanchangGenerator(almanac=self.almanac)
+        moment = datetime(2024, 5, 17, 9, 30, tzinfo=timezone.utc)
+        elements = generator.get_elements_at(moment)
+        solved = PanchangGenerator(almanac=Almanac.build(1990, 1990))
+        assert elements["nakshatra"]["number"] == solved.get_elements_at(moment)[
+            "nakshatra"
+        ]["number"]
+        for element in elements.values():
+            assert element["start"] <= moment.isoformat() < element["end"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from yaegi.core import ashtakavarga
+from yaegi.core.ashtakavarga import (
+    ASHTAKAVARGA_PLANETS,
+    BINDU_HOUSES,
+    BINDU_TOTALS,
+    REFERENCES,
+    bhinnashtakavarga,
+    reference_signs,
+    sarvashtakavarga,
+    transit_bindus,
+)
+from yaegi.core.mathutils import calculate_ashtakavarga_points
+
+
+class TestAshtakavarga:
+    def setup_method(self):
+        rng = np.random.default_rng(13)
+        self.positions = {name: rng.uniform(0, 360, 30) for name in REFERENCES}
+        self.signs = reference_signs(self.positions)
+
+    def test_classical_totals(self):
+        assert BINDU_TOTALS.tolist() == [48, 49, 39, 54, 56, 52, 39]
+        bhinna = bhinnashtakavarga(self.signs)
+        assert bhinna.shape == (30, 7, 12)
+        assert (bhinna.sum(axis=-1) == BINDU_TOTALS).all()
+        assert (sarvashtakavarga(bhinna).sum(axis=-1) == 337).all()
+        assert bhinna.max() <= 8
+
+    def test_masks_agree_with_counting_houses(self):
+        bhinna = bhinnashtakavarga(self.signs)
+        for chart in range(5):
+            for p, planet in enumerate(ASHTAKAVARGA_PLANETS):
+                expected = np.zeros(12, dtype=int)
+                for r, reference in enumerate(REFERENCES):
+                    for house in BINDU_HOUSES[planet][reference]:
+                        expected[(self.signs[chart, r] + house - 1) % 12] += 1
+                assert bhinna[chart, p].tolist() == expected.tolist()
+
+    def test_single_chart_and_transits(self):
+        single = {name: float(values[0]) for name, values in self.positions.items()}
+        bhinna = bhinnashtakavarga(reference_signs(single))
+        assert np.array_equal(bhinna, bhinnashtakavarga(self.signs)[0])
+        sarva = sarvashtakavarga(bhinna)
+        lagna = int(single["Ascendant"] // 30)
+        assert calculate_ashtakavarga_points(single, 1) == sarva[lagna]
+        assert calculate_ashtakavarga_points(single, 12) == sarva[(lagna + 11) % 12]
+
+        transits = np.arange(7)
+        assert transit_bindus(bhinna, transits).tolist() == [
+            bhinna[p, p] for p in range(7)
+        ]
+
+    def test_points_default_ascendant_and_name_missing_planets(self):
+        planets = {
+            name: float(self.positions[name][0]) for name in ASHTAKAVARGA_PLANETS
+        }
+        assert calculate_ashtakavarga_points(
+            planets, 3
+        ) == calculate_ashtakavarga_points({**planets, "Ascendant": 0.0}, 3)
+        del planets["Saturn"]
+        with pytest.raises(ValueError, match="Saturn"):
+            calculate_ashtakavarga_points(planets, 1)
+
+    def test_rotation_wraps_within_twelve_bits(self):
+        rotated = ashtakavarga.rotate_masks(np.array([0b100000000001]), np.array([1]))
+        assert rotated.tolist() == [0b000000000011]
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from yaegi.calculations.compatibility import (
+    GUNA_TABLE,
+    KUTA_NAMES,
+    PADA_COUNT,
+    CompatibilityAnalyzer,
+    pada_index,
+    pada_nakshatra_rashi,
+)
+from yaegi.calculations.kundali import KundaliGenerator
+
+
+class TestGunaTable:
+    def setup_method(self):
+        self.analyzer = CompatibilityAnalyzer()
+
+    def test_table_matches_kuta_methods(self):
+        rng = np.random.default_rng(5)
+        for male, female in rng.integers(0, PADA_COUNT, size=(300, 2)):
+            male_nakshatra, male_rashi = pada_nakshatra_rashi(int(male))
+            female_nakshatra, female_rashi = pada_nakshatra_rashi(int(female))
+            expected = {}
+            for name in KUTA_NAMES:
+                method = getattr(self.analyzer, f"calculate_{name}")
+                if name in ("vashya", "graha_maitri", "bhakoot"):
+                    expected[name] = method(male_rashi, female_rashi)["points"]
+                else:
+                    expected[name] = method(male_nakshatra, female_nakshatra)["points"]
+            assert GUNA_TABLE.kuta_points(male, female) == expected
+            assert GUNA_TABLE.score(male, female) == sum(expected.values())
+            nadi_dosha = bool(GUNA_TABLE.doshas[male, female] & 1)
+            assert nadi_dosha == (expected["nadi"] == 0)
+
+    def test_pada_index(self):
+        assert list(pada_index(np.array([0.0, 3.34, 359.99, 360.0]))) == [0, 1, 107, 0]
+        # Pada 8 is the last of Aries, pada 9 the first of Taurus
+        assert pada_nakshatra_rashi(8) == (3, 1)
+        assert pada_nakshatra_rashi(9) == (3, 2)
+
+    def test_analyze_compatibility(self):
+        generator = KundaliGenerator()
+        male = generator.generate_chart(
+            datetime(1990, 5, 15, 10, 30, tzinfo=timezone.utc), 28.61, 77.21
+        )
+        female = generator.generate_chart(
+            datetime(1992, 8, 20, 14, 15, tzinfo=timezone.utc), 19.08, 72.88
+        )
+        full = self.analyzer.analyze_compatibility(male, female)
+        brief = self.analyzer.analyze_compatibility(male, female, details=False)
+        assert "details" not in brief and "recommendations" not in brief
+        assert brief["total_points"] == full["total_points"]
+        assert full["total_points"] == sum(
+            kuta["points"] for kuta in full["details"].values()
+        )
+        assert full["doshas"]["nadi"] == (full["details"]["nadi"]["points"] == 0)
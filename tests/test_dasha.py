@@ -0,0 +1,269 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from yaegi.calculations.dasha import (
+    DASHA_LEVELS,
+    DASHA_SYSTEMS,
+    DAYS_PER_YEAR,
+    DashaCalculator,
+    DashaTree,
+)
+from yaegi.calculations.kundali import KundaliGenerator
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.boundaries import solve_transit_timeline
+from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.core.intervals import IntervalIndex
+from yaegi.models.dasha import VimshottariDasha
+
+
+class TestDashaTree:
+    def setup_method(self):
+        chart = KundaliGenerator().generate_chart(
+            birth_date=datetime(1990, 5, 15, 14, 30),
+            latitude=28.6139,
+            longitude=77.2090,
+        )
+        self.calculator = DashaCalculator()
+        self.dasha = self.calculator.calculate_vimshottari_dasha(chart)
+        self.tree = self.calculator.get_dasha_tree(self.dasha)
+
+    def test_tree_is_cached_on_dasha_system(self):
+        assert self.calculator.get_dasha_tree(self.dasha) is self.tree
+
+    def test_subperiods_tile_their_parent(self):
+        for mahadasha in self.dasha.periods[:3]:
+            children = self.calculator.calculate_subperiods(mahadasha, 1)
+            assert children[0].start_date == mahadasha.start_date
+            assert children[-1].end_date == mahadasha.end_date
+            for previous, current in zip(children, children[1:]):
+                assert previous.end_date == current.start_date
+
+    def test_first_mahadasha_is_clipped_at_birth(self):
+        first = self.dasha.periods[0]
+        children = self.calculator.calculate_antardasha(first)
+        assert len(children) <= 9
+        assert children[0].start_date == self.dasha.birth_date
+
+    def test_active_chain_matches_linear_scan(self):
+        date = datetime(2024, 3, 1)
+        chain = self.tree.active_chain(date, depth=5)
+        assert [period.level for period in chain] == list(DASHA_LEVELS)
+        periods = self.dasha.periods
+        for level, period in enumerate(chain):
+            assert period.start_date <= date < period.end_date
+            expected = [p for p in periods if p.start_date <= date < p.end_date]
+            assert [(p.planet, p.start_date, p.end_date) for p in expected] == [
+                (period.planet, period.start_date, period.end_date)
+            ]
+            periods = self.calculator.calculate_subperiods(period, level + 1)
+
+    def test_get_current_dasha_depth(self):
+        current = self.calculator.get_current_dasha(
+            self.dasha, datetime(2024, 3, 1), depth=3
+        )
+        assert current["mahadasha"]["planet"]
+        assert current["antardasha"]["parent_dasha"] == current["mahadasha"]["planet"]
+        assert (
+            current["pratyantardasha"]["parent_dasha"]
+            == current["antardasha"]["planet"]
+        )
+        assert "sookshmadasha" not in current
+
+    def test_iter_periods_streams_window(self):
+        start = datetime(2024, 1, 1)
+        end = start + timedelta(days=30)
+        pranas = list(self.tree.iter_periods(5, start, end))
+        assert pranas
+        assert all(p.level == "pranadasha" for p in pranas)
+        assert pranas[0].start_date <= start < pranas[0].end_date
+        for previous, current in zip(pranas, pranas[1:]):
+            assert previous.end_date == current.start_date
+        assert sum(1 for _ in self.tree.iter_periods(2)) > 9
+
+    def test_timeline_is_compact(self):
+        timeline = self.dasha.timeline
+        assert timeline.lords.dtype == np.int8
+        assert len(timeline.bounds) == len(timeline) + 1
+        assert timeline.bounds[0] <= 0 < timeline.bounds[1]
+        assert len(self.dasha.periods) == len(timeline)
+
+    def test_queries_take_explicit_as_of(self):
+        as_of = datetime(2024, 3, 1)
+        lords = self.tree.active_lords(as_of, depth=3)
+        chain = self.tree.active_chain(as_of, depth=3)
+        assert lords == [period.planet for period in chain]
+        current = self.calculator.get_current_dasha(self.dasha, as_of)
+        maha = chain[0]
+        assert current["mahadasha"]["remaining_days"] == (maha.end_date - as_of).days
+        assert current["mahadasha"]["is_active"]
+        assert self.dasha.get_current_mahadasha(as_of).planet == maha.planet
+
+
+class TestBatchActiveLords:
+    def setup_method(self):
+        self.calculator = DashaCalculator()
+
+    def test_matches_tree_lookup(self):
+        rng = np.random.default_rng(3)
+        longitudes = rng.uniform(0, 360, 50)
+        births = [
+            datetime(1950, 1, 1) + timedelta(days=float(d))
+            for d in rng.uniform(0, 20000, 50)
+        ]
+        query = datetime(2025, 6, 1)
+        birth_jds = np.array([datetime_to_julian_day(b) for b in births])
+        lords = self.calculator.batch_active_lords(
+            longitudes, birth_jds, datetime_to_julian_day(query), depth=4
+        )
+        assert lords.shape == (50, 4)
+        for i in range(50):
+            timeline = self.calculator.calculate_timeline(births[i], longitudes[i])
+            expected = DashaTree(self.calculator, timeline).active_lords(query, depth=4)
+            names = [self.calculator.lord_order[index] for index in lords[i]]
+            assert names == expected
+
+    def test_unborn_charts_are_marked(self):
+        lords = self.calculator.batch_active_lords(
+            np.array([10.0, 200.0]), np.array([2460000.0, 2470000.0]), 2465000.0
+        )
+        assert lords[0, 0] >= 0
+        assert list(lords[1]) == [-1, -1]
+
+
+class TestDashaIntervalIndex:
+    def setup_method(self):
+        self.calculator = DashaCalculator()
+        rng = np.random.default_rng(11)
+        self.systems = []
+        for day, longitude in zip(rng.uniform(0, 15000, 40), rng.uniform(0, 360, 40)):
+            birth = datetime(1960, 1, 1) + timedelta(days=float(day))
+            timeline = self.calculator.calculate_timeline(birth, float(longitude))
+            self.systems.append(
+                VimshottariDasha(
+                    birth_date=birth,
+                    moon_nakshatra=int(longitude * 27 / 360) + 1,
+                    periods=timeline.periods(),
+                    timeline=timeline,
+                )
+            )
+        self.index = self.calculator.build_interval_index(self.systems, depth=2)
+
+    def test_index_matches_periods(self):
+        chart_rows = self.index.columns["chart"] == 0
+        periods = list(self.calculator.get_dasha_tree(self.systems[0]).iter_periods(2))
+        assert np.count_nonzero(chart_rows) == len(periods)
+        assert self.index.starts[chart_rows][0] == pytest.approx(
+            datetime_to_julian_day(periods[0].start_date), abs=1e-6
+        )
+
+    def test_overlap_query_matches_brute_force(self):
+        saturn = self.calculator.lord_order.index("Saturn")
+        rahu = self.calculator.lord_order.index("Rahu")
+        month = (
+            datetime_to_julian_day(datetime(2025, 7, 1)),
+            datetime_to_julian_day(datetime(2025, 8, 1)),
+        )
+        subset = self.index.select(self.index.columns["mahadasha"] == saturn)
+        found = subset.overlapping(*month)
+        expected = set()
+        for chart_id, system in enumerate(self.systems):
+            tree = self.calculator.get_dasha_tree(system)
+            for period in tree.iter_periods(2):
+                start = datetime_to_julian_day(period.start_date)
+                end = datetime_to_julian_day(period.end_date)
+                if start < month[1] and end > month[0]:
+                    if period.parent_dasha == "Saturn":
+                        expected.add((chart_id, period.planet))
+        got = {
+            (
+                int(subset.columns["chart"][row]),
+                self.calculator.lord_order[subset.columns["antardasha"][row]],
+            )
+            for row in found
+        }
+        assert expected
+        assert got == expected
+        both = subset.select(subset.columns["antardasha"] == rahu)
+        assert set(both.columns["chart"][both.overlapping(*month)]) == {
+            chart for chart, planet in expected if planet == "Rahu"
+        }
+
+    def test_join_with_transits_matches_brute_force(self):
+        start = datetime_to_julian_day(datetime(2020, 1, 1))
+        end = datetime_to_julian_day(datetime(2032, 1, 1))
+        ingress = solve_transit_timeline(AstronomyEngine(), "Jupiter", start, end)
+        transits = IntervalIndex.from_segments(ingress.starts, ingress.indices, "rashi")
+        assert 11 <= len(transits) <= 14
+        dasha_rows, transit_rows = self.index.join(transits)
+        pairs = set(zip(dasha_rows.tolist(), transit_rows.tolist()))
+        assert len(pairs) == len(dasha_rows)
+        brute = {
+            (i, j)
+            for i in range(len(self.index))
+            for j in range(len(transits))
+            if self.index.starts[i] < transits.ends[j]
+            and transits.starts[j] < self.index.ends[i]
+        }
+        assert pairs == brute
+
+
+class TestDashaSystems:
+    def setup_method(self):
+        self.calculator = DashaCalculator()
+        self.birth = datetime(1990, 5, 15, 14, 30)
+
+    def test_cycle_totals(self):
+        totals = {name: system.cycle_years for name, system in DASHA_SYSTEMS.items()}
+        assert totals == {"vimshottari": 120, "yogini": 36, "ashtottari": 108}
+
+    def test_starting_lords(self):
+        # Moon at the very start of Ardra (nakshatra 6)
+        longitude = 5 * 360 / 27 + 1e-6
+        timelines = self.calculator.calculate_timelines(self.birth, longitude)
+        assert timelines["vimshottari"].lord(0) == "Rahu"
+        assert timelines["yogini"].lord(0) == "Mangala"
+        assert timelines["ashtottari"].lord(0) == "Sun"
+        for timeline in timelines.values():
+            assert timeline.bounds[0] == pytest.approx(0.0, abs=1e-3)
+
+    def test_ashtottari_balance_spans_nakshatra_group(self):
+        # Half way through Punarvasu, the second of the Sun's four nakshatras
+        longitude = 6.5 * 360 / 27
+        timeline = self.calculator.calculate_timeline(
+            self.birth, longitude, "ashtottari"
+        )
+        elapsed = -timeline.bounds[0] / (6 * DAYS_PER_YEAR)
+        assert timeline.lord(0) == "Sun"
+        assert elapsed == pytest.approx(1.5 / 4)
+
+    def test_one_pass_from_chart(self):
+        chart = KundaliGenerator().generate_chart(
+            birth_date=self.birth, latitude=28.6139, longitude=77.2090
+        )
+        dashas = self.calculator.calculate_dashas(chart)
+        assert set(dashas) == {"vimshottari", "yogini", "ashtottari"}
+        yogini = dashas["yogini"]
+        assert yogini.system == "yogini"
+        current = self.calculator.get_current_dasha(yogini, datetime(2024, 1, 1))
+        assert current["mahadasha"]["planet"] in DASHA_SYSTEMS["yogini"].lords
+        assert (
+            self.calculator.calculate_vimshottari_dasha(chart).periods[0].planet
+            == dashas["vimshottari"].periods[0].planet
+        )
+
+    def test_batch_matches_tree_for_every_system(self):
+        rng = np.random.default_rng(5)
+        longitudes = rng.uniform(0, 360, 30)
+        query = datetime(2030, 1, 1)
+        birth_jd = datetime_to_julian_day(self.birth)
+        batches = self.calculator.batch_active_lords_multi(
+            longitudes, np.full(30, birth_jd), datetime_to_julian_day(query), depth=3
+        )
+        for name, lords in batches.items():
+            system = DASHA_SYSTEMS[name]
+            for i in range(30):
+                timeline = self.calculator.calculate_timeline(
+                    self.birth, longitudes[i], name
+                )
+                expected = DashaTree(self.calculator, timeline).active_lords(query, 3)
+                assert [system.lords[index] for index in lords[i]] == expected
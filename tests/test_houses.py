@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.core.houses import (
+    HOUSE_SYSTEMS,
+    compute_house_cusps,
+    get_cusp_table,
+    house_of,
+)
+from yaegi.calculations.kundali import KundaliGenerator
+
+
+class TestHouseSystems:
+    def setup_method(self):
+        self.engine = AstronomyEngine()
+        self.jd = datetime_to_julian_day(datetime(1990, 5, 15, 14, 30))
+        self.latitude = 28.6139
+        self.longitude = 77.2090
+
+    def test_angles_shared_by_quadrant_systems(self):
+        for method in ("placidus", "koch", "porphyry", "sripati"):
+            cusps = compute_house_cusps(45.0, 51.5, 23.4393, method)
+            assert cusps.shape == (12,)
+            assert cusps[0] == pytest.approx((cusps[6] + 180) % 360)
+            assert cusps[9] == pytest.approx((cusps[3] + 180) % 360)
+
+    def test_placidus_semi_arc_condition(self):
+        eps = np.radians(23.4393)
+        lat = np.radians(40.0)
+        ramc = 100.0
+        cusp11 = np.radians(compute_house_cusps(ramc, 40.0, 23.4393)[10])
+        ra = np.degrees(np.arctan2(np.sin(cusp11) * np.cos(eps), np.cos(cusp11)))
+        decl = np.arcsin(np.sin(eps) * np.sin(cusp11))
+        diurnal = np.degrees(np.arccos(-np.tan(lat) * np.tan(decl)))
+        assert (ra - ramc) % 360 == pytest.approx(diurnal / 3, abs=1e-6)
+
+    def test_placidus_converges_near_polar_circle(self):
+        eps = np.radians(23.4393)
+        lat = np.radians(65.0)
+        ramc = np.linspace(0, 359, 360)
+        cusp12 = np.radians(compute_house_cusps(ramc, 65.0, 23.4393)[:, 11])
+        ra = np.degrees(np.arctan2(np.sin(cusp12) * np.cos(eps), np.cos(cusp12)))
+        decl = np.arcsin(np.sin(eps) * np.sin(cusp12))
+        diurnal = np.degrees(np.arccos(-np.tan(lat) * np.tan(decl)))
+        residual = ((ra - ramc) % 360 - 2 * diurnal / 3 + 180) % 360 - 180
+        assert np.abs(residual).max() < 1e-6
+
+    def test_equator_placidus_matches_porphyry_angles(self):
+        placidus = compute_house_cusps(0.0, 0.0, 23.4393, "placidus")
+        assert placidus[0] == pytest.approx(90.0)
+        assert placidus[9] == pytest.approx(0.0)
+
+    def test_vectorized_matches_scalar(self):
+        lsts = np.linspace(0, 359, 7)
+        lats = np.linspace(-50, 50, 7)
+        batch = compute_house_cusps(lsts, lats, 23.4393, "koch")
+        for i in range(7):
+            single = compute_house_cusps(lsts[i], lats[i], 23.4393, "koch")
+            assert np.allclose(batch[i], single)
+
+    def test_cusp_table_accuracy(self):
+        table = get_cusp_table("placidus")
+        rng = np.random.default_rng(7)
+        lsts = rng.uniform(0, 360, 2000)
+        lats = rng.uniform(-60, 60, 2000)
+        exact = compute_house_cusps(lsts, lats, table.obliquity)
+        error = np.abs((table.lookup(lsts, lats) - exact + 180) % 360 - 180)
+        assert error.max() < 0.02
+
+    def test_engine_table_uses_each_rows_epoch(self):
+        # Two centuries either side of J2000 in one batch
+        jds = np.array([2378497.0, 2451545.0, 2524593.0])
+        lats = np.full(3, 45.0)
+        lons = np.full(3, 10.0)
+        exact = self.engine.calculate_houses_batch(jds, lats, lons)
+        table = self.engine.calculate_houses_batch(jds, lats, lons, use_table=True)
+        assert np.abs((table - exact + 180) % 360 - 180).max() < 0.02
+
+    def test_engine_table_rows_do_not_depend_on_batch_latitudes(self):
+        jds = np.full(3, self.jd)
+        lats = np.array([self.latitude, 65.0, -70.0])
+        lons = np.full(3, self.longitude)
+        mixed = self.engine.calculate_houses_batch(jds, lats, lons, use_table=True)
+        alone = self.engine.calculate_houses_batch(
+            jds[:1], lats[:1], lons[:1], use_table=True
+        )
+        exact = self.engine.calculate_houses_batch(jds, lats, lons)
+        assert np.array_equal(mixed[:1], alone)
+        assert np.array_equal(mixed[1:], exact[1:])
+
+    def test_engine_requires_location_for_quadrant_systems(self):
+        with pytest.raises(ValueError):
+            self.engine.calculate_houses(10.0, method="placidus")
+        assert len(self.engine.calculate_houses(10.0, method="whole_sign")) == 12
+
+    def test_engine_defaults_to_equal_houses(self):
+        cusps = self.engine.calculate_houses(10.0)
+        assert cusps == [(10.0 + 30 * i) % 360 for i in range(12)]
+
+    def test_engine_cusp_one_is_ascendant(self):
+        asc = self.engine.calculate_ascendant(self.jd, self.latitude, self.longitude)
+        for method in HOUSE_SYSTEMS:
+            cusps = self.engine.calculate_houses(
+                asc, method, self.jd, self.latitude, self.longitude
+            )
+            if method != "whole_sign":
+                assert cusps[0] == pytest.approx(asc)
+
+    def test_house_of(self):
+        cusps = np.array([350.0 + 30 * i for i in range(12)]) % 360
+        assert house_of(355.0, cusps) == 1
+        assert house_of(21.0, cusps) == 2
+        assert house_of(349.0, cusps) == 12
+
+    def test_kundali_with_placidus(self):
+        chart = KundaliGenerator().generate_chart(
+            birth_date=datetime(1990, 5, 15, 14, 30),
+            latitude=self.latitude,
+            longitude=self.longitude,
+            house_system="placidus",
+        )
+        assert len(chart.houses) == 12
+        for planet in chart.planets:
+            assert 1 <= planet.house <= 12
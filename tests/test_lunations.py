@@ -0,0 +1,65 @@
+import numpy as np
+from datetime import datetime, timezone
+from yaegi.calculations.lunations import (
+    NEW_MOON,
+    LunationCalculator,
+)
+
+
+class TestLunations:
+    def setup_method(self):
+        self.calculator = LunationCalculator()
+        self.start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.end = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_new_and_full_moons_alternate(self):
+        table = self.calculator.get_table(self.start, self.end)
+        assert len(table) in (24, 25, 26)
+        assert np.all(np.diff(table.kind.astype(int)) != 0)
+        gaps = np.diff(table.julian_day)
+        assert np.all((gaps > 13.5) & (gaps < 16.0))
+
+    def test_elongation_at_syzygy(self):
+        table = self.calculator.get_table(self.start, self.end)
+        elongation = self.calculator._elongation(table.julian_day)
+        expected = np.where(table.kind == NEW_MOON, 0.0, 180.0)
+        assert np.all(np.abs((elongation - expected + 180) % 360 - 180) < 1e-4)
+
+    def test_masa_sequence_and_samvat(self):
+        lunations = self.calculator.get_lunations(self.start, self.end)
+        new_moons = [item for item in lunations if item["type"] == "Amavasya"]
+        for previous, current in zip(new_moons, new_moons[1:]):
+            step = (current["masa"]["number"] - previous["masa"]["number"]) % 12
+            assert step == (0 if previous["masa"]["adhika"] else 1)
+        chaitra = [item for item in new_moons if item["masa"]["name"] == "Chaitra"]
+        assert chaitra[0]["vikram_samvat"] == 2080
+        assert chaitra[0]["shaka_samvat"] == 1945
+        assert new_moons[0]["vikram_samvat"] == 2079
+
+    def test_adhika_month_every_few_years(self):
+        table = self.calculator.get_table(
+            datetime(2020, 1, 1, tzinfo=timezone.utc),
+            datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        adhika_months = np.count_nonzero(table.adhika & (table.kind == NEW_MOON))
+        assert 1 <= adhika_months <= 3
+
+    def test_eclipse_candidates(self):
+        eclipses = self.calculator.find_eclipses(self.start, self.end)
+        kinds = {item["eclipse"] for item in eclipses}
+        assert kinds == {"solar", "lunar"}
+        for item in eclipses:
+            expected = "Amavasya" if item["eclipse"] == "solar" else "Purnima"
+            assert item["type"] == expected
+        assert any(item["datetime"].startswith("2023-04-20") for item in eclipses)
+
+    def test_get_masa_returns_running_month(self):
+        masa = self.calculator.get_masa(datetime(2024, 4, 20, tzinfo=timezone.utc))
+        assert masa["type"] == "Amavasya"
+        assert masa["masa"]["name"] == "Chaitra"
+        assert masa["vikram_samvat"] == 2081
+
+    def test_year_tables_are_cached(self):
+        self.calculator.get_table(self.start, self.end)
+        self.calculator.get_table(self.start, self.end)
+        assert self.calculator._year_table.cache_info().hits >= 1
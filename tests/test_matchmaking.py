@@ -0,0 +1,247 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from yaegi.calculations import matchmaking
+from yaegi.calculations.compatibility import (
+    BHAKOOT_DOSHA,
+    GUNA_TABLE,
+    NADI_DOSHA,
+    PADA_COUNT,
+    pada_index,
+)
+from yaegi.calculations.matchmaking import (
+    MatchIndex,
+    Matchmaker,
+    MatchTracker,
+    ParallelMatchmaker,
+)
+
+
+def brute_force(query_pada, candidate_padas, k, min_points=0.0, blocked=0):
+    """Reference ranking: sort all eligible pairs by points, then by row"""
+    points = GUNA_TABLE.points[query_pada, candidate_padas] / 2.0
+    doshas = GUNA_TABLE.doshas[query_pada, candidate_padas]
+    rows = [
+        row
+        for row in range(len(candidate_padas))
+        if points[row] >= min_points and not doshas[row] & blocked
+    ]
+    rows.sort(key=lambda row: (-points[row], row))
+    return rows[:k], [points[row] for row in rows[:k]]
+
+
+class TestMatchmaker:
+    def setup_method(self):
+        rng = np.random.default_rng(11)
+        self.matchmaker = Matchmaker()
+        self.candidates = rng.uniform(0, 360, 2000)
+        self.queries = rng.uniform(0, 360, 25)
+
+    def test_top_matches_agree_with_brute_force(self):
+        query = self.queries[0]
+        rows, points = self.matchmaker.top_matches(query, self.candidates, 15)
+        expected_rows, expected_points = brute_force(
+            int(pada_index(query)), pada_index(self.candidates), 15
+        )
+        assert rows.tolist() == expected_rows
+        assert points.tolist() == expected_points
+        scores = self.matchmaker.score(query, self.candidates)
+        assert np.array_equal(scores[rows], points)
+
+    def test_filters(self):
+        query = self.queries[1]
+        rows, points = self.matchmaker.top_matches(
+            query,
+            self.candidates,
+            50,
+            min_points=24,
+            exclude_doshas=("nadi", "bhakoot"),
+        )
+        assert len(rows) and (points >= 24).all()
+        doshas = GUNA_TABLE.doshas[pada_index(query), pada_index(self.candidates[rows])]
+        assert not (doshas & (NADI_DOSHA | BHAKOOT_DOSHA)).any()
+        with pytest.raises(ValueError):
+            self.matchmaker.top_matches(
+                query, self.candidates, 5, exclude_doshas=("x",)
+            )
+
+    def test_fewer_eligible_than_k(self):
+        rows, points = self.matchmaker.top_matches(
+            self.queries[2], self.candidates[:5], 10, min_points=36
+        )
+        assert len(rows) == len(points) <= 5
+
+    def test_many_vs_many(self):
+        rows, points = self.matchmaker.top_matches_many(
+            self.queries,
+            self.candidates,
+            7,
+            query_is_male=False,
+            exclude_doshas=("nadi",),
+        )
+        assert rows.shape == points.shape == (len(self.queries), 7)
+        for position, query in enumerate(self.queries):
+            # Female queries read the table with candidates as the male side
+            points_row = GUNA_TABLE.points[
+                pada_index(self.candidates), pada_index(query)
+            ].astype(int)
+            doshas_row = GUNA_TABLE.doshas[
+                pada_index(self.candidates), pada_index(query)
+            ]
+            eligible = np.flatnonzero(doshas_row & NADI_DOSHA == 0)
+            order = sorted(eligible, key=lambda row: (-points_row[row], row))[:7]
+            assert rows[position].tolist() == order
+            assert np.array_equal(points[position], points_row[order] / 2.0)
+
+    def test_memory_does_not_scale_with_queries_times_candidates(self):
+        rng = np.random.default_rng(8)
+        queries = rng.uniform(0, 360, 5000)
+        candidates = rng.uniform(0, 360, 200000)
+        tracemalloc.start()
+        rows, _ = self.matchmaker.top_matches_many(queries, candidates, 10)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # A dense query x candidate int64 array would need 8 GB
+        assert peak < 32 * 2**20
+        assert rows.shape == (5000, 10)
+
+
+class TestMatchIndex:
+    def setup_method(self):
+        rng = np.random.default_rng(4)
+        self.moons = rng.uniform(0, 360, 3000)
+        self.index = MatchIndex.from_arrays(range(len(self.moons)), self.moons)
+
+    def test_scores_agree_with_matchmaker(self):
+        query = 123.4
+        matches = self.index.top_matches(query, 40, exclude_doshas=("nadi",))
+        rows, points = Matchmaker().top_matches(
+            query, self.moons, 40, exclude_doshas=("nadi",)
+        )
+        # Same score profile; ties may be ordered differently within a bucket
+        assert [score for _, score in matches] == points.tolist()
+        scores = Matchmaker().score(query, self.moons)
+        assert all(scores[row] == score for row, score in matches)
+        assert self.index.count_matches(query, min_points=20) == int(
+            (scores >= 20).sum()
+        )
+
+    def test_insert_and_remove(self):
+        assert len(self.index) == 3000
+        self.index.remove(5)
+        self.index.remove(2999)
+        assert 5 not in self.index and len(self.index) == 2998
+        self.index.insert("new", 200.0)
+        self.index.insert(7, 200.0)
+        assert self.index.bucket_of(7) == self.index.bucket_of("new")
+        assert self.index.bucket_sizes().sum() == len(self.index)
+        assert self.index.bucket_sizes().tolist() == [
+            len(bucket) for bucket in self.index.buckets
+        ]
+        assert self.index.count_matches(200.0) == len(self.index)
+        for candidate, pada in self.index.padas.items():
+            assert candidate in self.index.buckets[pada]
+        with pytest.raises(KeyError):
+            self.index.remove(5)
+
+
+class TestParallelMatchmaker:
+    def test_shards_merge_to_serial_result(self):
+        rng = np.random.default_rng(9)
+        queries = rng.uniform(0, 360, 30)
+        candidates = rng.uniform(0, 360, 5000)
+        serial = Matchmaker().top_matches_many(
+            queries, candidates, 12, min_points=18, exclude_doshas=("nadi",)
+        )
+        parallel = ParallelMatchmaker(processes=2).top_matches_many(
+            queries,
+            candidates,
+            12,
+            min_points=18,
+            exclude_doshas=("nadi",),
+            shards=5,
+        )
+        assert np.array_equal(parallel[0], serial[0])
+        assert np.array_equal(parallel[1], serial[1], equal_nan=True)
+
+    def test_shard_work_is_bounded_by_distinct_padas(self):
+        rng = np.random.default_rng(10)
+        candidates = pada_index(rng.uniform(0, 360, 300000)).astype(np.int16)
+        block = matchmaking._share(candidates)
+        try:
+            matchmaking._attach_shared(
+                block.name,
+                len(candidates),
+                {
+                    "query_padas": np.arange(PADA_COUNT),
+                    "k": 20,
+                    "table": GUNA_TABLE,
+                },
+            )
+            tracemalloc.start()
+            keys = matchmaking._rank_shard((1000, 200000))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            matchmaking._SHARED.clear()
+            block.close()
+            block.unlink()
+        assert keys.shape == (PADA_COUNT, 20)
+        rows, _ = matchmaking.decode_keys(keys)
+        assert ((rows >= 1000) & (rows < 200000)).all()
+        assert peak < 8 * 2**20
+
+
+class TestMatchTracker:
+    def setup_method(self):
+        self.tracker = MatchTracker(5, min_points=12, exclude_doshas=("nadi",))
+        self.profiles = {}
+        self.arrivals = {}
+
+    def expected(self, profile):
+        moon, is_male = self.profiles[profile]
+        ranked = []
+        for other, (other_moon, other_male) in self.profiles.items():
+            if other_male == is_male:
+                continue
+            male, female = (moon, other_moon) if is_male else (other_moon, moon)
+            pair = (int(pada_index(male)), int(pada_index(female)))
+            points = GUNA_TABLE.points[pair] / 2.0
+            if points >= 12 and not GUNA_TABLE.doshas[pair] & NADI_DOSHA:
+                ranked.append((-points, self.arrivals[other], other))
+        return [(other, -points) for points, _, other in sorted(ranked)[:5]]
+
+    def test_incremental_updates_match_full_ranking(self):
+        rng = np.random.default_rng(21)
+        for step in range(600):
+            if self.profiles and rng.random() < 0.35:
+                profile = list(self.profiles)[rng.integers(len(self.profiles))]
+                self.tracker.remove(profile)
+                del self.profiles[profile]
+            else:
+                # A few ids re-join with a new Moon
+                profile = int(rng.integers(400))
+                moon = float(rng.uniform(0, 360))
+                is_male = bool(rng.random() < 0.5)
+                self.tracker.add(profile, moon, is_male)
+                self.profiles.pop(profile, None)
+                self.profiles[profile] = (moon, is_male)
+                self.arrivals[profile] = step
+            if step % 50 == 0:
+                for profile in self.profiles:
+                    assert self.tracker.matches(profile) == self.expected(profile)
+        assert len(self.tracker) == len(self.profiles)
+        for profile in self.profiles:
+            assert self.tracker.matches(profile) == self.expected(profile)
+
+    def test_heaps_are_kept_per_bucket(self):
+        self.tracker.add("a", 10.0, True)
+        self.tracker.add("b", 10.5, True)
+        self.tracker.add("c", 200.0, False)
+        assert self.tracker.matches("a") == self.tracker.matches("b")
+        assert len(self.tracker.heaps) == 2
+        self.tracker.remove("c")
+        assert self.tracker.matches("a") == []
+        assert self.tracker.holders == {"a": set(), "b": set()}
@@ -0,0 +1,41 @@
+import numpy as np
+
+from yaegi.core import mathutils
+
+
+class TestAspectMatrix:
+    def setup_method(self):
+        rng = np.random.default_rng(2)
+        self.longitudes = rng.uniform(0, 360, (40, 9))
+        # Force a few exact and near aspects
+        self.longitudes[:, 1] = (self.longitudes[:, 0] + 120.0) % 360
+        self.longitudes[:, 2] = (self.longitudes[:, 0] - 93.0) % 360
+
+    def test_matches_predicates_and_orbs(self):
+        aspect, orb = mathutils.aspect_matrix(self.longitudes)
+        assert aspect.shape == orb.shape == (40, 9, 9)
+        assert aspect.dtype == np.int8 and orb.dtype == np.float32
+        for chart in range(40):
+            for a in range(9):
+                for b in range(9):
+                    lon_a, lon_b = self.longitudes[chart, [a, b]]
+                    found = [
+                        name
+                        for name in mathutils.ASPECT_NAMES
+                        if a != b and getattr(mathutils, f"is_{name}")(lon_a, lon_b)
+                    ]
+                    code = aspect[chart, a, b]
+                    assert found == (
+                        [mathutils.ASPECT_NAMES[code]] if code >= 0 else []
+                    )
+                    if code >= 0:
+                        expected = mathutils.aspect_orb(lon_a, lon_b, found[0])
+                        assert abs(orb[chart, a, b] - expected) < 1e-4
+        assert (aspect[:, 0, 1] == mathutils.ASPECT_NAMES.index("trine")).all()
+        assert np.allclose(orb[:, 0, 2], 3.0, atol=1e-4)
+
+    def test_custom_orbs_and_single_chart(self):
+        aspect, _ = mathutils.aspect_matrix(self.longitudes[0], {"square": 2.0})
+        assert aspect.shape == (9, 9)
+        assert aspect[0, 2] == -1 and aspect[2, 0] == -1
+        assert (np.diag(aspect) == -1).all()
@@ -0,0 +1,118 @@
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from yaegi.calculations.muhurta import MuhurtaFinder
+from yaegi.calculations.panchang import PanchangGenerator
+from yaegi.core import intervals
+from yaegi.core.conversions import datetime_to_julian_day
+
+
+class TestIntervals:
+    def test_merge_joins_overlaps(self):
+        merged = intervals.merge(np.array([[5.0, 6.0], [1.0, 3.0], [2.0, 4.0], [7, 7]]))
+        assert merged.tolist() == [[1.0, 4.0], [5.0, 6.0]]
+
+    def test_intersect_and_subtract(self):
+        a = np.array([[0.0, 10.0], [20.0, 30.0]])
+        b = np.array([[5.0, 25.0], [28.0, 40.0]])
+        assert intervals.intersect(a, b).tolist() == [
+            [5.0, 10.0],
+            [20.0, 25.0],
+            [28.0, 30.0],
+        ]
+        assert intervals.subtract(a, b).tolist() == [[0.0, 5.0], [25.0, 28.0]]
+
+    def test_segments_where(self):
+        starts = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+        labels = np.array([0, 1, 1, 2, 0])
+        assert intervals.segments_where(starts, labels, [1]).tolist() == [[1.0, 3.0]]
+
+
+class TestMuhurtaFinder:
+    def setup_method(self):
+        self.finder = MuhurtaFinder(PanchangGenerator())
+        self.tz = timezone(timedelta(hours=5, minutes=30))
+        self.start = datetime(2025, 1, 1, tzinfo=self.tz)
+        self.end = datetime(2025, 4, 1, tzinfo=self.tz)
+        self.latitude = 28.6139
+        self.longitude = 77.2090
+
+    def _sample_inside(self, windows):
+        return [
+            datetime.fromisoformat(window["start"])
+            + (
+                datetime.fromisoformat(window["end"])
+                - datetime.fromisoformat(window["start"])
+            )
+            / 2
+            for window in windows
+        ]
+
+    def test_windows_satisfy_panchang_constraints(self):
+        windows = self.finder.find_windows(
+            self.start,
+            self.end,
+            self.latitude,
+            self.longitude,
+            tithis=[2, 3, 5, 7, 10, 11, 13],
+            nakshatras=[4, 5, 13, 17, 21, 22],
+        )
+        assert windows
+        for moment in self._sample_inside(windows):
+            elements = self.finder.panchang.get_elements_at(moment)
+            assert elements["nakshatra"]["number"] in (4, 5, 13, 17, 21, 22)
+            assert elements["tithi"]["name"].startswith("Shukla")
+            assert elements["tithi"]["number"] in (2, 3, 5, 7, 10, 11, 13)
+
+    def test_lagna_constraint(self):
+        windows = self.finder.find_intervals(
+            self.start, self.end, self.latitude, self.longitude, lagnas=[5]
+        )
+        ascendant = self.finder.lagna_function(self.latitude, self.longitude)
+        middle = windows.mean(axis=1)
+        assert np.all(ascendant(middle) // 30 == 4)
+        # Leo rises once a sidereal day
+        assert 85 <= len(windows) <= 92
+
+    def test_weekday_runs_sunrise_to_sunrise(self):
+        windows = self.finder.find_windows(
+            self.start, self.end, self.latitude, self.longitude, weekdays=[6]
+        )
+        assert len(windows) == 13
+        for window in windows:
+            begins = datetime.fromisoformat(window["start"])
+            if begins > self.start:
+                assert begins.weekday() == 6
+                assert 6 <= begins.hour <= 7
+            assert 1420 <= window["duration_minutes"] <= 1460 or begins == self.start
+
+    def test_rahu_kaal_excluded(self):
+        day = datetime(2025, 1, 5, tzinfo=self.tz)
+        full = self.finder.find_intervals(
+            day, day + timedelta(days=1), self.latitude, self.longitude
+        )
+        free = self.finder.find_intervals(
+            day,
+            day + timedelta(days=1),
+            self.latitude,
+            self.longitude,
+            exclude_rahu_kaal=True,
+        )
+        assert len(free) == 2
+        gap = free[1, 0] - free[0, 1]
+        assert 0.05 < gap < 0.07
+        # Sunday Rahu Kaal is the last eighth of daytime, ending at sunset
+        sunset = datetime_to_julian_day(datetime(2025, 1, 5, 17, 36, tzinfo=self.tz))
+        assert abs(free[1, 0] - sunset) < 5 / 1440
+        assert len(full) == 1
+
+    def test_min_duration(self):
+        windows = self.finder.find_intervals(
+            self.start,
+            self.end,
+            self.latitude,
+            self.longitude,
+            nakshatras=[4],
+            lagnas=[2, 3],
+            min_duration=60,
+        )
+        assert np.all(intervals.durations(windows) >= 60 / 1440)
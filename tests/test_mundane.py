@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from yaegi.calculations.mundane import MundaneYogaFinder
+from yaegi.calculations.yoga_rules import YOGA_RULES, ChartBatch
+from yaegi.core.conversions import datetime_to_julian_day
+
+
+class TestMundaneYogas:
+    def setup_method(self):
+        self.finder = MundaneYogaFinder()
+        self.start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.end = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        self.location = (28.6139, 77.2090)
+
+    def sampled(self, julian_days):
+        """Rule matrix from charts cast directly at each instant"""
+        lagna = self.finder.muhurta.lagna_function(*self.location)(julian_days)
+        batch = ChartBatch.from_longitudes(
+            self.finder.longitudes(julian_days), lagna, whole_sign=True
+        )
+        return YOGA_RULES.evaluate_batch(batch)
+
+    def test_intervals_match_direct_evaluation(self):
+        found = self.finder.find_intervals(self.start, self.end, *self.location)
+        assert "Gajakesari Yoga" in found and "Budhaditya Yoga" not in found
+        assert any(len(periods) for periods in found.values())
+
+        start_jd = datetime_to_julian_day(self.start)
+        end_jd = datetime_to_julian_day(self.end)
+        samples = np.random.default_rng(1).uniform(start_jd, end_jd, 3000)
+        matrix = self.sampled(samples)
+        for name, periods in found.items():
+            column = YOGA_RULES.rule_names.index(name)
+            bounds = np.vstack((periods, [[np.inf, np.inf]]))
+            rows = np.searchsorted(bounds[:, 0], samples, side="right") - 1
+            inside = (rows >= 0) & (samples < bounds[rows, 1])
+            near_edge = (
+                np.min(
+                    np.abs(samples[:, None] - periods.reshape(1, -1)),
+                    axis=1,
+                    initial=1.0,
+                )
+                < 1e-4
+            )
+            assert np.array_equal(inside[~near_edge], matrix[~near_edge, column]), name
+
+    def test_sign_only_yogas_skip_the_ascendant(self):
+        found = self.finder.find_intervals(
+            self.start, self.end, *self.location, yogas=["Chandra Mangal Yoga"]
+        )
+        periods = found["Chandra Mangal Yoga"]
+        # Moon meets Mars about once a month, for two to three days each time
+        assert 1 <= len(periods) <= 3
+        assert np.all((periods[:, 1] - periods[:, 0]) > 1.5)
+
+    def test_longitude_rules_are_rejected(self):
+        with pytest.raises(ValueError):
+            self.finder.find_intervals(
+                self.start, self.end, *self.location, yogas=["Budhaditya Yoga"]
+            )
+        periods = self.finder.find_periods(
+            self.start, self.end, *self.location, yogas=["Gajakesari Yoga"]
+        )
+        assert all(p["duration_days"] > 0 for p in periods["Gajakesari Yoga"])
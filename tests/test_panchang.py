@@ -0,0 +1,162 @@
+import math
+import pytest
+from datetime import datetime, timedelta, timezone
+from yaegi.calculations.panchang import PanchangGenerator
+from yaegi.core.conversions import datetime_to_julian_day, julian_day_to_datetime
+from yaegi.core.riseset import get_yearly_rise_set, rise_set_for_day
+
+
+class TestRiseSet:
+    def setup_method(self):
+        self.latitude = 28.6139
+        self.longitude = 77.2090
+
+    def test_delhi_sunrise_sunset(self):
+        table = get_yearly_rise_set(self.latitude, self.longitude, 2024)
+        sunrise = julian_day_to_datetime(table.sunrise[14])
+        sunset = julian_day_to_datetime(table.sunset[14])
+        # 2024-01-15 in Delhi: sunrise 07:15 IST, sunset 17:45 IST
+        assert (sunrise.hour, sunrise.minute) in [(1, 44), (1, 45), (1, 46)]
+        assert (sunset.hour, sunset.minute) in [(12, 14), (12, 15), (12, 16)]
+
+    def test_yearly_table_is_cached(self):
+        first = get_yearly_rise_set(self.latitude, self.longitude, 2024)
+        second = get_yearly_rise_set(self.latitude + 0.001, self.longitude, 2024)
+        assert first is second
+        assert len(first.sunrise) == 366
+
+    def test_day_length_follows_season(self):
+        table = get_yearly_rise_set(51.5, 0.0, 2023)
+        winter = table.sunset[0] - table.sunrise[0]
+        summer = table.sunset[171] - table.sunrise[171]
+        assert summer > winter + 0.3
+
+    def test_polar_night_has_no_sunrise(self):
+        table = get_yearly_rise_set(78.0, 15.0, 2024)
+        assert math.isnan(table.sunrise[0])
+        assert not math.isnan(table.sunrise[80])
+
+    def test_rise_set_for_day(self):
+        jd = datetime_to_julian_day(datetime(2024, 3, 1, 6, 0))
+        table, index = rise_set_for_day(jd, self.latitude, self.longitude)
+        assert table.year == 2024
+        assert table.day_start[index] <= jd < table.day_start[index] + 1
+
+    def test_rise_set_for_day_at_new_year(self):
+        # Local midnight at the unrounded longitude falls just before the
+        # rounded table's first day of 2024
+        first = datetime_to_julian_day(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        jd = first - 77.2095 / 360.0
+        table, index = rise_set_for_day(jd, self.latitude, self.longitude)
+        assert (table.year, index) == (2024, 0)
+        assert table.day_start[0] <= jd < table.day_start[0] + 1
+
+
+class TestPanchangGenerator:
+    def setup_method(self):
+        self.generator = PanchangGenerator()
+
+    def test_generate_panchang(self):
+        panchang = self.generator.generate_panchang(datetime(2024, 1, 15), 28.6139, 77.2090)
+        for key in ("tithi", "nakshatra", "yoga", "karana", "sunrise", "sunset"):
+            assert key in panchang
+        assert panchang["sunrise"] == "01:45"
+
+    def test_sunrise_in_local_timezone(self):
+        ist = timezone(timedelta(hours=5, minutes=30))
+        panchang = self.generator.generate_panchang(
+            datetime(2024, 1, 15, tzinfo=ist), 28.6139, 77.2090
+        )
+        assert panchang["sunrise"] == "07:15"
+        assert panchang["moonrise"] != "--:--"
+
+
+class TestPanchangRange:
+    def setup_method(self):
+        self.generator = PanchangGenerator()
+        self.ist = timezone(timedelta(hours=5, minutes=30))
+
+    def test_range_yields_every_day(self):
+        days = list(
+            self.generator.generate_panchang_range(
+                datetime(2024, 1, 1, tzinfo=self.ist),
+                datetime(2024, 1, 31, tzinfo=self.ist),
+                28.6139,
+                77.2090,
+            )
+        )
+        assert len(days) == 31
+        assert days[0]["date"] == "2024-01-01"
+        assert days[-1]["date"] == "2024-01-31"
+
+    def test_elements_bracket_sunrise(self):
+        for day in self.generator.generate_panchang_range(
+            datetime(2024, 3, 1), datetime(2024, 3, 10), 19.07, 72.87
+        ):
+            sunrise = datetime.fromisoformat(day["sunrise"])
+            for element in ("tithi", "nakshatra", "yoga", "karana"):
+                start = datetime.fromisoformat(day[element]["start"])
+                end = datetime.fromisoformat(day[element]["end"])
+                assert start <= sunrise < end
+
+    def test_boundaries_match_snapshot(self):
+        day = next(
+            self.generator.generate_panchang_range(
+                datetime(2024, 1, 15), datetime(2024, 1, 15), 28.6139, 77.2090
+            )
+        )
+        end = datetime.fromisoformat(day["tithi"]["end"])
+        before = self.generator.generate_panchang(end - timedelta(minutes=1), 0, 0)
+        after = self.generator.generate_panchang(end + timedelta(minutes=1), 0, 0)
+        assert before["tithi"]["number"] == day["tithi"]["number"]
+        assert after["tithi"]["number"] == day["tithi"]["number"] % 15 + 1
+
+    def test_single_day_matches_range_at_sunrise(self):
+        for day in self.generator.generate_panchang_range(
+            datetime(2024, 2, 1), datetime(2024, 2, 29), 28.6139, 77.2090
+        ):
+            sunrise = datetime.fromisoformat(day["sunrise"])
+            single = self.generator.generate_panchang(sunrise, 28.6139, 77.2090)
+            for element in ("tithi", "nakshatra", "yoga", "karana"):
+                assert single[element] == {
+                    "number": day[element]["number"],
+                    "name": day[element]["name"],
+                }
+
+    def test_multi_location_matches_single_location(self):
+        locations = [(28.6139, 77.2090), (40.7128, -74.0060), (-33.87, 151.21)]
+        multi = list(
+            self.generator.generate_panchang_multi(
+                datetime(2024, 6, 1), datetime(2024, 6, 5), locations
+            )
+        )
+        assert len(multi) == 5 * len(locations)
+        for col, (latitude, longitude) in enumerate(locations):
+            single = self.generator.generate_panchang_range(
+                datetime(2024, 6, 1), datetime(2024, 6, 5), latitude, longitude
+            )
+            for row, expected in enumerate(single):
+                entry = multi[row * len(locations) + col]
+                assert entry["date"] == expected["date"]
+                for element in ("tithi", "nakshatra", "yoga", "karana"):
+                    assert entry[element]["number"] == expected[element]["number"]
+
+    def test_multi_equals_range_for_one_location(self):
+        # Unrounded coordinates: both paths must share one sunrise source
+        start, end = datetime(2024, 12, 20), datetime(2025, 1, 10)
+        multi = list(
+            self.generator.generate_panchang_multi(start, end, [(28.61394, 77.20903)])
+        )
+        single = list(
+            self.generator.generate_panchang_range(start, end, 28.61394, 77.20903)
+        )
+        assert multi == single
+
+    def test_panchang_grid_shape(self):
+        grid = self.generator.calculate_panchang_grid(
+            datetime(2024, 1, 1), datetime(2024, 1, 10), [10.0, 20.0], [70.0, 80.0]
+        )
+        assert grid["sunrise"].shape == (10, 2)
+        assert grid["tithi"].shape == (10, 2)
+        assert (grid["tithi_start"] <= grid["sunrise"]).all()
+        assert (grid["sunrise"] < grid["tithi_end"]).all()
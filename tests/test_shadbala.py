@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from yaegi.calculations.kundali import KundaliGenerator
+from yaegi.calculations.shadbala import (
+    COMPONENTS,
+    SHADBALA_PLANETS,
+    Shadbala,
+    drishti,
+)
+from yaegi.calculations.yoga_rules import ChartBatch
+from yaegi.core.conversions import datetime_to_julian_day
+
+
+class TestShadbala:
+    def setup_method(self):
+        dates = [
+            datetime(1985 + 3 * i, 1 + i, 10 + i, 2 * i, tzinfo=timezone.utc)
+            for i in range(6)
+        ]
+        generator = KundaliGenerator()
+        self.charts = [generator.generate_chart(date, 19.07, 72.88) for date in dates]
+        jds = np.array([datetime_to_julian_day(date) for date in dates])
+        self.batch = ChartBatch.from_julian_days(
+            jds, np.full(6, 19.07), np.full(6, 72.88)
+        )
+
+    def test_batch_matches_single_charts(self):
+        batch = Shadbala.from_batch(self.batch)
+        assert batch.total.shape == (6, 7)
+        for row, chart in enumerate(self.charts):
+            single = Shadbala.from_chart(chart)
+            for name in COMPONENTS:
+                assert np.allclose(getattr(single, name), getattr(batch, name)[row])
+
+    def test_components_are_cached(self):
+        strength = Shadbala.from_batch(self.batch)
+        assert "drik" not in vars(strength)
+        total = strength.total
+        assert all(name in vars(strength) for name in COMPONENTS)
+        assert strength.total is total
+        assert np.allclose(strength.rupas * 60, total)
+        assert set(strength.to_dict((0,))["Mars"]) == set(COMPONENTS) | {"total"}
+
+    def test_total_is_sum_of_implemented_components(self):
+        strength = Shadbala.from_batch(self.batch)
+        components = strength.components()
+        assert np.allclose(strength.total, sum(components[name] for name in COMPONENTS))
+
+    def test_classical_reference_points(self):
+        positions = dict(
+            zip(SHADBALA_PLANETS, (10.0, 213.0, 298.0, 165.0, 95.0, 357.0, 200.0))
+        )
+        # Ascendant on Jupiter's exaltation point: Jupiter rises in the 1st
+        strength = Shadbala.from_positions(positions, 95.0)
+        jupiter = SHADBALA_PLANETS.index("Jupiter")
+        moon = SHADBALA_PLANETS.index("Moon")
+        assert np.isclose(strength.dig[jupiter], 60.0)
+        # Exalted Sun in an odd sign and the 10th: uchcha 60 + 15 + kendra 60
+        assert np.isclose(strength.sthana[0], 135.0)
+        # Debilitated Moon in an even sign and the 4th: 0 + 15 + 60
+        assert np.isclose(strength.sthana[moon], 75.0)
+        assert np.allclose(
+            strength.naisargika,
+            [60.0, 51.43, 17.14, 25.71, 34.29, 42.86, 8.57],
+            atol=0.01,
+        )
+        assert strength.chesta[0] == strength.chesta[1] == 0.0
+
+    def test_retrograde_motion_raises_chesta(self):
+        positions = {planet: 30.0 * i for i, planet in enumerate(SHADBALA_PLANETS)}
+        speeds = {planet: 1.0 for planet in SHADBALA_PLANETS}
+        speeds["Saturn"] = -0.02
+        strength = Shadbala.from_positions(positions, 0.0, speeds)
+        assert strength.chesta[SHADBALA_PLANETS.index("Saturn")] == 60.0
+
+    def test_drishti_curve(self):
+        angles = np.array([0, 30, 60, 90, 120, 150, 180, 240, 300, 330])
+        assert drishti(angles).tolist() == [0, 0, 15, 45, 30, 0, 60, 30, 0, 0]
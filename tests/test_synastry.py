@@ -0,0 +1,70 @@
+import numpy as np
+
+from yaegi.calculations.synastry import SynastryAnalyzer
+from yaegi.calculations.yoga_rules import BATCH_PLANETS, ChartBatch
+from yaegi.core import mathutils
+from tests.test_yogas import BASE, make_chart
+
+PREDICATES = {
+    "conjunction": mathutils.is_conjunction,
+    "sextile": mathutils.is_sextile,
+    "square": mathutils.is_square,
+    "trine": mathutils.is_trine,
+    "opposition": mathutils.is_opposition,
+}
+
+
+class TestSynastry:
+    def setup_method(self):
+        rng = np.random.default_rng(17)
+        self.count = 50
+        self.batch = ChartBatch.from_longitudes(
+            {planet: rng.uniform(0, 360, self.count) for planet in BATCH_PLANETS},
+            rng.uniform(0, 360, self.count),
+        )
+        self.chart = make_chart(BASE, ascendant=100.0)
+        self.analyzer = SynastryAnalyzer()
+
+    def test_grid_agrees_with_pair_predicates(self):
+        grid = self.analyzer.cross_aspects(self.chart, self.batch)
+        assert grid.aspect.shape == (self.count, 9, 9)
+        own = self.chart.get_planet
+        for row in range(self.count):
+            for a, planet_a in enumerate(BATCH_PLANETS):
+                for b, planet_b in enumerate(BATCH_PLANETS):
+                    if own(planet_a) is None:
+                        assert grid.aspect[row, a, b] == -1
+                        continue
+                    lon_a = own(planet_a).longitude
+                    lon_b = self.batch.longitude[row, b]
+                    found = [
+                        name
+                        for name, predicate in PREDICATES.items()
+                        if predicate(lon_a, lon_b)
+                    ]
+                    aspect = grid.aspect[row, a, b]
+                    assert found == (
+                        [mathutils.ASPECT_NAMES[aspect]] if aspect >= 0 else []
+                    )
+
+    def test_batch_rows_match_single_pairs(self):
+        grid = self.analyzer.cross_aspects(self.chart, self.batch)
+        single = self.analyzer.cross_aspects(self.chart, self.batch.slice(3, 4))
+        assert np.array_equal(grid.aspect[3], single.aspect[0])
+        assert single.pairs() == grid.pairs(3)
+        orbs = [record["orb"] for record in grid.pairs(3)]
+        assert orbs == sorted(orbs)
+
+    def test_overlays_and_manglik(self):
+        overlays = self.analyzer.house_overlays(self.batch, self.chart)
+        for row in range(5):
+            for column, planet in enumerate(BATCH_PLANETS):
+                assert overlays[row, column] == mathutils.calculate_house_position(
+                    self.batch.longitude[row, column], 100.0
+                )
+        other = make_chart({**BASE, "Mars": 5.0})
+        summary = self.analyzer.analyze(self.chart, other)
+        # Mars at 65 is in the 12th from a 100 ascendant; at 5 it is in the 1st
+        assert summary["manglik"] == {"a": True, "b": True, "matched": True}
+        assert summary["house_overlays"]["a_in_b"]["Mars"] == 3
+        assert "Rahu" not in summary["house_overlays"]["a_in_b"]
@@ -0,0 +1,234 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from yaegi.calculations.kundali import KundaliGenerator
+from yaegi.calculations.yoga_rules import (
+    YOGA_RULES,
+    ChartBatch,
+    YogaRuleEngine,
+    compile_condition,
+)
+from yaegi.calculations.yogas import YogaDetector
+from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.data.constants import RASHI_LORDS
+from yaegi.models.chart import KundaliChart
+from yaegi.models.house import House
+from yaegi.models.planet import Planet
+
+
+def make_chart(positions, ascendant=0.0):
+    """Whole-sign chart from sidereal longitudes"""
+    lagna = int(ascendant // 30)
+    planets = [
+        Planet(name=name, longitude=lon, house=(int(lon // 30) - lagna) % 12 + 1)
+        for name, lon in positions.items()
+    ]
+    houses = []
+    for number in range(1, 13):
+        rashi = (lagna + number - 1) % 12 + 1
+        house = House(number=number, lord=RASHI_LORDS[rashi], rashi=rashi, degree=0.0)
+        for planet in planets:
+            if planet.house == number:
+                house.add_planet(planet.name)
+        houses.append(house)
+    return KundaliChart(
+        birth_date=datetime(2000, 1, 1, tzinfo=timezone.utc),
+        latitude=0.0,
+        longitude=0.0,
+        timezone="UTC",
+        planets=planets,
+        houses=houses,
+        ascendant=ascendant,
+    )
+
+
+# Aries lagna; spread so that no special yoga forms by accident
+BASE = {
+    "Sun": 275.0,
+    "Moon": 35.0,
+    "Mars": 65.0,
+    "Mercury": 305.0,
+    "Jupiter": 155.0,
+    "Venus": 335.0,
+    "Saturn": 185.0,
+}
+
+
+def names(chart):
+    return {yoga["name"] for yoga in YOGA_RULES.evaluate(chart)}
+
+
+class TestYogaRules:
+    def test_data_compiles_with_shared_conditions(self):
+        assert len(YOGA_RULES.rules) == 20
+        assert len(set(YOGA_RULES.tokens)) == len(YOGA_RULES.tokens)
+        assert YOGA_RULES.tokens.count("venus_in_kendra") == 1
+        lakshmi, malavya = (
+            rule
+            for rule in YOGA_RULES.rules
+            if rule.name in ("Lakshmi Yoga", "Malavya Yoga")
+        )
+        assert set(lakshmi.conditions) & set(malavya.conditions)
+
+    def test_unknown_conditions_are_rejected(self):
+        with pytest.raises(ValueError):
+            compile_condition("pluto_in_kendra")
+        with pytest.raises(ValueError):
+            YogaRuleEngine({"extra": [{"name": "Odd", "conditions": ["moon_is_blue"]}]})
+
+    def test_panch_mahapurush(self):
+        chart = make_chart({**BASE, "Jupiter": 100.0})
+        hamsa = [
+            yoga
+            for yoga in YOGA_RULES.evaluate(chart, category="panch_mahapurush")
+            if yoga["name"] == "Hamsa Yoga"
+        ]
+        assert hamsa and hamsa[0]["planets"] == ["Jupiter"]
+        assert hamsa[0]["houses"] == [4]
+
+    def test_gajakesari_counts_the_same_house(self):
+        assert "Gajakesari Yoga" in names(make_chart({**BASE, "Jupiter": 40.0}))
+        assert "Gajakesari Yoga" in names(make_chart({**BASE, "Jupiter": 125.0}))
+        assert "Gajakesari Yoga" not in names(make_chart(BASE))
+
+    def test_budhaditya_requires_uncombust_mercury(self):
+        assert "Budhaditya Yoga" in names(make_chart({**BASE, "Mercury": 293.0}))
+        assert "Budhaditya Yoga" not in names(make_chart({**BASE, "Mercury": 280.0}))
+
+    def test_any_match_rules_need_one_condition(self):
+        assert "Guru Chandal Yoga" not in names(make_chart(BASE))
+        with_rahu = make_chart({**BASE, "Rahu": 160.0, "Ketu": 340.0})
+        assert "Guru Chandal Yoga" in names(with_rahu)
+
+    def test_neecha_bhanga(self):
+        # Sun debilitated in Libra, Libra's lord Venus in the 10th house
+        chart = make_chart({**BASE, "Sun": 190.0, "Venus": 280.0})
+        yogas = [
+            yoga
+            for yoga in YOGA_RULES.evaluate(chart)
+            if yoga["name"] == "Neecha Bhanga Raja Yoga"
+        ]
+        assert yogas and "Sun" in yogas[0]["planets"]
+
+    def test_detector_on_generated_chart(self):
+        chart = KundaliGenerator().generate_chart(
+            datetime(1990, 5, 15, 10, 30, tzinfo=timezone.utc), 28.6139, 77.2090
+        )
+        detector = YogaDetector()
+        yogas = detector.detect_all_yogas(chart)
+        for yoga in yogas:
+            assert {
+                "name",
+                "type",
+                "description",
+                "strength",
+                "planets",
+                "houses",
+            } <= set(yoga)
+        raj = detector.detect_raj_yogas(chart)
+        assert all(yoga["category"] == "raj_yogas" for yoga in raj)
+
+
+class TestBatchYogas:
+    def setup_method(self):
+        rng = np.random.default_rng(7)
+        self.count = 400
+        longitudes = {
+            planet: rng.uniform(0, 360, self.count)
+            for planet in ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus")
+        }
+        longitudes["Saturn"] = rng.uniform(0, 360, self.count)
+        longitudes["Rahu"] = rng.uniform(0, 360, self.count)
+        # Keep Mercury and Venus near the Sun as in real charts
+        longitudes["Mercury"] = (
+            longitudes["Sun"] + rng.uniform(-28, 28, self.count)
+        ) % 360
+        longitudes["Venus"] = (
+            longitudes["Sun"] + rng.uniform(-47, 47, self.count)
+        ) % 360
+        self.batch = ChartBatch.from_longitudes(
+            longitudes, rng.uniform(0, 360, self.count)
+        )
+
+    def test_masks_agree_with_per_chart_rules(self):
+        matrix = YOGA_RULES.evaluate_batch(self.batch, chunk_size=97)
+        assert matrix.shape == (self.count, len(YOGA_RULES.rules))
+        assert matrix.any(axis=0).sum() >= 10
+        for row in range(self.count):
+            expected = {
+                yoga["name"]
+                for yoga in YOGA_RULES.evaluate_facts(self.batch.facts(row))
+            }
+            found = {YOGA_RULES.rule_names[c] for c in np.flatnonzero(matrix[row])}
+            assert found == expected
+
+    def test_records_only_for_hits(self):
+        matrix, records = YOGA_RULES.detect_batch(self.batch)
+        assert len(records) == int(matrix.sum())
+        first = records[0]
+        assert matrix[first["chart"], YOGA_RULES.rule_names.index(first["name"])]
+
+    def test_batch_from_charts_matches_generated_charts(self):
+        generator = KundaliGenerator()
+        dates = [
+            datetime(1980 + i, 3, 1 + i, 6 * i % 24, tzinfo=timezone.utc)
+            for i in range(5)
+        ]
+        charts = [generator.generate_chart(date, 28.6, 77.2) for date in dates]
+        matrix, records = YogaDetector().detect_batch(charts)
+        for row, chart in enumerate(charts):
+            expected = {yoga["name"] for yoga in YOGA_RULES.evaluate(chart)}
+            assert {r["name"] for r in records if r["chart"] == row} == expected
+
+        jds = np.array([datetime_to_julian_day(date) for date in dates])
+        direct = ChartBatch.from_julian_days(jds, np.full(5, 28.6), np.full(5, 77.2))
+        assert np.array_equal(YOGA_RULES.evaluate_batch(direct), matrix)
+
+    def test_generated_charts_carry_lunar_nodes(self):
+        chart = KundaliGenerator().generate_chart(
+            datetime(1990, 5, 15, 10, 30, tzinfo=timezone.utc), 28.6, 77.2
+        )
+        planets = {planet.name: planet.longitude for planet in chart.planets}
+        assert (planets["Ketu"] - planets["Rahu"]) % 360 == pytest.approx(180.0)
+
+        # Twenty years of monthly charts cover every node-based yoga
+        jds = 2447000.5 + 30.0 * np.arange(240)
+        batch = ChartBatch.from_julian_days(jds, np.full(240, 28.6), np.full(240, 77.2))
+        fired = YOGA_RULES.evaluate_batch(batch).any(axis=0)
+        for name in ("Kaal Sarpa Yoga", "Guru Chandal Yoga", "Pitra Dosha"):
+            assert fired[YOGA_RULES.rule_names.index(name)]
+
+
+class TestYogaTracker:
+    def setup_method(self):
+        self.chart = make_chart({**BASE, "Rahu": 100.0, "Ketu": 280.0})
+        self.tracker = YOGA_RULES.track(self.chart)
+
+    def test_update_matches_full_evaluation(self):
+        rng = np.random.default_rng(3)
+        for _ in range(200):
+            moved = {
+                body: float(rng.uniform(0, 360))
+                for body in rng.choice(["Moon", "Ascendant", "Mars", "Sun"], 2)
+            }
+            before = {yoga["name"] for yoga in self.tracker.yogas}
+            added, removed = self.tracker.update(moved)
+            expected = YOGA_RULES.evaluate_facts(self.tracker.facts)
+            assert self.tracker.yogas == expected
+            after = {yoga["name"] for yoga in expected}
+            assert {yoga["name"] for yoga in added} == after - before
+            assert {yoga["name"] for yoga in removed} == before - after
+
+    def test_only_affected_rules_are_rematched(self):
+        moon = self.tracker.facts.longitude["Moon"]
+        changed = self.tracker.facts.changed_keys(
+            self.tracker.facts.moved({"Moon": moon + 1.0})
+        )
+        assert changed == {"Moon.longitude"}
+        _, rules = YOGA_RULES.affected(changed)
+        assert [YOGA_RULES.rules[c].name for c in rules] == ["Kaal Sarpa Yoga"]
+
+        _, rules = YOGA_RULES.affected({"Moon.rashi"})
+        assert "Hamsa Yoga" not in {YOGA_RULES.rules[c].name for c in rules}
@@ -1,6 +1,63 @@
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple, Union
+
+import numpy as np
+
 from yaegi.models.chart import KundaliChart
 
+MAX_GUNA_POINTS = 36
+
+# Kutas in Ashtakoota order; three depend on the Moon's rashi, the rest on
+# its nakshatra.
+KUTA_NAMES: Tuple[str, ...] = (
+    "varna",
+    "vashya",
+    "tara",
+    "yoni",
+    "graha_maitri",
+    "gana",
+    "bhakoot",
+    "nadi",
+)
+RASHI_KUTAS: Tuple[str, ...] = ("vashya", "graha_maitri", "bhakoot")
+NAKSHATRA_KUTAS: Tuple[str, ...] = tuple(
+    name for name in KUTA_NAMES if name not in RASHI_KUTAS
+)
+
+# A nakshatra pada (3°20') lies in a single rashi, so the 108 padas fix both
+# the nakshatra and the rashi of a Moon and hence every kuta.
+PADA_COUNT = 108
+
+NADI_DOSHA = 1
+BHAKOOT_DOSHA = 2
+GANA_DOSHA = 4
+DOSHA_FLAGS: Dict[str, int] = {
+    "nadi": NADI_DOSHA,
+    "bhakoot": BHAKOOT_DOSHA,
+    "gana": GANA_DOSHA,
+}
+
+
+def pada_index(moon_longitude: Union[float, np.ndarray]) -> np.ndarray:
+    """Pada (0-107) of sidereal Moon longitudes"""
+    pada = np.floor(np.asarray(moon_longitude) % 360.0 * PADA_COUNT / 360.0)
+    return np.minimum(pada, PADA_COUNT - 1).astype(np.int16)
+
+
+def pada_nakshatra_rashi(pada: int) -> Tuple[int, int]:
+    """Nakshatra (1-27) and rashi (1-12) of a pada"""
+    return pada // 4 + 1, pada // 9 + 1
+
+
+def compatibility_level(total_points: float) -> str:
+    if total_points >= 32:
+        return "Excellent"
+    if total_points >= 24:
+        return "Good"
+    if total_points >= 18:
+        return "Average"
+    return "Poor"
+
 
 class CompatibilityAnalyzer:
     """Analyze compatibility between two charts using Guna Milan"""
@@ -18,9 +75,16 @@ class CompatibilityAnalyzer:
         }
 
     def analyze_compatibility(
-        self, male_chart: KundaliChart, female_chart: KundaliChart
+        self,
+        male_chart: KundaliChart,
+        female_chart: KundaliChart,
+        details: bool = True,
     ) -> Dict[str, Any]:
-        """Perform complete Guna Milan analysis"""
+        """Perform complete Guna Milan analysis.
+
+        Scores come from the precomputed pada table; the per-kuta dicts and
+        recommendations are only built when ``details`` is true.
+        """
 
         male_moon = male_chart.get_planet("Moon")
         female_moon = female_chart.get_planet("Moon")
@@ -28,55 +92,34 @@ class CompatibilityAnalyzer:
         if not male_moon or not female_moon:
             return {"error": "Moon position required for both charts"}
 
-        results = {}
-        total_points = 0
-        max_points = 36
-
-        # Calculate each Guna
-        results["varna"] = self.calculate_varna(
-            male_moon.nakshatra, female_moon.nakshatra
-        )
-        results["vashya"] = self.calculate_vashya(male_moon.rashi, female_moon.rashi)
-        results["tara"] = self.calculate_tara(
-            male_moon.nakshatra, female_moon.nakshatra
-        )
-        results["yoni"] = self.calculate_yoni(
-            male_moon.nakshatra, female_moon.nakshatra
-        )
-        results["graha_maitri"] = self.calculate_graha_maitri(
-            male_moon.rashi, female_moon.rashi
-        )
-        results["gana"] = self.calculate_gana(
-            male_moon.nakshatra, female_moon.nakshatra
-        )
-        results["bhakoot"] = self.calculate_bhakoot(male_moon.rashi, female_moon.rashi)
-        results["nadi"] = self.calculate_nadi(
-            male_moon.nakshatra, female_moon.nakshatra
-        )
-
-        # Calculate total points
-        for guna, score in results.items():
-            if isinstance(score, dict) and "points" in score:
-                total_points += score["points"]
-
-        # Determine compatibility level
-        if total_points >= 32:
-            compatibility = "Excellent"
-        elif total_points >= 24:
-            compatibility = "Good"
-        elif total_points >= 18:
-            compatibility = "Average"
-        else:
-            compatibility = "Poor"
+        male_pada = int(pada_index(male_moon.longitude))
+        female_pada = int(pada_index(female_moon.longitude))
+        total_points = GUNA_TABLE.score(male_pada, female_pada)
+        flags = int(GUNA_TABLE.doshas[male_pada, female_pada])
 
-        return {
+        result = {
             "total_points": total_points,
-            "max_points": max_points,
-            "percentage": (total_points / max_points) * 100,
-            "compatibility": compatibility,
-            "details": results,
-            "recommendations": self.get_recommendations(total_points, results),
+            "max_points": MAX_GUNA_POINTS,
+            "percentage": (total_points / MAX_GUNA_POINTS) * 100,
+            "compatibility": compatibility_level(total_points),
+            "doshas": {name: bool(flags & flag) for name, flag in DOSHA_FLAGS.items()},
         }
+        if not details:
+            return result
+
+        male_nakshatra, male_rashi = pada_nakshatra_rashi(male_pada)
+        female_nakshatra, female_rashi = pada_nakshatra_rashi(female_pada)
+        results = {}
+        for name in KUTA_NAMES:
+            method = getattr(self, f"calculate_{name}")
+            if name in RASHI_KUTAS:
+                results[name] = method(male_rashi, female_rashi)
+            else:
+                results[name] = method(male_nakshatra, female_nakshatra)
+
+        result["details"] = results
+        result["recommendations"] = self.get_recommendations(total_points, results)
+        return result
 
     def calculate_varna(
         self, male_nakshatra: int, female_nakshatra: int
@@ -399,3 +442,77 @@ class CompatibilityAnalyzer:
             recommendations.append("Gana mismatch - May cause temperament differences")
 
         return recommendations
+
+
+@dataclass(frozen=True)
+class GunaTable:
+    """Guna Milan for every (male pada, female pada) pair.
+
+    Points are stored as half-points in uint8 (Tara can score 1.5):
+    ``points`` holds the 36-point total and ``doshas`` the dosha flags, both
+    108 x 108. The per-kuta breakdown is kept at the level it depends on,
+    ``nakshatra_kutas`` (27 x 27 per kuta) and ``rashi_kutas`` (12 x 12).
+    """
+
+    points: np.ndarray
+    doshas: np.ndarray
+    nakshatra_kutas: np.ndarray
+    rashi_kutas: np.ndarray
+
+    def score(self, male_pada: int, female_pada: int) -> float:
+        return self.points[male_pada, female_pada] / 2.0
+
+    def kuta_points(self, male_pada: int, female_pada: int) -> Dict[str, float]:
+        """Points of every kuta for one pair"""
+        male_nakshatra, male_rashi = pada_nakshatra_rashi(male_pada)
+        female_nakshatra, female_rashi = pada_nakshatra_rashi(female_pada)
+        points = {}
+        for name in KUTA_NAMES:
+            if name in RASHI_KUTAS:
+                table = self.rashi_kutas[RASHI_KUTAS.index(name)]
+                value = table[male_rashi - 1, female_rashi - 1]
+            else:
+                table = self.nakshatra_kutas[NAKSHATRA_KUTAS.index(name)]
+                value = table[male_nakshatra - 1, female_nakshatra - 1]
+            points[name] = value / 2.0
+        return points
+
+
+def build_guna_table(analyzer: CompatibilityAnalyzer) -> GunaTable:
+    """Evaluate every kuta once per nakshatra or rashi pair and expand to padas"""
+
+    def kuta_table(names: Tuple[str, ...], size: int) -> np.ndarray:
+        table = np.zeros((len(names), size, size), dtype=np.uint8)
+        for row, name in enumerate(names):
+            method = getattr(analyzer, f"calculate_{name}")
+            for male in range(size):
+                for female in range(size):
+                    points = method(male + 1, female + 1)["points"]
+                    table[row, male, female] = int(round(points * 2))
+        return table
+
+    nakshatra_kutas = kuta_table(NAKSHATRA_KUTAS, 27)
+    rashi_kutas = kuta_table(RASHI_KUTAS, 12)
+
+    pada = np.arange(PADA_COUNT)
+    nakshatra = np.ix_(pada // 4, pada // 4)
+    rashi = np.ix_(pada // 9, pada // 9)
+    points = nakshatra_kutas.sum(axis=0)[nakshatra] + rashi_kutas.sum(axis=0)[rashi]
+
+    nadi = nakshatra_kutas[NAKSHATRA_KUTAS.index("nadi")][nakshatra]
+    gana = nakshatra_kutas[NAKSHATRA_KUTAS.index("gana")][nakshatra]
+    bhakoot = rashi_kutas[RASHI_KUTAS.index("bhakoot")][rashi]
+    doshas = (
+        np.where(nadi == 0, NADI_DOSHA, 0)
+        | np.where(bhakoot == 0, BHAKOOT_DOSHA, 0)
+        | np.where(gana <= 4, GANA_DOSHA, 0)
+    )
+    return GunaTable(
+        points=points.astype(np.uint8),
+        doshas=doshas.astype(np.uint8),
+        nakshatra_kutas=nakshatra_kutas,
+        rashi_kutas=rashi_kutas,
+    )
+
+
+GUNA_TABLE = build_guna_table(CompatibilityAnalyzer())
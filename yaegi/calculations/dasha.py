@@ -1,29 +1,98 @@
 from __future__ import annotations
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+import numpy as np
+from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.core.intervals import IntervalIndex
 from yaegi.models.dasha import DashaPeriod, VimshottariDasha
 from yaegi.models.chart import KundaliChart
 
+# Names of the nested Vimshottari levels, from mahadasha down to prana
+DASHA_LEVELS: Tuple[str, ...] = (
+    "mahadasha",
+    "antardasha",
+    "pratyantardasha",
+    "sookshmadasha",
+    "pranadasha",
+)
+
+DAYS_PER_YEAR: float = 365.25
+# Mahadashas are generated until the timeline extends this far past birth
+DASHA_SPAN_DAYS: float = 120 * 365
+
+
+class DashaSystem:
+    """Cycle table of a nakshatra-based dasha system and its starting rule.
+
+    ``nakshatra_lords`` gives the lord (index into ``lords``) of each of the
+    27 nakshatras. Consecutive nakshatras sharing a lord form one span, and
+    the balance at birth is the unelapsed part of the Moon's whole span.
+    Sub-periods start with the parent's lord and are proportional to years.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lords: Sequence[str],
+        years: Sequence[float],
+        nakshatra_lords: Sequence[int],
+    ) -> None:
+        self.name = name
+        self.lords: Tuple[str, ...] = tuple(lords)
+        self.years = np.asarray(years, dtype=float)
+        self.nakshatra_lords = np.asarray(nakshatra_lords, dtype=np.int8)
+
+        # Position of each nakshatra within its lord's span, and span size,
+        # walking the circle from a nakshatra that starts a span
+        count = len(self.lords)
+        same = self.nakshatra_lords == np.roll(self.nakshatra_lords, 1)
+        first = int(np.flatnonzero(~same)[0])
+        order = [(first + step) % 27 for step in range(27)]
+        self.span_offset = np.zeros(27)
+        self.span_size = np.ones(27)
+        for i in order:
+            if same[i]:
+                self.span_offset[i] = self.span_offset[i - 1] + 1
+        for i in reversed(order):
+            following = (i + 1) % 27
+            self.span_size[i] = (
+                self.span_size[following]
+                if same[following]
+                else self.span_offset[i] + 1
+            )
 
-class DashaCalculator:
-    """Calculate Vimshottari Dasha periods"""
-
-    def __init__(self):
-        # Vimshottari Dasha periods in years
-        self.dasha_periods = {
-            "Ketu": 7,
-            "Venus": 20,
-            "Sun": 6,
-            "Moon": 10,
-            "Mars": 7,
-            "Rahu": 18,
-            "Jupiter": 16,
-            "Saturn": 19,
-            "Mercury": 17,
-        }
+        # Sub-period lords and cumulative share of the parent, per parent lord
+        rotations = (np.arange(count)[:, None] + np.arange(count)[None, :]) % count
+        self.sub_lords = rotations.astype(np.int8)
+        self.sub_fractions = np.concatenate(
+            (
+                np.zeros((count, 1)),
+                np.cumsum(self.years[rotations], axis=1) / self.years.sum(),
+            ),
+            axis=1,
+        )
 
-        # Nakshatra lords sequence
-        self.nakshatra_lords = [
+    @property
+    def cycle_years(self) -> float:
+        return float(self.years.sum())
+
+    def birth_balance(
+        self, moon_longitude: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Lord running at birth and the elapsed fraction of its mahadasha"""
+        position = (np.asarray(moon_longitude, dtype=float) % 360.0) * 27 / 360
+        nakshatra = position.astype(int) % 27
+        elapsed = (self.span_offset[nakshatra] + position % 1) / self.span_size[
+            nakshatra
+        ]
+        return self.nakshatra_lords[nakshatra], elapsed
+
+
+DASHA_SYSTEMS: Dict[str, DashaSystem] = {
+    "vimshottari": DashaSystem(
+        "vimshottari",
+        [
             "Ketu",
             "Venus",
             "Sun",
@@ -33,152 +102,447 @@ class DashaCalculator:
             "Jupiter",
             "Saturn",
             "Mercury",
-        ] * 3  # Repeat for 27 nakshatras
-
-    def calculate_vimshottari_dasha(self, chart: "KundaliChart") -> "VimshottariDasha":
-        """Calculate complete Vimshottari Dasha system"""
-        moon = chart.get_planet("Moon")
-        if not moon:
-            raise ValueError("Moon position required for Dasha calculation")
-
-        # Calculate birth nakshatra
-        birth_nakshatra = moon.nakshatra
-
-        # Find starting dasha lord
-        start_lord = self.nakshatra_lords[birth_nakshatra - 1]
-
-        # Calculate how much of first dasha is completed at birth
-        nakshatra_position = (moon.longitude * 27 / 360) % 1
-        first_dasha_remaining = self.dasha_periods[start_lord] * (
-            1 - nakshatra_position
-        )
-
-        # Generate all dasha periods
-        periods = self._generate_mahadasha_periods(
-            chart.birth_date, start_lord, first_dasha_remaining
+        ],
+        [7, 20, 6, 10, 7, 18, 16, 19, 17],
+        [n % 9 for n in range(27)],
+    ),
+    # Yogini n rules nakshatra k when (k + 3) mod 8 == n, with 0 read as 8
+    "yogini": DashaSystem(
+        "yogini",
+        [
+            "Mangala",
+            "Pingala",
+            "Dhanya",
+            "Bhramari",
+            "Bhadrika",
+            "Ulka",
+            "Siddha",
+            "Sankata",
+        ],
+        [1, 2, 3, 4, 5, 6, 7, 8],
+        [((k + 3) % 8 or 8) - 1 for k in range(1, 28)],
+    ),
+    # Ashtottari counted from Ardra over the 27 nakshatras; Abhijit, which
+    # would extend Saturn's span, is not used.
+    "ashtottari": DashaSystem(
+        "ashtottari",
+        ["Sun", "Moon", "Mars", "Mercury", "Saturn", "Jupiter", "Rahu", "Venus"],
+        [6, 15, 8, 17, 10, 19, 12, 21],
+        [6, 6, 7, 7, 7, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3]
+        + [4, 4, 4, 5, 5, 5, 6, 6],
+    ),
+}
+
+
+@dataclass(frozen=True)
+class DashaTimeline:
+    """Consecutive dasha periods of one level, stored compactly.
+
+    ``lords`` holds indices into the system's lords and ``bounds`` the period edges in
+    days from ``birth_date`` (one more entry than ``lords``). Periods keep
+    their full nominal extent, so the one running at birth starts at a
+    negative offset; ``DashaPeriod`` objects are clipped at birth and only
+    built on request.
+    """
+
+    birth_date: datetime
+    level: int
+    lords: np.ndarray
+    bounds: np.ndarray
+    system: DashaSystem
+    parent: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.lords)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.system.lords
+
+    def offset(self, as_of: datetime) -> float:
+        """Days from birth to ``as_of``"""
+        return (as_of - self.birth_date).total_seconds() / 86400.0
+
+    def row_at(self, days: float) -> int:
+        """Row of the period running ``days`` after birth, or -1 if none"""
+        row = int(np.searchsorted(self.bounds, days, side="right")) - 1
+        return row if 0 <= row < len(self.lords) else -1
+
+    def rows_between(self, start_days: float, end_days: float) -> range:
+        """Rows of the periods overlapping [start_days, end_days)"""
+        first = max(int(np.searchsorted(self.bounds, start_days, side="right")) - 1, 0)
+        last = min(
+            int(np.searchsorted(self.bounds, end_days, side="left")), len(self.lords)
         )
-
-        return VimshottariDasha(
-            birth_date=chart.birth_date, moon_nakshatra=birth_nakshatra, periods=periods
+        return range(first, last)
+
+    def lord(self, row: int) -> str:
+        return self.names[int(self.lords[row])]
+
+    def period(self, row: int) -> DashaPeriod:
+        """Materialize one row as a ``DashaPeriod`` clipped at birth.
+
+        Mahadashas report the part after birth in ``duration_years``, as they
+        always have; sub-periods report their nominal length.
+        """
+        start = float(self.bounds[row])
+        end = float(self.bounds[row + 1])
+        years = (end - (max(start, 0.0) if self.level == 0 else start)) / DAYS_PER_YEAR
+        return DashaPeriod(
+            planet=self.lord(row),
+            start_date=self.birth_date + timedelta(days=max(start, 0.0)),
+            end_date=self.birth_date + timedelta(days=end),
+            duration_years=years,
+            level=DASHA_LEVELS[self.level],
+            parent_dasha=self.parent,
         )
 
-    def _generate_mahadasha_periods(
-        self, start_date: datetime, start_lord: str, first_remaining: float
-    ) -> List[DashaPeriod]:
-        """Generate all Mahadasha periods"""
-        periods: List[DashaPeriod] = []
-        current_date = start_date
-
-        # Find starting index in the sequence
-        start_index = None
-        for i, lord in enumerate(self.nakshatra_lords[:9]):
-            if lord == start_lord:
-                start_index = i
+    def periods(self) -> List[DashaPeriod]:
+        """Every period that has not ended before birth"""
+        return [
+            self.period(row) for row in range(len(self)) if self.bounds[row + 1] > 0
+        ]
+
+
+class DashaTree:
+    """Lazily expanded tree of nested dasha periods.
+
+    Each node's children are subdivided into a ``DashaTimeline`` the first
+    time they are needed and cached, so finding the active chain at a date is
+    one binary search per level instead of regenerating and scanning
+    sub-periods.
+    """
+
+    def __init__(self, calculator: "DashaCalculator", root: DashaTimeline) -> None:
+        self.calculator = calculator
+        self.root = root
+        self._levels: Dict[Tuple[int, ...], DashaTimeline] = {(): root}
+
+    def timeline(self, path: Tuple[int, ...] = ()) -> DashaTimeline:
+        """Children of the period at ``path`` (rows from the root), cached"""
+        if path not in self._levels:
+            parent = self.timeline(path[:-1])
+            self._levels[path] = self.calculator.subdivide(parent, path[-1])
+        return self._levels[path]
+
+    def children(self, path: Tuple[int, ...] = ()) -> List[DashaPeriod]:
+        """Sub-periods of the period at ``path`` that run after birth"""
+        return self.timeline(path).periods()
+
+    def period(self, path: Tuple[int, ...]) -> DashaPeriod:
+        """The period reached by following rows from the mahadasha timeline"""
+        return self.timeline(path[:-1]).period(path[-1])
+
+    def active_path(self, as_of: datetime, depth: int = 2) -> Tuple[int, ...]:
+        """Rows of the periods running at ``as_of``, down to ``depth`` levels"""
+        days = self.root.offset(as_of)
+        path: Tuple[int, ...] = ()
+        for _ in range(min(depth, len(DASHA_LEVELS))):
+            row = self.timeline(path).row_at(days)
+            if row < 0:
                 break
+            path += (row,)
+        return path
+
+    def active_lords(self, as_of: datetime, depth: int = 2) -> List[str]:
+        """Lords running at ``as_of`` without building any ``DashaPeriod``"""
+        path = self.active_path(as_of, depth)
+        return [
+            self.timeline(path[:level]).lord(path[level]) for level in range(len(path))
+        ]
+
+    def active_chain(self, as_of: datetime, depth: int = 2) -> List[DashaPeriod]:
+        """Periods running at ``as_of``, outermost first"""
+        path = self.active_path(as_of, depth)
+        return [self.period(path[: level + 1]) for level in range(len(path))]
+
+    def _window(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> Tuple[float, float]:
+        start_days = max(self.root.offset(start), 0.0) if start else 0.0
+        end_days = self.root.offset(end) if end else float(self.root.bounds[-1])
+        return start_days, end_days
+
+    def iter_timelines(
+        self,
+        depth: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Tuple[Tuple[int, ...], DashaTimeline, range]]:
+        """Stream the timelines holding level ``depth`` (1 = mahadasha).
+
+        Yields the lord indices of the enclosing periods, the timeline and the
+        rows of it overlapping the window. Only overlapping branches are
+        descended and deep levels are subdivided on the fly without caching,
+        so exporting prana dashas does not keep all 9^5 of them in memory.
+        """
+        start_days, end_days = self._window(start, end)
+
+        def walk(
+            timeline: DashaTimeline, lords: Tuple[int, ...]
+        ) -> Iterator[Tuple[Tuple[int, ...], DashaTimeline, range]]:
+            rows = timeline.rows_between(start_days, end_days)
+            if timeline.level + 1 == depth:
+                yield lords, timeline, rows
+                return
+            for row in rows:
+                child = self.calculator.subdivide(timeline, row)
+                yield from walk(child, lords + (int(timeline.lords[row]),))
+
+        yield from walk(self.root, ())
+
+    def iter_periods(
+        self,
+        depth: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[DashaPeriod]:
+        """Stream every period at ``depth`` (1 = mahadasha) in time order"""
+        for _, timeline, rows in self.iter_timelines(depth, start, end):
+            for row in rows:
+                yield timeline.period(row)
 
-        if start_index is None:
-            raise ValueError(f"Invalid dasha lord: {start_lord}")
-
-        # Generate periods for multiple cycles
-        for cycle in range(3):
-            for i in range(9):
-                lord_index = (start_index + i) % 9
-                lord = self.nakshatra_lords[lord_index]
-
-                if cycle == 0 and i == 0:
-                    duration = first_remaining
-                else:
-                    duration = self.dasha_periods[lord]
 
-                end_date = current_date + timedelta(days=duration * 365.25)
-
-                period = DashaPeriod(
-                    planet=lord,
-                    start_date=current_date,
-                    end_date=end_date,
-                    duration_years=duration,
-                    level="mahadasha",
-                )
-
-                periods.append(period)
-                current_date = end_date
-
-                if (current_date - start_date).days > 120 * 365:
-                    return periods
+class DashaCalculator:
+    """Calculate Vimshottari, Yogini and Ashtottari Dasha periods"""
 
-        return periods
+    def __init__(self):
+        self.systems = DASHA_SYSTEMS
+        vimshottari = self.systems["vimshottari"]
 
-    def calculate_antardasha(self, mahadasha: DashaPeriod) -> List[DashaPeriod]:
-        """Calculate Antardasha periods within a Mahadasha"""
-        periods: List[DashaPeriod] = []
+        # Vimshottari Dasha periods in years
+        self.dasha_periods = dict(zip(vimshottari.lords, vimshottari.years.tolist()))
 
-        # Find mahadasha lord index
-        lord_index = None
-        for i, lord in enumerate(self.nakshatra_lords[:9]):
-            if lord == mahadasha.planet:
-                lord_index = i
-                break
+        # Nakshatra lords sequence
+        self.nakshatra_lords = [
+            vimshottari.lords[lord] for lord in vimshottari.nakshatra_lords
+        ]
+        self.lord_order: Tuple[str, ...] = vimshottari.lords
+
+    def calculate_timeline(
+        self, birth_date: datetime, moon_longitude: float, system: str = "vimshottari"
+    ) -> DashaTimeline:
+        """Compact mahadasha timeline from the Moon's sidereal longitude at birth"""
+        table = self.systems[system]
+        first, elapsed = table.birth_balance(moon_longitude)
+        count = len(table.lords)
+        cycles = int(np.ceil(DASHA_SPAN_DAYS / (table.cycle_years * DAYS_PER_YEAR)))
+        lords = ((int(first) + np.arange(count * (cycles + 1))) % count).astype(np.int8)
+        lengths = table.years[lords] * DAYS_PER_YEAR
+        bounds = np.concatenate(([0.0], np.cumsum(lengths))) - elapsed * lengths[0]
+
+        # Stop after the first mahadasha ending beyond the covered span
+        rows = int(np.searchsorted(bounds[1:], DASHA_SPAN_DAYS, side="right")) + 1
+        return DashaTimeline(
+            birth_date=birth_date,
+            level=0,
+            lords=lords[:rows],
+            bounds=bounds[: rows + 1],
+            system=table,
+        )
 
-        if lord_index is None:
-            return periods
+    def calculate_timelines(
+        self,
+        birth_date: datetime,
+        moon_longitude: float,
+        systems: Sequence[str] = ("vimshottari", "yogini", "ashtottari"),
+    ) -> Dict[str, DashaTimeline]:
+        """Mahadasha timelines of several systems from one Moon position"""
+        return {
+            system: self.calculate_timeline(birth_date, moon_longitude, system)
+            for system in systems
+        }
 
-        total_duration = mahadasha.duration_years
-        current_date = mahadasha.start_date
+    def subdivide(self, timeline: DashaTimeline, row: int) -> DashaTimeline:
+        """Timeline of the sub-periods of one period"""
+        table = timeline.system
+        lord = int(timeline.lords[row])
+        start = timeline.bounds[row]
+        end = timeline.bounds[row + 1]
+        bounds = start + (end - start) * table.sub_fractions[lord]
+        bounds[-1] = end
+        return DashaTimeline(
+            birth_date=timeline.birth_date,
+            level=timeline.level + 1,
+            lords=table.sub_lords[lord],
+            bounds=bounds,
+            system=table,
+            parent=table.lords[lord],
+        )
 
-        for i in range(9):
-            antarlord_index = (lord_index + i) % 9
-            antarlord = self.nakshatra_lords[antarlord_index]
+    def batch_active_lords(
+        self,
+        moon_longitudes: np.ndarray,
+        birth_jds: np.ndarray,
+        query_jd: np.ndarray,
+        depth: int = 2,
+        system: str = "vimshottari",
+    ) -> np.ndarray:
+        """Running lords of many charts at once, shape (N, depth).
+
+        Entries are indices into the system's lords (mahadasha first), or -1
+        for charts born after the query date. Every system is a fixed cycle,
+        so each level is a lookup in the cumulative fraction table of the
+        parent lord and no per-chart timeline is built.
+        """
+        table = self.systems[system]
+        count = len(table.lords)
+        lord, elapsed = table.birth_balance(moon_longitudes)
+        cycle_days = table.cycle_years * DAYS_PER_YEAR
+        # Time since the nominal start of the mahadasha running at birth
+        elapsed = elapsed * table.years[lord] * DAYS_PER_YEAR
+        age = np.asarray(query_jd, dtype=float) - np.asarray(birth_jds, dtype=float)
+        fraction = ((age + elapsed) % cycle_days) / cycle_days
+
+        result = np.full((len(lord), depth), -1, dtype=np.int8)
+        valid = np.broadcast_to(age >= 0, lord.shape)
+        # The cycle from the birth lord splits into mahadashas exactly as a
+        # period of that lord splits into sub-periods
+        parent = lord
+        rows = np.arange(len(lord))
+        for level in range(depth):
+            edges = table.sub_fractions[parent]
+            step = np.sum(fraction[:, None] >= edges[:, 1:count], axis=1)
+            start, end = edges[rows, step], edges[rows, step + 1]
+            parent = table.sub_lords[parent, step]
+            result[:, level] = np.where(valid, parent, -1)
+            fraction = np.clip((fraction - start) / (end - start), 0.0, 1.0)
+        return result
+
+    def batch_active_lords_multi(
+        self,
+        moon_longitudes: np.ndarray,
+        birth_jds: np.ndarray,
+        query_jd: np.ndarray,
+        depth: int = 2,
+        systems: Sequence[str] = ("vimshottari", "yogini", "ashtottari"),
+    ) -> Dict[str, np.ndarray]:
+        """``batch_active_lords`` for several systems over the same charts"""
+        return {
+            system: self.batch_active_lords(
+                moon_longitudes, birth_jds, query_jd, depth, system
+            )
+            for system in systems
+        }
 
-            antardasha_duration = (self.dasha_periods[antarlord] / 120) * total_duration
-            end_date = current_date + timedelta(days=antardasha_duration * 365.25)
+    def calculate_dashas(
+        self,
+        chart: "KundaliChart",
+        systems: Sequence[str] = ("vimshottari", "yogini", "ashtottari"),
+    ) -> Dict[str, "VimshottariDasha"]:
+        """Calculate several dasha systems from the chart's Moon in one pass"""
+        moon = chart.get_planet("Moon")
+        if not moon:
+            raise ValueError("Moon position required for Dasha calculation")
 
-            period = DashaPeriod(
-                planet=antarlord,
-                start_date=current_date,
-                end_date=end_date,
-                duration_years=antardasha_duration,
-                level="antardasha",
-                parent_dasha=mahadasha.planet,
+        timelines = self.calculate_timelines(chart.birth_date, moon.longitude, systems)
+        return {
+            system: VimshottariDasha(
+                birth_date=chart.birth_date,
+                moon_nakshatra=moon.nakshatra,
+                periods=timeline.periods(),
+                system=system,
+                timeline=timeline,
             )
+            for system, timeline in timelines.items()
+        }
 
-            periods.append(period)
-            current_date = end_date
+    def calculate_vimshottari_dasha(self, chart: "KundaliChart") -> "VimshottariDasha":
+        """Calculate complete Vimshottari Dasha system"""
+        return self.calculate_dashas(chart, ("vimshottari",))["vimshottari"]
 
-            if current_date >= mahadasha.end_date:
-                break
+    def calculate_antardasha(self, mahadasha: DashaPeriod) -> List[DashaPeriod]:
+        """Calculate Antardasha periods within a Mahadasha"""
+        return self.calculate_subperiods(mahadasha, 1)
 
-        return periods
+    def calculate_subperiods(
+        self, parent: DashaPeriod, level: int
+    ) -> List[DashaPeriod]:
+        """Split a period into its nine sub-periods at ``level`` (1 = antardasha)"""
+        if parent.planet not in self.dasha_periods or level >= len(DASHA_LEVELS):
+            return []
+
+        # The mahadasha running at birth is truncated: its sub-periods are laid
+        # out over the full mahadasha and clipped at birth.
+        full_years = (
+            self.dasha_periods[parent.planet] if level == 1 else parent.duration_years
+        )
+        span = (parent.end_date - parent.start_date).total_seconds() / 86400.0
+        single = DashaTimeline(
+            birth_date=parent.start_date,
+            level=level - 1,
+            lords=np.array([self.lord_order.index(parent.planet)], dtype=np.int8),
+            bounds=np.array([span - full_years * DAYS_PER_YEAR, span]),
+            system=self.systems["vimshottari"],
+        )
+        return self.subdivide(single, 0).periods()
+
+    def build_interval_index(
+        self,
+        dasha_systems: Sequence["VimshottariDasha"],
+        depth: int = 2,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> IntervalIndex:
+        """Interval index of every chart's periods at ``depth``, in Julian Days.
+
+        Columns are ``chart`` (position in ``dasha_systems``) and one lord
+        index (into the system's lords) per level, named after
+        ``DASHA_LEVELS``.
+        """
+        starts: List[np.ndarray] = []
+        ends: List[np.ndarray] = []
+        charts: List[np.ndarray] = []
+        lords: List[List[np.ndarray]] = [[] for _ in range(depth)]
+        for chart_id, dasha_system in enumerate(dasha_systems):
+            tree = self.get_dasha_tree(dasha_system)
+            birth_jd = datetime_to_julian_day(dasha_system.birth_date)
+            for ancestors, timeline, rows in tree.iter_timelines(depth, start, end):
+                rows = slice(rows.start, rows.stop)
+                count = len(timeline.lords[rows])
+                starts.append(birth_jd + np.maximum(timeline.bounds[:-1][rows], 0.0))
+                ends.append(birth_jd + timeline.bounds[1:][rows])
+                charts.append(np.full(count, chart_id, dtype=np.int32))
+                for level, lord in enumerate(ancestors):
+                    lords[level].append(np.full(count, lord, dtype=np.int8))
+                lords[depth - 1].append(timeline.lords[rows])
+
+        def joined(parts: List[np.ndarray], dtype: Any) -> np.ndarray:
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        return IntervalIndex(
+            joined(starts, float),
+            joined(ends, float),
+            chart=joined(charts, np.int32),
+            **{
+                DASHA_LEVELS[level]: joined(lords[level], np.int8)
+                for level in range(depth)
+            },
+        )
+
+    def get_dasha_tree(self, dasha_system: "VimshottariDasha") -> DashaTree:
+        """Lazy period tree for a dasha system, created once and kept on it"""
+        if dasha_system.tree is None:
+            timeline = dasha_system.timeline
+            if timeline is None:
+                raise ValueError("Dasha system was built without a timeline")
+            dasha_system.tree = DashaTree(self, timeline)
+        return dasha_system.tree
 
     def get_current_dasha(
-        self, dasha_system: "VimshottariDasha", date: datetime = None
+        self, dasha_system: "VimshottariDasha", date: datetime = None, depth: int = 2
     ) -> Dict[str, Any]:
-        """Get current running Dasha periods"""
+        """Get Dasha periods running at ``date`` down to ``depth`` levels (max 5)"""
         if date is None:
-            date = datetime.now()
+            date = datetime.now(dasha_system.birth_date.tzinfo)
 
-        current_mahadasha = None
-        current_antardasha = None
-
-        for period in dasha_system.periods:
-            if (
-                period.start_date <= date <= period.end_date
-                and period.level == "mahadasha"
-            ):
-                current_mahadasha = period
-                break
-
-        if current_mahadasha:
-            antardasha_periods = self.calculate_antardasha(current_mahadasha)
-            for period in antardasha_periods:
-                if period.start_date <= date <= period.end_date:
-                    current_antardasha = period
-                    break
-
-        return {
-            "mahadasha": current_mahadasha.to_dict() if current_mahadasha else None,
-            "antardasha": current_antardasha.to_dict() if current_antardasha else None,
-            "query_date": date.isoformat(),
+        chain = self.get_dasha_tree(dasha_system).active_chain(date, depth)
+        result: Dict[str, Any] = {
+            level: chain[index].to_dict(as_of=date) if index < len(chain) else None
+            for index, level in enumerate(DASHA_LEVELS[: max(depth, 2)])
         }
+        result["query_date"] = date.isoformat()
+        return result
 
     def get_dasha_predictions(self, planet: str) -> Dict[str, Any]:
         """Get general predictions for a dasha planet"""
@@ -5,6 +5,7 @@ from yaegi.models.planet import Planet
 from yaegi.models.house import House
 from yaegi.core.astronomy import AstronomyEngine
 from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.core.houses import house_of
 from yaegi.core.mathutils import calculate_house_position
 
 
@@ -20,6 +21,7 @@ class KundaliGenerator:
         latitude: float,
         longitude: float,
         timezone: str = "UTC",
+        house_system: str = "equal",
     ) -> KundaliChart:
         """Generate complete Kundali chart with planets and houses."""
 
@@ -30,11 +32,26 @@ class KundaliGenerator:
 
         # Get planetary sidereal longitudes
         planet_positions = self.astronomy.get_all_planets(jd)
+        # Mean lunar nodes; Ketu is always opposite Rahu
+        planet_positions["Rahu"] = self.astronomy.get_lunar_node(jd)
+        planet_positions["Ketu"] = (planet_positions["Rahu"] + 180.0) % 360.0
+
+        # Calculate house cusps
+        house_cusps = self.astronomy.calculate_houses(
+            ascendant,
+            method=house_system,
+            julian_day=jd,
+            latitude=latitude,
+            longitude=longitude,
+        )
 
         # Create Planet objects
         planets: List[Planet] = []
         for name, lon in planet_positions.items():
-            house_num = calculate_house_position(lon, ascendant)
+            if house_system == "equal":
+                house_num = calculate_house_position(lon, ascendant)
+            else:
+                house_num = int(house_of(lon, house_cusps))
             planets.append(
                 Planet(
                     name=name,
@@ -52,9 +69,6 @@ class KundaliGenerator:
             )
         )
 
-        # Calculate house cusps
-        house_cusps = self.astronomy.calculate_houses(ascendant)
-
         # Define house lords based on rashi
         house_lords = {
             1: "Mars",
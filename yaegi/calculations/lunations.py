@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.boundaries import ElementSpec, solve_element_timeline
+from yaegi.core.conversions import datetime_to_julian_day, julian_day_to_datetime
+from yaegi.data.constants import MASA_NAMES
+
+NEW_MOON = 0
+FULL_MOON = 1
+
+NO_ECLIPSE = 0
+SOLAR_ECLIPSE = 1
+LUNAR_ECLIPSE = 2
+
+# Sun-node distance at syzygy within which an eclipse is possible: the solar
+# ecliptic limit and the lunar (umbral) limit, in degrees.
+SOLAR_ECLIPSE_LIMIT: float = 18.5
+LUNAR_ECLIPSE_LIMIT: float = 12.2
+
+SYZYGY_SPEC = ElementSpec("syzygy", 180.0, 2, 12.1907)
+
+# Padding around a year so the months straddling Jan 1 get their neighbours
+YEAR_PADDING_DAYS: float = 70.0
+LUNATION_CACHE_SIZE: int = 512
+
+
+@dataclass(frozen=True)
+class LunationTable:
+    """Sorted new and full moons with their month, year and eclipse flags.
+
+    Every column is a compact NumPy array aligned with ``julian_day``:
+    ``kind`` (0 new moon, 1 full moon), ``masa`` (1 Chaitra .. 12 Phalguna,
+    amanta reckoning), ``adhika`` (intercalary month), ``vikram_samvat`` and
+    ``eclipse`` (0 none, 1 solar, 2 lunar candidate).
+    """
+
+    julian_day: np.ndarray
+    kind: np.ndarray
+    masa: np.ndarray
+    adhika: np.ndarray
+    vikram_samvat: np.ndarray
+    eclipse: np.ndarray
+    node_distance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.julian_day)
+
+    def slice(self, start_jd: float, end_jd: float) -> "LunationTable":
+        """Rows with start_jd <= julian_day < end_jd"""
+        lo = int(np.searchsorted(self.julian_day, start_jd, side="left"))
+        hi = int(np.searchsorted(self.julian_day, end_jd, side="left"))
+        return LunationTable(
+            **{name: getattr(self, name)[lo:hi] for name in self.__dataclass_fields__}
+        )
+
+    @staticmethod
+    def concatenate(tables: List["LunationTable"]) -> "LunationTable":
+        return LunationTable(
+            **{
+                name: np.concatenate([getattr(table, name) for table in tables])
+                for name in LunationTable.__dataclass_fields__
+            }
+        )
+
+
+def _year_start_jd(year: int) -> float:
+    return datetime_to_julian_day(datetime(year, 1, 1, tzinfo=timezone.utc))
+
+
+class LunationCalculator:
+    """Find Amavasya/Purnima, lunar months, samvat years and eclipse candidates"""
+
+    def __init__(self) -> None:
+        self.astronomy = AstronomyEngine()
+        self._year_table = lru_cache(maxsize=LUNATION_CACHE_SIZE)(self._solve_year)
+
+    def _elongation(self, jd: np.ndarray) -> np.ndarray:
+        sun = self.astronomy.get_sidereal_longitude("Sun", jd)
+        moon = self.astronomy.get_sidereal_longitude("Moon", jd)
+        return (moon - sun) % 360.0
+
+    def _solve_year(self, year: int) -> LunationTable:
+        """Solve and classify every syzygy of one Gregorian year"""
+        start_jd = _year_start_jd(year)
+        end_jd = _year_start_jd(year + 1)
+        timeline = solve_element_timeline(
+            self._elongation,
+            SYZYGY_SPEC,
+            start_jd - YEAR_PADDING_DAYS,
+            end_jd + YEAR_PADDING_DAYS,
+        )
+        jd = timeline.starts
+        kind = timeline.indices.astype(np.uint8)
+
+        # Amanta months run from new moon to new moon and are named after the
+        # sign the Sun enters during the month; no sign change means adhika.
+        sun_rashi = (self.astronomy.get_sidereal_longitude("Sun", jd) // 30).astype(int)
+        new_rows = np.flatnonzero(kind == NEW_MOON)
+        month_of_row = np.searchsorted(jd[new_rows], jd, side="right") - 1
+        month_masa = (sun_rashi[new_rows] + 1) % 12 + 1
+        month_adhika = np.zeros(len(new_rows), dtype=bool)
+        month_adhika[:-1] = sun_rashi[new_rows[:-1]] == sun_rashi[new_rows[1:]]
+
+        # Rows before the first new moon lie in the padding and are sliced off
+        month_of_row = np.maximum(month_of_row, 0)
+        masa = month_masa[month_of_row]
+        adhika = month_adhika[month_of_row]
+
+        # Vikram Samvat turns over at Chaitra, so Pausha to Phalguna months
+        # beginning early in a Gregorian year belong to the previous samvat.
+        month_start = [julian_day_to_datetime(value) for value in jd[new_rows]]
+        start_year = np.array([value.year for value in month_start])
+        start_month = np.array([value.month for value in month_start])
+        month_samvat = start_year + 57 - ((month_masa >= 10) & (start_month <= 6))
+        samvat = month_samvat[month_of_row]
+
+        node = self.astronomy.get_lunar_node(jd)
+        sun = self.astronomy.get_sidereal_longitude("Sun", jd)
+        distance = np.abs((sun - node + 90.0) % 180.0 - 90.0)
+        eclipse = np.where(
+            (kind == NEW_MOON) & (distance <= SOLAR_ECLIPSE_LIMIT),
+            SOLAR_ECLIPSE,
+            np.where(
+                (kind == FULL_MOON) & (distance <= LUNAR_ECLIPSE_LIMIT),
+                LUNAR_ECLIPSE,
+                NO_ECLIPSE,
+            ),
+        )
+
+        table = LunationTable(
+            julian_day=jd,
+            kind=kind,
+            masa=masa.astype(np.uint8),
+            adhika=adhika,
+            vikram_samvat=samvat.astype(np.int16),
+            eclipse=eclipse.astype(np.uint8),
+            node_distance=distance.astype(np.float32),
+        )
+        return table.slice(start_jd, end_jd)
+
+    def get_table(self, start: datetime, end: datetime) -> LunationTable:
+        """Lunation table for [start, end), assembled from cached yearly tables"""
+        start_jd = datetime_to_julian_day(start)
+        end_jd = datetime_to_julian_day(end)
+        first_year = julian_day_to_datetime(start_jd).year
+        last_year = julian_day_to_datetime(end_jd).year
+        tables = [self._year_table(year) for year in range(first_year, last_year + 1)]
+        return LunationTable.concatenate(tables).slice(start_jd, end_jd)
+
+    def get_lunations(
+        self, start: datetime, end: datetime, eclipses_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        """List every Amavasya and Purnima between start and end"""
+        table = self.get_table(start, end)
+        tz = start.tzinfo or timezone.utc
+        rows = range(len(table))
+        if eclipses_only:
+            rows = np.flatnonzero(table.eclipse != NO_ECLIPSE)
+        return [self._row_to_dict(table, int(row), tz) for row in rows]
+
+    def find_eclipses(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """List solar and lunar eclipse candidates between start and end"""
+        return self.get_lunations(start, end, eclipses_only=True)
+
+    def get_masa(self, date: datetime) -> Dict[str, Any]:
+        """Lunar month (amanta) and samvat year running at a given moment"""
+        jd = datetime_to_julian_day(date)
+        year = julian_day_to_datetime(jd).year
+        table = LunationTable.concatenate(
+            [self._year_table(year - 1), self._year_table(year)]
+        )
+        new_moons = np.flatnonzero(table.kind == NEW_MOON)
+        row = int(new_moons[np.searchsorted(table.julian_day[new_moons], jd) - 1])
+        return self._row_to_dict(table, row, date.tzinfo or timezone.utc)
+
+    def _row_to_dict(self, table: LunationTable, row: int, tz: Any) -> Dict[str, Any]:
+        masa = int(table.masa[row])
+        eclipse: Optional[str] = {
+            NO_ECLIPSE: None,
+            SOLAR_ECLIPSE: "solar",
+            LUNAR_ECLIPSE: "lunar",
+        }[int(table.eclipse[row])]
+        samvat = int(table.vikram_samvat[row])
+        return {
+            "type": "Amavasya" if table.kind[row] == NEW_MOON else "Purnima",
+            "datetime": julian_day_to_datetime(float(table.julian_day[row]))
+            .astimezone(tz)
+            .isoformat(),
+            "masa": {
+                "number": masa,
+                "name": MASA_NAMES["en"][masa - 1],
+                "adhika": bool(table.adhika[row]),
+            },
+            "vikram_samvat": samvat,
+            "shaka_samvat": samvat - 135,
+            "eclipse": eclipse,
+            "node_distance": float(table.node_distance[row]),
+        }
@@ -0,0 +1,536 @@
+import heapq
+import multiprocessing
+import os
+from itertools import count, groupby, islice
+from multiprocessing.shared_memory import SharedMemory
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from yaegi.calculations.compatibility import (
+    DOSHA_FLAGS,
+    GUNA_TABLE,
+    PADA_COUNT,
+    GunaTable,
+    pada_index,
+)
+
+
+def dosha_mask(doshas: Iterable[str]) -> int:
+    """Combined flag of dosha names such as ``("nadi", "bhakoot")``"""
+    mask = 0
+    for name in doshas:
+        if name not in DOSHA_FLAGS:
+            raise ValueError(f"Unknown dosha: {name}")
+        mask |= DOSHA_FLAGS[name]
+    return mask
+
+
+class Matchmaker:
+    """Rank candidates by Guna Milan score straight from the pada table.
+
+    Scores depend only on the two padas, so candidates are grouped into the
+    108 pada buckets once and each distinct query pada walks the buckets
+    from its best score down; queries sharing a pada share the result. No
+    query x candidate array is ever built, so memory is O(candidates +
+    queries x k). Ranking keys pack the score with the candidate row, so
+    ties break towards the lower row. Results are (rows, points) arrays;
+    rows are -1 and points NaN where fewer than k candidates pass the
+    filters.
+    """
+
+    def __init__(self, table: GunaTable = GUNA_TABLE) -> None:
+        self.table = table
+
+    def eligibility(
+        self, min_points: float = 0.0, exclude_doshas: Iterable[str] = ()
+    ) -> np.ndarray:
+        """(male pada, female pada) pairs passing the score and dosha filters"""
+        blocked = dosha_mask(exclude_doshas)
+        return (self.table.points >= min_points * 2) & (
+            self.table.doshas & blocked == 0
+        )
+
+    def _pair_table(self, query_is_male: bool, table: np.ndarray) -> np.ndarray:
+        """Pada table indexed by [query pada, candidate pada]"""
+        return table if query_is_male else table.T
+
+    def score(
+        self,
+        query_moon: float,
+        candidate_moons: np.ndarray,
+        query_is_male: bool = True,
+    ) -> np.ndarray:
+        """Guna Milan points of one query Moon against every candidate Moon"""
+        points = self._pair_table(query_is_male, self.table.points)
+        return points[int(pada_index(query_moon))][pada_index(candidate_moons)] / 2.0
+
+    def top_matches(
+        self,
+        query_moon: float,
+        candidate_moons: np.ndarray,
+        k: int,
+        query_is_male: bool = True,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best k candidate rows and their points for one query Moon"""
+        rows, points = self.top_matches_many(
+            np.array([query_moon]),
+            candidate_moons,
+            k,
+            query_is_male=query_is_male,
+            min_points=min_points,
+            exclude_doshas=exclude_doshas,
+        )
+        found = rows[0] >= 0
+        return rows[0][found], points[0][found]
+
+    def top_matches_many(
+        self,
+        query_moons: np.ndarray,
+        candidate_moons: np.ndarray,
+        k: int,
+        query_is_male: bool = True,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best k candidates for every query Moon, as (Q, k) rows and points"""
+        keys = self.rank_keys(
+            pada_index(query_moons),
+            pada_index(candidate_moons),
+            k,
+            query_is_male=query_is_male,
+            eligible=self.eligibility(min_points, exclude_doshas),
+        )
+        return decode_keys(keys)
+
+    def rank_keys(
+        self,
+        query_padas: np.ndarray,
+        candidate_padas: np.ndarray,
+        k: int,
+        query_is_male: bool = True,
+        eligible: Union[np.ndarray, None] = None,
+        row_offset: int = 0,
+    ) -> np.ndarray:
+        """(Q, k) ranking keys over pada arrays, rows numbered from ``row_offset``"""
+        padas, inverse = np.unique(
+            np.asarray(query_padas, dtype=np.intp), return_inverse=True
+        )
+        keys = self.rank_pada_keys(
+            padas, candidate_padas, k, query_is_male, eligible, row_offset
+        )
+        return keys[inverse.reshape(-1)]
+
+    def rank_pada_keys(
+        self,
+        query_padas: np.ndarray,
+        candidate_padas: np.ndarray,
+        k: int,
+        query_is_male: bool = True,
+        eligible: Union[np.ndarray, None] = None,
+        row_offset: int = 0,
+    ) -> np.ndarray:
+        """(P, k) ranking keys, one row per query pada; memory is O(N + P x k)"""
+        candidate_padas = np.asarray(candidate_padas, dtype=np.intp)
+        points = self._pair_table(query_is_male, self.table.points).astype(np.int64)
+        if eligible is not None:
+            points = np.where(self._pair_table(query_is_male, eligible), points, -1)
+
+        # Candidate rows grouped by pada, ascending within each bucket
+        order = np.argsort(candidate_padas, kind="stable")
+        counts = np.bincount(candidate_padas, minlength=PADA_COUNT)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        best = np.full((len(query_padas), k), -1, dtype=np.int64)
+        for position, pada in enumerate(np.asarray(query_padas).tolist()):
+            found = 0
+            scores = points[pada]
+            for score in np.unique(scores[scores >= 0])[::-1].tolist():
+                # The first rows of every bucket at this score, lowest first
+                need = k - found
+                heads = [
+                    order[starts[bucket] : min(ends[bucket], starts[bucket] + need)]
+                    for bucket in np.flatnonzero(scores == score).tolist()
+                ]
+                rows = np.sort(np.concatenate(heads))[:need]
+                best[position, found : found + len(rows)] = encode_keys(
+                    np.full(len(rows), score), rows + row_offset
+                )
+                found += len(rows)
+                if found == k:
+                    break
+        return best
+
+
+# Keys pack (half-points, row) into one int64 that orders by points and then
+# by lower row first; -1 marks "no candidate".
+ROW_BITS: int = 40
+
+
+def encode_keys(half_points: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Ranking keys for half-point scores; negative scores mean filtered out"""
+    keys = (half_points.astype(np.int64) << ROW_BITS) | (
+        (1 << ROW_BITS) - 1 - np.asarray(rows, dtype=np.int64)
+    )
+    return np.where(half_points >= 0, keys, -1)
+
+
+def decode_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted (rows, points) from keys; empty slots become -1 and NaN"""
+    keys = -np.sort(-keys, axis=-1)
+    found = keys >= 0
+    rows = np.where(found, (1 << ROW_BITS) - 1 - (keys & ((1 << ROW_BITS) - 1)), -1)
+    points = np.where(found, (keys >> ROW_BITS) / 2.0, np.nan)
+    return rows, points
+
+
+def merge_keys(best: np.ndarray, keys: np.ndarray, k: int) -> np.ndarray:
+    """Largest k keys per row of two key arrays, unsorted"""
+    merged = np.concatenate((best, keys), axis=-1)
+    if merged.shape[-1] <= k:
+        return merged
+    top = np.argpartition(merged, -k, axis=-1)[..., -k:]
+    return np.take_along_axis(merged, top, axis=-1)
+
+
+class MatchIndex:
+    """Candidate pool grouped by Moon pada for queries independent of pool size.
+
+    Guna Milan points depend only on the two Moon padas, so candidates are
+    kept in one bucket per pada and a query ranks the 108 buckets instead of
+    the candidates. Buckets are insertion-ordered dicts, so inserts and
+    removals are O(1) and a bucket yields its candidates in arrival order.
+    """
+
+    def __init__(
+        self, candidates_are_male: bool = False, table: GunaTable = GUNA_TABLE
+    ) -> None:
+        self.candidates_are_male = candidates_are_male
+        # Indexed by [query pada, candidate bucket]
+        self.points = self._oriented(table.points) / 2.0
+        self.doshas = self._oriented(table.doshas)
+        # Buckets of each query pada from best to worst, lower bucket first
+        self.bucket_order = np.argsort(-self.points, axis=1, kind="stable")
+        self.buckets: List[Dict[Hashable, None]] = [{} for _ in range(PADA_COUNT)]
+        self.padas: Dict[Hashable, int] = {}
+        # Kept in step with the buckets so counts never rescan them
+        self.sizes: np.ndarray = np.zeros(PADA_COUNT, dtype=np.int64)
+
+    def _oriented(self, table: np.ndarray) -> np.ndarray:
+        """Pada table indexed by [query pada, candidate pada]"""
+        return table.T if self.candidates_are_male else table
+
+    @classmethod
+    def from_arrays(
+        cls,
+        candidate_ids: Iterable[Hashable],
+        moon_longitudes: np.ndarray,
+        candidates_are_male: bool = False,
+    ) -> "MatchIndex":
+        index = cls(candidates_are_male)
+        for candidate, pada in zip(candidate_ids, pada_index(moon_longitudes).tolist()):
+            index.insert_pada(candidate, pada)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.padas)
+
+    def __contains__(self, candidate: Hashable) -> bool:
+        return candidate in self.padas
+
+    def bucket_of(self, candidate: Hashable) -> int:
+        return self.padas[candidate]
+
+    def bucket_sizes(self) -> np.ndarray:
+        return self.sizes.copy()
+
+    def insert(self, candidate: Hashable, moon_longitude: float) -> None:
+        """Add a candidate, or move an existing one to its new Moon bucket"""
+        if candidate in self.padas:
+            self.remove(candidate)
+        self.insert_pada(candidate, int(pada_index(moon_longitude)))
+
+    def insert_pada(self, candidate: Hashable, pada: int) -> None:
+        if candidate in self.padas:
+            raise ValueError(f"Duplicate candidate: {candidate!r}")
+        self.padas[candidate] = pada
+        self.buckets[pada][candidate] = None
+        self.sizes[pada] += 1
+
+    def remove(self, candidate: Hashable) -> None:
+        pada = self.padas.pop(candidate)
+        del self.buckets[pada][candidate]
+        self.sizes[pada] -= 1
+
+    def eligible_buckets(
+        self,
+        query_pada: int,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+    ) -> np.ndarray:
+        """Candidate buckets passing the filters, best score first"""
+        order = self.bucket_order[query_pada]
+        passed = (self.points[query_pada, order] >= min_points) & (
+            self.doshas[query_pada, order] & dosha_mask(exclude_doshas) == 0
+        )
+        return order[passed]
+
+    def top_matches(
+        self,
+        query_moon: float,
+        k: int,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+    ) -> List[Tuple[Hashable, float]]:
+        """Best k (candidate, points) pairs for a query Moon"""
+        query = int(pada_index(query_moon))
+        matches: List[Tuple[Hashable, float]] = []
+        for pada in self.eligible_buckets(query, min_points, exclude_doshas):
+            points = float(self.points[query, pada])
+            for candidate in islice(self.buckets[pada], k - len(matches)):
+                matches.append((candidate, points))
+            if len(matches) == k:
+                break
+        return matches
+
+    def count_matches(
+        self,
+        query_moon: float,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+    ) -> int:
+        """Number of candidates passing the filters for a query Moon"""
+        query = int(pada_index(query_moon))
+        buckets = self.eligible_buckets(query, min_points, exclude_doshas)
+        return int(self.sizes[buckets].sum())
+
+
+# (points, -arrival, candidate): larger entries are better matches
+MatchEntry = Tuple[float, int, Hashable]
+
+
+class MatchTracker:
+    """Keep every profile's top-k matches current as profiles join and leave.
+
+    Profiles of one gender with the Moon in the same pada see the same
+    candidates at the same scores, so one min-heap of the best k entries is
+    kept per (gender, pada) bucket rather than per profile; ties go to the
+    candidate that joined first. A new profile is offered to each bucket of
+    the other gender and only enters when it beats that heap's minimum.
+    Removing a profile re-ranks only the heaps that held it, from at most
+    108 candidate buckets.
+    """
+
+    def __init__(
+        self,
+        k: int,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+        table: GunaTable = GUNA_TABLE,
+    ) -> None:
+        self.k = k
+        self.min_points = min_points
+        self.exclude_doshas = tuple(exclude_doshas)
+        # Profiles of each gender, indexed as candidates for the other one
+        self.indexes = {
+            True: MatchIndex(candidates_are_male=True, table=table),
+            False: MatchIndex(candidates_are_male=False, table=table),
+        }
+        blocked = dosha_mask(self.exclude_doshas)
+        # Eligible [seeker pada, candidate pada] pairs for seekers of each gender
+        self.eligible = {
+            is_male: (index.points >= min_points) & (index.doshas & blocked == 0)
+            for is_male, index in (
+                (True, self.indexes[False]),
+                (False, self.indexes[True]),
+            )
+        }
+        self.heaps: Dict[Tuple[bool, int], List[MatchEntry]] = {}
+        self.holders: Dict[Hashable, Set[Tuple[bool, int]]] = {}
+        self.arrival: Dict[Hashable, int] = {}
+        self.is_male: Dict[Hashable, bool] = {}
+        self._arrivals = count()
+
+    def __len__(self) -> int:
+        return len(self.arrival)
+
+    def __contains__(self, profile: Hashable) -> bool:
+        return profile in self.arrival
+
+    def add(self, profile: Hashable, moon_longitude: float, is_male: bool) -> None:
+        """Add a profile, or re-add an existing one with a new Moon"""
+        if profile in self.arrival:
+            self.remove(profile)
+        pada = int(pada_index(moon_longitude))
+        arrival = next(self._arrivals)
+        self.arrival[profile] = arrival
+        self.is_male[profile] = is_male
+        self.holders[profile] = set()
+        index = self.indexes[is_male]
+        index.insert_pada(profile, pada)
+
+        for key, heap in self.heaps.items():
+            side, bucket = key
+            if side == is_male or not self.eligible[side][bucket, pada]:
+                continue
+            entry = (float(index.points[bucket, pada]), -arrival, profile)
+            if len(heap) < self.k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                evicted = heapq.heapreplace(heap, entry)
+                self.holders[evicted[2]].discard(key)
+            else:
+                continue
+            self.holders[profile].add(key)
+
+        if (is_male, pada) not in self.heaps:
+            self._rerank((is_male, pada))
+
+    def remove(self, profile: Hashable) -> None:
+        is_male = self.is_male.pop(profile)
+        del self.arrival[profile]
+        index = self.indexes[is_male]
+        pada = index.bucket_of(profile)
+        index.remove(profile)
+        for key in self.holders.pop(profile):
+            self._rerank(key)
+        if not index.buckets[pada]:
+            self._release((is_male, pada))
+
+    def matches(self, profile: Hashable) -> List[Tuple[Hashable, float]]:
+        """Current top-k (candidate, points) of a profile, best first"""
+        is_male = self.is_male[profile]
+        key = (is_male, self.indexes[is_male].bucket_of(profile))
+        return [
+            (candidate, points)
+            for points, _, candidate in sorted(self.heaps[key], reverse=True)
+        ]
+
+    def _rank(self, is_male: bool, pada: int) -> List[MatchEntry]:
+        """Best k entries for a bucket, walking candidate buckets best first"""
+        index = self.indexes[not is_male]
+        buckets = index.eligible_buckets(pada, self.min_points, self.exclude_doshas)
+        scores = index.points[pada, buckets].tolist()
+        entries: List[MatchEntry] = []
+        for points, group in groupby(zip(scores, buckets.tolist()), key=itemgetter(0)):
+            # Buckets are in arrival order; merge equal-score ones by arrival
+            merged = heapq.merge(
+                *(index.buckets[bucket] for _, bucket in group),
+                key=self.arrival.__getitem__,
+            )
+            for candidate in islice(merged, self.k - len(entries)):
+                entries.append((points, -self.arrival[candidate], candidate))
+            if len(entries) == self.k:
+                break
+        heapq.heapify(entries)
+        return entries
+
+    def _rerank(self, key: Tuple[bool, int]) -> None:
+        self._release(key)
+        self.heaps[key] = self._rank(*key)
+        for _, _, candidate in self.heaps[key]:
+            self.holders[candidate].add(key)
+
+    def _release(self, key: Tuple[bool, int]) -> None:
+        for _, _, candidate in self.heaps.pop(key, []):
+            if candidate in self.holders:
+                self.holders[candidate].discard(key)
+
+
+# Per-worker view of the shared candidate padas, set by the pool initializer
+_SHARED: Dict[str, Any] = {}
+
+
+def _share(array: np.ndarray) -> SharedMemory:
+    """Copy an array into a new shared memory block"""
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block
+
+
+def _attach_shared(
+    candidate_block: str, candidate_count: int, options: Dict[str, Any]
+) -> None:
+    """Pool initializer mapping the shared candidate padas into this worker"""
+    block = SharedMemory(name=candidate_block)
+    _SHARED["block"] = block
+    _SHARED["candidates"] = np.ndarray(
+        (candidate_count,), dtype=np.int16, buffer=block.buf
+    )
+    _SHARED["options"] = options
+
+
+def _rank_shard(bounds: Tuple[int, int]) -> np.ndarray:
+    """Local top-k keys of every query pada against one candidate row range"""
+    first, last = bounds
+    options = dict(_SHARED["options"])
+    matchmaker = Matchmaker(options.pop("table"))
+    return matchmaker.rank_pada_keys(
+        candidate_padas=_SHARED["candidates"][first:last],
+        row_offset=first,
+        **options,
+    )
+
+
+class ParallelMatchmaker:
+    """Many-vs-many matchmaking across a process pool.
+
+    Candidate padas are written once to ``multiprocessing`` shared memory
+    as an int16 array; workers map it without pickling and rank one
+    candidate row range each. Only the distinct query padas (at most 108)
+    are ranked, so a worker needs O(shard + 108 x k) memory and returns a
+    (padas, k) key array. The parent merges those and scatters them back to
+    the queries, which gives the same result as
+    ``Matchmaker.top_matches_many``.
+    """
+
+    def __init__(
+        self, processes: Optional[int] = None, table: GunaTable = GUNA_TABLE
+    ) -> None:
+        self.processes = processes or os.cpu_count() or 1
+        self.matchmaker = Matchmaker(table)
+
+    def top_matches_many(
+        self,
+        query_moons: np.ndarray,
+        candidate_moons: np.ndarray,
+        k: int,
+        query_is_male: bool = True,
+        min_points: float = 0.0,
+        exclude_doshas: Iterable[str] = (),
+        shards: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best k candidates for every query Moon, as (Q, k) rows and points"""
+        padas, inverse = np.unique(pada_index(query_moons), return_inverse=True)
+        candidates = pada_index(candidate_moons).astype(np.int16)
+        edges = np.linspace(0, len(candidates), (shards or self.processes) + 1)
+        bounds = [
+            (first, last)
+            for first, last in zip(edges[:-1].astype(int), edges[1:].astype(int))
+            if last > first
+        ]
+        options = {
+            "query_padas": padas,
+            "k": k,
+            "query_is_male": query_is_male,
+            "eligible": self.matchmaker.eligibility(min_points, exclude_doshas),
+            "table": self.matchmaker.table,
+        }
+
+        block = _share(candidates)
+        try:
+            with multiprocessing.Pool(
+                min(self.processes, max(len(bounds), 1)),
+                initializer=_attach_shared,
+                initargs=(block.name, len(candidates), options),
+            ) as pool:
+                keys = np.full((len(padas), k), -1, dtype=np.int64)
+                for local in pool.imap_unordered(_rank_shard, bounds):
+                    keys = merge_keys(keys, local, k)
+        finally:
+            block.close()
+            block.unlink()
+        return decode_keys(keys[inverse.reshape(-1)])
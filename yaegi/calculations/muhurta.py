@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from yaegi.calculations.panchang import PanchangGenerator
+from yaegi.core import intervals
+from yaegi.core.boundaries import AngleFunction, solve_sign_timeline
+from yaegi.core.conversions import datetime_to_julian_day, julian_day_to_datetime
+from yaegi.core.houses import ascendant_longitude
+from yaegi.core.riseset import get_yearly_rise_set
+
+# Part of the daytime (1-8) ruled by Rahu, indexed by weekday (Monday = 0)
+RAHU_KAAL_PART: Tuple[int, ...] = (2, 7, 5, 6, 4, 3, 8)
+
+# Ascendant sign changes are bracketed on this grid, then Newton-refined. No
+# sign rises in under ten minutes below the polar circles.
+LAGNA_SAMPLE_STEP: float = 10.0 / 1440.0
+
+
+class MuhurtaFinder:
+    """Search time windows satisfying Panchang, weekday and lagna constraints.
+
+    Every constraint is turned into a set of intervals from solved element
+    boundaries, sunrise tables and ascendant sign changes; the answer is
+    their intersection, so the cost grows with the number of boundaries in
+    the range rather than with its length in minutes.
+    """
+
+    def __init__(self, panchang: Optional[PanchangGenerator] = None) -> None:
+        self.panchang = panchang or PanchangGenerator()
+        self.astronomy = self.panchang.astronomy
+
+    def _element_intervals(
+        self, element: str, allowed: Iterable[int], start_jd: float, end_jd: float
+    ) -> np.ndarray:
+        """Intervals where an element's number (1-based) is in ``allowed``"""
+        timeline = self.panchang.get_element_timeline(element, start_jd, end_jd)
+        allowed_indices = [number - 1 for number in allowed]
+        return intervals.segments_where(
+            timeline.starts, timeline.indices, allowed_indices
+        )
+
+    def _local_days(
+        self, start_jd: float, end_jd: float, latitude: float, longitude: float
+    ) -> Dict[str, np.ndarray]:
+        """Cached rise/set rows for every local day overlapping the range"""
+        offset = longitude / 360.0
+        first_year = julian_day_to_datetime(start_jd - 1.0 + offset).year
+        last_year = julian_day_to_datetime(end_jd + 1.0 + offset).year
+        tables = [
+            get_yearly_rise_set(latitude, longitude, year)
+            for year in range(first_year, last_year + 1)
+        ]
+        day_start = np.concatenate([table.day_start for table in tables])
+        rows = (day_start >= start_jd - 2.0) & (day_start <= end_jd + 1.0)
+        days = {
+            name: np.concatenate([getattr(table, name) for table in tables])[rows]
+            for name in ("day_start", "sunrise", "sunset")
+        }
+        days["weekday"] = (np.rint(days["day_start"] + offset + 0.5) % 7).astype(int)
+        return days
+
+    def _weekday_intervals(
+        self, days: Dict[str, np.ndarray], allowed: Iterable[int]
+    ) -> np.ndarray:
+        """Intervals of the allowed varas, each running sunrise to sunrise"""
+        # Without a sunrise (polar day or night) the vara starts at 06:00 LMT
+        starts = np.where(
+            np.isnan(days["sunrise"]), days["day_start"] + 0.25, days["sunrise"]
+        )
+        return intervals.segments_where(starts, days["weekday"], allowed)
+
+    def _rahu_kaal_intervals(self, days: Dict[str, np.ndarray]) -> np.ndarray:
+        """Rahu Kaal of every day: one eighth of the daytime, set by weekday"""
+        sunrise, sunset = days["sunrise"], days["sunset"]
+        valid = ~(np.isnan(sunrise) | np.isnan(sunset))
+        eighth = (sunset[valid] - sunrise[valid]) / 8.0
+        part = np.asarray(RAHU_KAAL_PART)[days["weekday"][valid]]
+        starts = sunrise[valid] + (part - 1) * eighth
+        return intervals.merge(np.column_stack((starts, starts + eighth)))
+
+    def lagna_function(self, latitude: float, longitude: float) -> AngleFunction:
+        """Sidereal ascendant as a vectorized function of Julian Day"""
+
+        def ascendant(jd: np.ndarray) -> np.ndarray:
+            lst = self.astronomy.get_local_sidereal_time(jd, longitude)
+            obliquity = self.astronomy.get_obliquity(jd)
+            tropical = ascendant_longitude(lst, latitude, obliquity)
+            return (tropical - self.astronomy.get_ayanamsa(jd)) % 360.0
+
+        return ascendant
+
+    def lagna_timeline(
+        self, start_jd: float, end_jd: float, latitude: float, longitude: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Ascendant sign boundaries over a range and the sign (0-11) after each"""
+        angle = self.lagna_function(latitude, longitude)
+        return solve_sign_timeline(angle, start_jd, end_jd, LAGNA_SAMPLE_STEP)
+
+    def find_intervals(
+        self,
+        start: datetime,
+        end: datetime,
+        latitude: float,
+        longitude: float,
+        tithis: Optional[Iterable[int]] = None,
+        nakshatras: Optional[Iterable[int]] = None,
+        weekdays: Optional[Iterable[int]] = None,
+        lagnas: Optional[Iterable[int]] = None,
+        exclude_rahu_kaal: bool = False,
+        min_duration: float = 0.0,
+    ) -> np.ndarray:
+        """Julian Day windows (shape (N, 2)) meeting every given constraint.
+
+        ``tithis`` are 1-30 (16-30 Krishna paksha), ``nakshatras`` 1-27,
+        ``weekdays`` 0-6 from Monday like ``datetime.weekday`` and ``lagnas``
+        the ascendant rashi 1-12. ``min_duration`` is in minutes.
+        """
+        start_jd = datetime_to_julian_day(start)
+        end_jd = datetime_to_julian_day(end)
+        constraints = [intervals.span(start_jd, end_jd)]
+        if tithis is not None:
+            constraints.append(
+                self._element_intervals("tithi", tithis, start_jd, end_jd)
+            )
+        if nakshatras is not None:
+            constraints.append(
+                self._element_intervals("nakshatra", nakshatras, start_jd, end_jd)
+            )
+        if lagnas is not None:
+            starts, labels = self.lagna_timeline(start_jd, end_jd, latitude, longitude)
+            constraints.append(
+                intervals.segments_where(
+                    starts, labels, [number - 1 for number in lagnas]
+                )
+            )
+
+        days: Optional[Dict[str, np.ndarray]] = None
+        if weekdays is not None or exclude_rahu_kaal:
+            days = self._local_days(start_jd, end_jd, latitude, longitude)
+        if weekdays is not None:
+            constraints.append(self._weekday_intervals(days, weekdays))
+
+        windows = intervals.intersect_all(constraints)
+        if exclude_rahu_kaal:
+            windows = intervals.subtract(windows, self._rahu_kaal_intervals(days))
+        if min_duration > 0:
+            windows = windows[intervals.durations(windows) >= min_duration / 1440.0]
+        return windows
+
+    def find_windows(
+        self,
+        start: datetime,
+        end: datetime,
+        latitude: float,
+        longitude: float,
+        **constraints: Any,
+    ) -> List[Dict[str, Any]]:
+        """Muhurta windows as start/end times in the timezone of ``start``.
+
+        Accepts the same constraints as ``find_intervals``.
+        """
+        tz = start.tzinfo or timezone.utc
+        windows = self.find_intervals(start, end, latitude, longitude, **constraints)
+        return [
+            {
+                "start": julian_day_to_datetime(begins).astimezone(tz).isoformat(),
+                "end": julian_day_to_datetime(ends).astimezone(tz).isoformat(),
+                "duration_minutes": round((ends - begins) * 1440.0, 1),
+            }
+            for begins, ends in windows.tolist()
+        ]
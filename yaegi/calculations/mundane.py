@@ -0,0 +1,168 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from yaegi.calculations.muhurta import MuhurtaFinder
+from yaegi.calculations.yoga_rules import (
+    LORDS_KEY,
+    YOGA_RULES,
+    ChartBatch,
+    YogaRule,
+    YogaRuleEngine,
+)
+from yaegi.core import intervals
+from yaegi.core.boundaries import solve_sign_timeline, solve_transit_timeline
+from yaegi.core.conversions import datetime_to_julian_day, julian_day_to_datetime
+
+# The mean node needs about 18 months per sign; a 10-day grid brackets it
+NODE_SAMPLE_STEP: float = 10.0
+
+
+class MundaneYogaFinder:
+    """Find when yogas are present in the sky over a date range.
+
+    The mundane chart is cast for a reference location with whole-sign
+    houses, so it only changes when a body or the ascendant enters a new
+    sign. Those ingresses are solved directly, the rules are evaluated once
+    per segment between consecutive ingresses, and the segments where a
+    yoga holds are merged into interval sets. Cost scales with the number
+    of ingresses rather than with a sampling rate.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[YogaRuleEngine] = None,
+        muhurta: Optional[MuhurtaFinder] = None,
+    ) -> None:
+        self.engine = engine or YOGA_RULES
+        self.muhurta = muhurta or MuhurtaFinder()
+        self.astronomy = self.muhurta.astronomy
+
+    def _select_rules(self, names: Optional[Iterable[str]]) -> List[int]:
+        """Columns of the requested rules; all timeable rules by default"""
+        timeable = [
+            column
+            for column, rule in enumerate(self.engine.rules)
+            if not any(key.endswith(".longitude") for key in self._depends(rule))
+        ]
+        if names is None:
+            return timeable
+        columns = []
+        for name in names:
+            if name not in self.engine.rule_names:
+                raise ValueError(f"Unknown yoga: {name}")
+            column = self.engine.rule_names.index(name)
+            if column not in timeable:
+                raise ValueError(
+                    f"{name} depends on exact longitudes, not only on ingresses"
+                )
+            columns.append(column)
+        return columns
+
+    def _depends(self, rule: YogaRule) -> Set[str]:
+        return set().union(
+            *(self.engine.conditions[position].depends for position in rule.conditions)
+        )
+
+    def longitudes(self, julian_days: np.ndarray) -> Dict[str, np.ndarray]:
+        """Sidereal longitudes of the planets and the mean lunar nodes"""
+        positions = {
+            planet: self.astronomy.get_sidereal_longitude(planet, julian_days)
+            for planet in self.astronomy.PLANET_SPEEDS
+        }
+        positions["Rahu"] = self.astronomy.get_lunar_node(julian_days)
+        positions["Ketu"] = (positions["Rahu"] + 180.0) % 360.0
+        return positions
+
+    def ingress_times(
+        self,
+        start_jd: float,
+        end_jd: float,
+        latitude: float,
+        longitude: float,
+        bodies: Iterable[str],
+    ) -> np.ndarray:
+        """Sorted instants inside the range at which any given body changes sign"""
+        events = []
+        for body in bodies:
+            if body == "Ascendant":
+                starts, _ = self.muhurta.lagna_timeline(
+                    start_jd, end_jd, latitude, longitude
+                )
+            elif body in ("Rahu", "Ketu"):
+                starts, _ = solve_sign_timeline(
+                    self.astronomy.get_lunar_node, start_jd, end_jd, NODE_SAMPLE_STEP
+                )
+            else:
+                starts = solve_transit_timeline(
+                    self.astronomy, body, start_jd, end_jd
+                ).starts
+            events.append(starts[(starts > start_jd) & (starts < end_jd)])
+        return np.unique(np.concatenate(events)) if events else np.empty(0)
+
+    def find_intervals(
+        self,
+        start: datetime,
+        end: datetime,
+        latitude: float,
+        longitude: float,
+        yogas: Optional[Iterable[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Julian Day interval sets (shape (N, 2)) for each yoga over [start, end).
+
+        ``yogas`` names the rules to time; by default every rule decided by
+        signs and houses alone. Rules reading exact longitudes (combustion,
+        Kaal Sarpa) raise ``ValueError`` when requested.
+        """
+        start_jd = datetime_to_julian_day(start)
+        end_jd = datetime_to_julian_day(end)
+        columns = self._select_rules(yogas)
+        depends = set().union(*(self._depends(self.engine.rules[c]) for c in columns))
+
+        # Ketu always changes sign together with Rahu
+        bodies = {key.split(".")[0] for key in depends if "." in key}
+        bodies = {"Rahu" if body == "Ketu" else body for body in bodies}
+        if LORDS_KEY in depends or any(key.endswith(".house") for key in depends):
+            bodies.add("Ascendant")
+        events = self.ingress_times(start_jd, end_jd, latitude, longitude, bodies)
+
+        boundaries = np.concatenate(([start_jd], events, [end_jd]))
+        middles = (boundaries[:-1] + boundaries[1:]) / 2
+        ascendant = self.muhurta.lagna_function(latitude, longitude)(middles)
+        batch = ChartBatch.from_longitudes(
+            self.longitudes(middles), ascendant, whole_sign=True
+        )
+        matrix = self.engine.evaluate_batch(batch)
+
+        present = np.zeros(len(boundaries), dtype=int)
+        result = {}
+        for column in columns:
+            present[:-1] = matrix[:, column]
+            result[self.engine.rules[column].name] = intervals.segments_where(
+                boundaries, present, [1]
+            )
+        return result
+
+    def find_periods(
+        self,
+        start: datetime,
+        end: datetime,
+        latitude: float,
+        longitude: float,
+        yogas: Optional[Iterable[str]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Yoga periods as start/end times in the timezone of ``start``"""
+        tz = start.tzinfo or timezone.utc
+        found = self.find_intervals(start, end, latitude, longitude, yogas)
+        return {
+            name: [
+                {
+                    "start": julian_day_to_datetime(begins).astimezone(tz).isoformat(),
+                    "end": julian_day_to_datetime(ends).astimezone(tz).isoformat(),
+                    "duration_days": round(ends - begins, 4),
+                }
+                for begins, ends in periods.tolist()
+            ]
+            for name, periods in found.items()
+        }
@@ -1,15 +1,28 @@
-from datetime import datetime
-from typing import Dict, Any, Tuple
+import math
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
 from yaegi.core.astronomy import AstronomyEngine
-from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.core.almanac import Almanac, get_default_almanac
+from yaegi.core.boundaries import (
+    PANCHANG_ELEMENTS,
+    ElementTimeline,
+    element_angle_function,
+    solve_element_timeline,
+    solve_panchang_timelines,
+)
+from yaegi.core.conversions import datetime_to_julian_day, julian_day_to_datetime
+from yaegi.core.riseset import rise_set_for_day, sunrise_sunset_for_days
 from yaegi.config.settings import NAKSHATRA_NAMES
+from yaegi.data.constants import KARANA_NAMES
 
 
 class PanchangGenerator:
     """Generate Panchang elements (Tithi, Nakshatra, Yoga, Karana) for a given date and location."""
 
-    def __init__(self) -> None:
+    def __init__(self, almanac: Optional[Almanac] = None) -> None:
         self.astronomy = AstronomyEngine()
+        self.almanac = almanac if almanac is not None else get_default_almanac()
 
     def calculate_tithi(self, sun_lon: float, moon_lon: float) -> Tuple[int, str]:
         """Calculate Tithi based on Sun and Moon sidereal longitudes."""
@@ -105,15 +118,109 @@ class PanchangGenerator:
         karana_num = ((tithi_num - 1) % 7) + 1
         return karana_num, karana_names[karana_num - 1]
 
+    def calculate_karana_from_elongation(self, elongation: float) -> Tuple[int, str]:
+        """Determine Karana from the Moon-Sun elongation (60 half-tithis).
+
+        The number follows the order of ``KARANA_NAMES``: 1-7 for the movable
+        karanas, then Shakuni, Chatushpada, Naga and Kimstughna (8-11).
+        """
+        half_tithi = int((elongation % 360) / 6)
+        if half_tithi == 0:
+            karana_num = 11
+        elif half_tithi >= 57:
+            karana_num = half_tithi - 49
+        else:
+            karana_num = (half_tithi - 1) % 7 + 1
+        return karana_num, KARANA_NAMES["en"][karana_num - 1]
+
+    def _name_element(self, element: str, index: int) -> Tuple[int, str]:
+        """Number and name of a 0-based element segment index."""
+        spec = PANCHANG_ELEMENTS[element]
+        middle = (index + 0.5) * spec.span
+        if element == "tithi":
+            return self.calculate_tithi(0.0, middle)
+        if element == "nakshatra":
+            return self.calculate_nakshatra(middle)
+        if element == "yoga":
+            return self.calculate_yoga(0.0, middle)
+        return self.calculate_karana_from_elongation(middle)
+
+    def _element_timelines(
+        self, start_jd: float, end_jd: float
+    ) -> Dict[str, ElementTimeline]:
+        """Element boundaries from the almanac when it covers the range, else solved."""
+        if self.almanac is not None and self.almanac.covers(start_jd, end_jd):
+            return self.almanac.timelines(start_jd, end_jd)
+        return solve_panchang_timelines(self.astronomy, start_jd, end_jd)
+
+    def get_element_timeline(
+        self, element: str, start_jd: float, end_jd: float
+    ) -> ElementTimeline:
+        """Boundaries of a single element over a range, from the almanac if possible."""
+        if self.almanac is not None and self.almanac.covers(start_jd, end_jd):
+            return self.almanac.timeline(element, start_jd, end_jd)
+        return solve_element_timeline(
+            element_angle_function(self.astronomy, element),
+            PANCHANG_ELEMENTS[element],
+            start_jd,
+            end_jd,
+        )
+
+    def get_elements_at(self, moment: datetime) -> Dict[str, Dict[str, Any]]:
+        """Tithi, nakshatra, yoga and karana running at an instant, with start/end.
+
+        Served by binary search in the almanac when one is loaded and covers
+        the instant; otherwise the surrounding boundaries are root-solved.
+        """
+        tz = moment.tzinfo or timezone.utc
+        jd = datetime_to_julian_day(moment)
+        elements: Dict[str, Dict[str, Any]] = {}
+        for name, timeline in self._element_timelines(jd, jd).items():
+            index, begins, ends = timeline.at(jd)
+            number, label = self._name_element(name, index)
+            elements[name] = {
+                "number": number,
+                "name": label,
+                "start": julian_day_to_datetime(begins).astimezone(tz).isoformat(),
+                "end": julian_day_to_datetime(ends).astimezone(tz).isoformat(),
+            }
+        return elements
+
+    def _local_noon_jd(self, day: date, longitude: float) -> float:
+        """Julian Day of local mean noon, which pins a civil date at any longitude."""
+        utc_noon = datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)
+        return datetime_to_julian_day(utc_noon) - longitude / 360.0
+
+    def _rise_set_jd(
+        self, jd: float, latitude: float, longitude: float, event: str
+    ) -> Optional[float]:
+        """Look up a rise/set Julian Day from the cached yearly solution."""
+        table, index = rise_set_for_day(jd, latitude, longitude)
+        value = float(getattr(table, event)[index])
+        return None if math.isnan(value) else value
+
+    def _format_time(self, jd: Optional[float], tz: Optional[tzinfo] = None) -> str:
+        """Format a Julian Day as HH:MM in the given timezone (UTC by default)."""
+        if jd is None:
+            return "--:--"
+        moment = julian_day_to_datetime(jd).astimezone(tz or timezone.utc)
+        return f"{moment.hour:02d}:{moment.minute:02d}"
+
     def calculate_sunrise(self, jd: float, latitude: float, longitude: float) -> str:
-        """Approximate sunrise time based on longitude."""
-        hour = 6 + (longitude / 15.0)
-        return f"{int(hour):02d}:{int((hour % 1) * 60):02d}"
+        """Calculate sunrise (UTC) with refraction, declination and latitude."""
+        return self._format_time(self._rise_set_jd(jd, latitude, longitude, "sunrise"))
 
     def calculate_sunset(self, jd: float, latitude: float, longitude: float) -> str:
-        """Approximate sunset time based on longitude."""
-        hour = 18 + (longitude / 15.0)
-        return f"{int(hour):02d}:{int((hour % 1) * 60):02d}"
+        """Calculate sunset (UTC) with refraction, declination and latitude."""
+        return self._format_time(self._rise_set_jd(jd, latitude, longitude, "sunset"))
+
+    def calculate_moonrise(self, jd: float, latitude: float, longitude: float) -> str:
+        """Calculate moonrise (UTC), or --:-- when the Moon does not rise."""
+        return self._format_time(self._rise_set_jd(jd, latitude, longitude, "moonrise"))
+
+    def calculate_moonset(self, jd: float, latitude: float, longitude: float) -> str:
+        """Calculate moonset (UTC), or --:-- when the Moon does not set."""
+        return self._format_time(self._rise_set_jd(jd, latitude, longitude, "moonset"))
 
     def generate_panchang(
         self, date: datetime, latitude: float, longitude: float
@@ -129,11 +236,19 @@ class PanchangGenerator:
         tithi_num, tithi_name = self.calculate_tithi(sun_lon, moon_lon)
         nakshatra_num, nakshatra_name = self.calculate_nakshatra(moon_lon)
         yoga_num, yoga_name = self.calculate_yoga(sun_lon, moon_lon)
-        karana_num, karana_name = self.calculate_karana(tithi_num)
+        karana_num, karana_name = self.calculate_karana_from_elongation(
+            moon_lon - sun_lon
+        )
 
-        # Sunrise and sunset (simplified)
-        sunrise_time = self.calculate_sunrise(jd, latitude, longitude)
-        sunset_time = self.calculate_sunset(jd, latitude, longitude)
+        # Sunrise, sunset, moonrise and moonset of the civil date, shown in
+        # the date's timezone
+        noon_jd = self._local_noon_jd(date.date(), longitude)
+        rise_set = {
+            event: self._format_time(
+                self._rise_set_jd(noon_jd, latitude, longitude, event), date.tzinfo
+            )
+            for event in ("sunrise", "sunset", "moonrise", "moonset")
+        }
 
         return {
             "date": date.strftime("%Y-%m-%d"),
@@ -142,7 +257,171 @@ class PanchangGenerator:
             "nakshatra": {"number": nakshatra_num, "name": nakshatra_name},
             "yoga": {"number": yoga_num, "name": yoga_name},
             "karana": {"number": karana_num, "name": karana_name},
-            "sunrise": sunrise_time,
-            "sunset": sunset_time,
+            "sunrise": rise_set["sunrise"],
+            "sunset": rise_set["sunset"],
+            "moonrise": rise_set["moonrise"],
+            "moonset": rise_set["moonset"],
             "moon_phase": ((moon_lon - sun_lon + 360) % 360) / 360 * 100,
         }
+
+    def generate_panchang_range(
+        self, start: datetime, end: datetime, latitude: float, longitude: float
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the daily Panchang for every date from start to end (inclusive).
+
+        Each day reports the tithi, nakshatra, yoga and karana running at local
+        sunrise together with their exact start and end times, shown in the
+        timezone of ``start``. Element boundaries are root-solved once for the
+        whole range, so consecutive days share them instead of re-solving.
+        """
+        tz = start.tzinfo or timezone.utc
+        days: List[date] = [
+            start.date() + timedelta(days=offset)
+            for offset in range((end.date() - start.date()).days + 1)
+        ]
+        if not days:
+            return
+
+        # Each day's sunrise and sunset are looked up once and reused below
+        solar: List[Tuple[Optional[float], Optional[float]]] = []
+        anchors: List[float] = []
+        for day in days:
+            noon_jd = self._local_noon_jd(day, longitude)
+            sunrise = self._rise_set_jd(noon_jd, latitude, longitude, "sunrise")
+            sunset = self._rise_set_jd(noon_jd, latitude, longitude, "sunset")
+            solar.append((sunrise, sunset))
+            # Polar day/night: fall back to local mean 06:00
+            anchors.append(noon_jd - 0.25 if sunrise is None else sunrise)
+
+        timelines = self._element_timelines(anchors[0], anchors[-1])
+
+        for day, anchor, (sunrise, sunset) in zip(days, anchors, solar):
+            yield self._panchang_entry(
+                day,
+                latitude,
+                longitude,
+                {name: timeline.at(anchor) for name, timeline in timelines.items()},
+                sunrise,
+                sunset,
+                tz,
+            )
+
+    def calculate_panchang_grid(
+        self,
+        start: datetime,
+        end: datetime,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """Sunrise Panchang for many locations as arrays of shape (days, locations).
+
+        Tithi, nakshatra, yoga and karana depend only on time, so their
+        boundaries are solved once for all locations. Sunrise/sunset come from
+        the cached yearly rise/set tables, as in ``generate_panchang_range``,
+        and the element prevailing at each local sunrise is looked up as
+        vectorized array operations.
+
+        Returns ``sunrise``/``sunset`` Julian Days (NaN during polar day or
+        night) and, per element, its 0-based ``<element>`` index with
+        ``<element>_start`` and ``<element>_end`` Julian Days.
+        """
+        lat = np.asarray(latitudes, dtype=float)
+        lon = np.asarray(longitudes, dtype=float)
+        day_count = (end.date() - start.date()).days + 1
+        first_noon = self._local_noon_jd(start.date(), 0.0)
+        noon = first_noon + np.arange(max(day_count, 0))[:, None] - lon[None, :] / 360
+        # The cached yearly tables keep sunrise identical to the single-location
+        # range for the same place
+        sunrise = np.empty(noon.shape)
+        sunset = np.empty(noon.shape)
+        for col in range(len(lat)):
+            sunrise[:, col], sunset[:, col] = sunrise_sunset_for_days(
+                noon[:, col], lat[col], lon[col]
+            )
+        # Polar day/night: fall back to local mean 06:00
+        anchor = np.where(np.isnan(sunrise), noon - 0.25, sunrise)
+
+        grid: Dict[str, np.ndarray] = {"sunrise": sunrise, "sunset": sunset}
+        if anchor.size == 0:
+            return grid
+        timelines = self._element_timelines(float(anchor.min()), float(anchor.max()))
+        for name, timeline in timelines.items():
+            rows = timeline.position(anchor)
+            grid[name] = timeline.indices[rows]
+            grid[f"{name}_start"] = timeline.starts[rows]
+            grid[f"{name}_end"] = timeline.starts[rows + 1]
+        return grid
+
+    def generate_panchang_multi(
+        self,
+        start: datetime,
+        end: datetime,
+        locations: Sequence[Tuple[float, float]],
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the daily sunrise Panchang for every (date, location) pair.
+
+        Entries match ``generate_panchang_range`` and come day by day, with
+        locations in the given order. The Sun-Moon work scales with the
+        number of days, not days x locations; see ``calculate_panchang_grid``.
+        """
+        tz = start.tzinfo or timezone.utc
+        latitudes = [lat for lat, _ in locations]
+        longitudes = [lon for _, lon in locations]
+        grid = self.calculate_panchang_grid(start, end, latitudes, longitudes)
+
+        def optional(value: float) -> Optional[float]:
+            return None if math.isnan(value) else float(value)
+
+        for row in range(grid["sunrise"].shape[0]):
+            day = start.date() + timedelta(days=row)
+            for col, (latitude, longitude) in enumerate(locations):
+                elements = {
+                    name: (
+                        int(grid[name][row, col]),
+                        float(grid[f"{name}_start"][row, col]),
+                        float(grid[f"{name}_end"][row, col]),
+                    )
+                    for name in PANCHANG_ELEMENTS
+                }
+                yield self._panchang_entry(
+                    day,
+                    latitude,
+                    longitude,
+                    elements,
+                    optional(grid["sunrise"][row, col]),
+                    optional(grid["sunset"][row, col]),
+                    tz,
+                )
+
+    def _panchang_entry(
+        self,
+        day: date,
+        latitude: float,
+        longitude: float,
+        elements: Dict[str, Tuple[int, float, float]],
+        sunrise: Optional[float],
+        sunset: Optional[float],
+        tz: tzinfo,
+    ) -> Dict[str, Any]:
+        """Build one daily Panchang dict from solved element segments."""
+
+        def moment(jd: Optional[float]) -> Optional[str]:
+            if jd is None:
+                return None
+            return julian_day_to_datetime(jd).astimezone(tz).isoformat()
+
+        entry: Dict[str, Any] = {
+            "date": day.strftime("%Y-%m-%d"),
+            "location": {"latitude": latitude, "longitude": longitude},
+        }
+        for element, (index, begins, ends) in elements.items():
+            number, name = self._name_element(element, index)
+            entry[element] = {
+                "number": number,
+                "name": name,
+                "start": moment(begins),
+                "end": moment(ends),
+            }
+        entry["sunrise"] = moment(sunrise)
+        entry["sunset"] = moment(sunset)
+        return entry
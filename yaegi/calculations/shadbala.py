@@ -0,0 +1,270 @@
+from functools import cached_property
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from yaegi.calculations.yoga_rules import PLANET_INDEX, SPECIAL_ASPECTS, ChartBatch
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.mathutils import angular_separation
+from yaegi.models.chart import KundaliChart
+
+SHADBALA_PLANETS: Tuple[str, ...] = (
+    "Sun",
+    "Moon",
+    "Mars",
+    "Mercury",
+    "Jupiter",
+    "Venus",
+    "Saturn",
+)
+COMPONENTS: Tuple[str, ...] = (
+    "sthana",
+    "dig",
+    "kala",
+    "chesta",
+    "naisargika",
+    "drik",
+)
+
+
+def _planet_values(values: Mapping[str, float]) -> np.ndarray:
+    return np.array([values[planet] for planet in SHADBALA_PLANETS], dtype=float)
+
+
+# Sidereal longitude of deep exaltation; debilitation is opposite
+EXALTATION_LONGITUDES = _planet_values(
+    {
+        "Sun": 10.0,
+        "Moon": 33.0,
+        "Mars": 298.0,
+        "Mercury": 165.0,
+        "Jupiter": 95.0,
+        "Venus": 357.0,
+        "Saturn": 200.0,
+    }
+)
+# Equal-house cusp (counted from the ascendant) of full directional strength
+DIG_BALA_HOUSES = _planet_values(
+    {
+        "Sun": 10,
+        "Moon": 4,
+        "Mars": 10,
+        "Mercury": 1,
+        "Jupiter": 1,
+        "Venus": 4,
+        "Saturn": 7,
+    }
+)
+NAISARGIKA_BALA = _planet_values(
+    {
+        planet: 60.0 * (7 - rank) / 7
+        for rank, planet in enumerate(
+            ("Sun", "Moon", "Venus", "Jupiter", "Mercury", "Mars", "Saturn")
+        )
+    }
+)
+MEAN_SPEEDS = _planet_values(AstronomyEngine.PLANET_SPEEDS)
+
+MOON = SHADBALA_PLANETS.index("Moon")
+SUN = SHADBALA_PLANETS.index("Sun")
+MASCULINE = np.isin(SHADBALA_PLANETS, ("Sun", "Mars", "Jupiter"))
+NEUTER = np.isin(SHADBALA_PLANETS, ("Mercury", "Saturn"))
+FEMININE = np.isin(SHADBALA_PLANETS, ("Moon", "Venus"))
+# Strong at noon (Sun, Jupiter, Venus) or at midnight (Moon, Mars, Saturn)
+DAY_STRONG = np.isin(SHADBALA_PLANETS, ("Sun", "Jupiter", "Venus"))
+NIGHT_STRONG = np.isin(SHADBALA_PLANETS, ("Moon", "Mars", "Saturn"))
+# Natural benefics; the Moon's nature follows its phase
+BENEFICS = np.isin(SHADBALA_PLANETS, ("Moon", "Mercury", "Jupiter", "Venus"))
+# [aspecting planet, sign distance 1-12]: full aspect on special houses
+FULL_DRISHTI = np.zeros((len(SHADBALA_PLANETS), 13), dtype=bool)
+for _planet, _distances in SPECIAL_ASPECTS.items():
+    FULL_DRISHTI[SHADBALA_PLANETS.index(_planet), list(_distances)] = True
+
+
+def drishti(angle: np.ndarray) -> np.ndarray:
+    """Aspect value (virupas) cast onto a point ``angle`` degrees ahead"""
+    angle = np.asarray(angle, dtype=float) % 360.0
+    return np.select(
+        [
+            angle < 30,
+            angle < 60,
+            angle < 90,
+            angle < 120,
+            angle < 150,
+            angle < 180,
+            angle < 300,
+        ],
+        [
+            0.0,
+            (angle - 30) / 2,
+            angle - 45,
+            30 + (120 - angle) / 2,
+            150 - angle,
+            (angle - 150) * 2,
+            (300 - angle) / 2,
+        ],
+        0.0,
+    )
+
+
+class Shadbala:
+    """Six-fold strength of the seven planets over any leading chart axes.
+
+    Arrays have shape (..., 7) in ``SHADBALA_PLANETS`` order and values are
+    in virupas (60 per rupa). Houses are equal houses from the ascendant.
+    Each component is computed once on first access and cached, so totals
+    and per-component features share the work.
+
+    The totals are partial and not comparable to classical Shadbala
+    figures or to the classical minimum strengths: sthana bala covers
+    uchcha, odd/even sign, kendradi and drekkana bala from the rashi chart
+    only (no saptavargaja), kala bala covers natonnata and paksha bala only
+    (no tribhaga, year/month/day/hora lords, ayana or yuddha bala), and
+    the Sun and Moon get no chesta bala. Use them to rank planets and
+    charts against each other.
+    """
+
+    def __init__(
+        self,
+        longitudes: np.ndarray,
+        ascendant: Union[float, np.ndarray],
+        speeds: Optional[np.ndarray] = None,
+    ) -> None:
+        self.longitudes = np.asarray(longitudes, dtype=float) % 360.0
+        self.ascendant = np.asarray(ascendant, dtype=float)[..., None]
+        self.speeds = MEAN_SPEEDS if speeds is None else np.asarray(speeds, float)
+
+    @classmethod
+    def from_positions(
+        cls,
+        positions: Mapping[str, Union[float, np.ndarray]],
+        ascendant: Union[float, np.ndarray],
+        speeds: Optional[Mapping[str, Union[float, np.ndarray]]] = None,
+    ) -> "Shadbala":
+        """From sidereal longitudes (and daily speeds) keyed by planet"""
+
+        def stack(values: Mapping[str, Any]) -> np.ndarray:
+            return np.stack(
+                [np.asarray(values[planet], float) for planet in SHADBALA_PLANETS],
+                axis=-1,
+            )
+
+        return cls(
+            stack(positions), ascendant, None if speeds is None else stack(speeds)
+        )
+
+    @classmethod
+    def from_chart(cls, chart: KundaliChart) -> "Shadbala":
+        """Strength of one chart; planets without a recorded speed move at the mean"""
+        planets = {planet.name: planet for planet in chart.planets}
+        return cls.from_positions(
+            {planet: planets[planet].longitude for planet in SHADBALA_PLANETS},
+            chart.ascendant,
+            {
+                planet: planets[planet].speed or MEAN_SPEEDS[column]
+                for column, planet in enumerate(SHADBALA_PLANETS)
+            },
+        )
+
+    @classmethod
+    def from_batch(
+        cls, batch: ChartBatch, speeds: Optional[np.ndarray] = None
+    ) -> "Shadbala":
+        """Strength of every chart of a batch; ``speeds`` has shape (charts, 7)"""
+        columns = [PLANET_INDEX[planet] for planet in SHADBALA_PLANETS]
+        return cls(batch.longitude[:, columns], batch.ascendant, speeds)
+
+    @cached_property
+    def house(self) -> np.ndarray:
+        return ((self.longitudes - self.ascendant) % 360.0 // 30 + 1).astype(np.int8)
+
+    @cached_property
+    def elongation(self) -> np.ndarray:
+        """Moon's distance from the Sun (0-180), shape (..., 1)"""
+        return angular_separation(
+            self.longitudes[..., MOON : MOON + 1], self.longitudes[..., SUN : SUN + 1]
+        )
+
+    @cached_property
+    def sthana(self) -> np.ndarray:
+        debilitation = (EXALTATION_LONGITUDES + 180.0) % 360.0
+        uchcha = angular_separation(self.longitudes, debilitation) / 3
+        odd_sign = self.longitudes // 30 % 2 == 0
+        ojhayugma = np.where(odd_sign != FEMININE, 15.0, 0.0)
+        kendradi = np.array([0.0, 60.0, 30.0, 15.0])[(self.house - 1) % 3 + 1]
+        decanate = self.longitudes % 30 // 10
+        drekkana = 15.0 * (
+            (MASCULINE & (decanate == 0))
+            | (NEUTER & (decanate == 1))
+            | (FEMININE & (decanate == 2))
+        )
+        return uchcha + ojhayugma + kendradi + drekkana
+
+    @cached_property
+    def dig(self) -> np.ndarray:
+        strongest = self.ascendant + (DIG_BALA_HOUSES - 1) * 30.0
+        return (180.0 - angular_separation(self.longitudes, strongest)) / 3
+
+    @cached_property
+    def kala(self) -> np.ndarray:
+        # Sun's distance from the 4th cusp: 0 at midnight, 180 at noon
+        unnata = angular_separation(
+            self.longitudes[..., SUN : SUN + 1], self.ascendant + 90.0
+        )
+        natonnata = np.where(
+            DAY_STRONG, unnata / 3, np.where(NIGHT_STRONG, 60.0 - unnata / 3, 60.0)
+        )
+        paksha = np.where(BENEFICS, self.elongation / 3, 60.0 - self.elongation / 3)
+        # The Moon's paksha bala counts double
+        paksha[..., MOON] *= 2
+        return natonnata + paksha
+
+    @cached_property
+    def chesta(self) -> np.ndarray:
+        # 60 when retrograde, 30 at mean speed, 0 at twice the mean speed
+        ratio = self.speeds / MEAN_SPEEDS
+        chesta = np.clip(30.0 * (2.0 - ratio), 0.0, 60.0)
+        chesta = np.broadcast_to(chesta, self.longitudes.shape).copy()
+        chesta[..., [SUN, MOON]] = 0.0
+        return chesta
+
+    @cached_property
+    def naisargika(self) -> np.ndarray:
+        return np.broadcast_to(NAISARGIKA_BALA, self.longitudes.shape)
+
+    @cached_property
+    def drik(self) -> np.ndarray:
+        """A quarter of benefic minus malefic aspect value received"""
+        # [..., aspecting, aspected]
+        ahead = self.longitudes[..., None, :] - self.longitudes[..., :, None]
+        signs = (self.longitudes // 30).astype(int)
+        distance = (signs[..., None, :] - signs[..., :, None]) % 12 + 1
+        full = FULL_DRISHTI[np.arange(len(SHADBALA_PLANETS))[:, None], distance]
+        value = np.where(full, 60.0, drishti(ahead))
+        value[..., np.arange(7), np.arange(7)] = 0.0
+        waxing = (self.longitudes[..., MOON] - self.longitudes[..., SUN]) % 360 < 180
+        benefic = np.broadcast_to(BENEFICS, self.longitudes.shape).copy()
+        benefic[..., MOON] = waxing
+        weight = np.where(benefic, 1.0, -1.0)
+        return (weight[..., :, None] * value).sum(axis=-2) / 4
+
+    @cached_property
+    def total(self) -> np.ndarray:
+        return sum(getattr(self, name) for name in COMPONENTS)
+
+    @property
+    def rupas(self) -> np.ndarray:
+        return self.total / 60.0
+
+    def components(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in COMPONENTS + ("total",)}
+
+    def to_dict(self, chart: Tuple[int, ...] = ()) -> Dict[str, Dict[str, float]]:
+        """Per-planet components of one chart, in virupas"""
+        values = {name: array[chart] for name, array in self.components().items()}
+        return {
+            planet: {
+                name: round(float(array[column]), 2) for name, array in values.items()
+            }
+            for column, planet in enumerate(SHADBALA_PLANETS)
+        }
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from yaegi.calculations.yoga_rules import (
+    ABSENT,
+    BATCH_PLANETS,
+    HOUSE_GROUPS,
+    PLANET_INDEX,
+    ChartBatch,
+)
+from yaegi.core.mathutils import (
+    ASPECT_NAMES,
+    angular_separation,
+    classify_separation,
+)
+from yaegi.models.chart import KundaliChart
+
+ChartInput = Union[KundaliChart, ChartBatch]
+
+MANGLIK_HOUSES = HOUSE_GROUPS["dosha_houses"]
+
+
+def as_batch(charts: ChartInput) -> ChartBatch:
+    if isinstance(charts, ChartBatch):
+        return charts
+    return ChartBatch.from_charts([charts])
+
+
+@dataclass(frozen=True)
+class SynastryGrid:
+    """Cross-chart aspects with the first chart's planets as rows.
+
+    Arrays have shape (charts, planets, planets) over ``BATCH_PLANETS``;
+    ``aspect`` indexes ``ASPECT_NAMES`` (-1 for none) and ``orb`` is the
+    exact distance from the aspect angle.
+    """
+
+    separation: np.ndarray
+    aspect: np.ndarray
+    orb: np.ndarray
+
+    def pairs(self, chart: int = 0) -> List[Dict[str, Any]]:
+        """Aspect records for one chart pair, tightest orb first"""
+        rows, columns = np.nonzero(self.aspect[chart] >= 0)
+        records = [
+            {
+                "planet_a": BATCH_PLANETS[row],
+                "planet_b": BATCH_PLANETS[column],
+                "aspect": ASPECT_NAMES[self.aspect[chart, row, column]],
+                "orb": round(float(self.orb[chart, row, column]), 4),
+            }
+            for row, column in zip(rows.tolist(), columns.tolist())
+        ]
+        return sorted(records, key=lambda record: record["orb"])
+
+
+class SynastryAnalyzer:
+    """Compare two charts, or one chart against a batch, planet by planet.
+
+    Inputs are charts or ``ChartBatch`` objects; a single chart broadcasts
+    against every row of a batch.
+    """
+
+    def __init__(self, orbs: Optional[Dict[str, float]] = None) -> None:
+        self.orbs = orbs
+
+    def cross_aspects(self, first: ChartInput, second: ChartInput) -> SynastryGrid:
+        """Aspects of every planet of ``first`` to every planet of ``second``"""
+        first, second = as_batch(first), as_batch(second)
+        separation = angular_separation(
+            first.longitude[:, :ABSENT, None], second.longitude[:, None, :ABSENT]
+        )
+        aspect, orb = classify_separation(separation, self.orbs)
+        return SynastryGrid(separation=separation, aspect=aspect, orb=orb)
+
+    def house_overlays(self, first: ChartInput, second: ChartInput) -> np.ndarray:
+        """Equal house of each ``first`` planet counted from ``second``'s ascendant.
+
+        Shape (charts, planets); 0 where the planet is missing.
+        """
+        first, second = as_batch(first), as_batch(second)
+        offset = (first.longitude[:, :ABSENT] - second.ascendant[:, None]) % 360.0
+        return np.where(np.isfinite(offset), offset // 30 + 1, 0).astype(np.int8)
+
+    def manglik(self, charts: ChartInput) -> np.ndarray:
+        """Whether Mars sits in a Manglik house, per chart"""
+        houses = as_batch(charts).house[:, PLANET_INDEX["Mars"]]
+        return np.isin(houses, MANGLIK_HOUSES)
+
+    def analyze(self, first: KundaliChart, second: KundaliChart) -> Dict[str, Any]:
+        """Synastry summary of one chart pair"""
+        first_batch, second_batch = as_batch(first), as_batch(second)
+        overlays = {
+            "a_in_b": self.house_overlays(first_batch, second_batch)[0],
+            "b_in_a": self.house_overlays(second_batch, first_batch)[0],
+        }
+        first_manglik = bool(self.manglik(first_batch)[0])
+        second_manglik = bool(self.manglik(second_batch)[0])
+        return {
+            "aspects": self.cross_aspects(first_batch, second_batch).pairs(),
+            "house_overlays": {
+                name: {
+                    BATCH_PLANETS[column]: int(house)
+                    for column, house in enumerate(houses.tolist())
+                    if house
+                }
+                for name, houses in overlays.items()
+            },
+            "manglik": {
+                "a": first_manglik,
+                "b": second_manglik,
+                # A dosha on both sides is traditionally held to cancel out
+                "matched": first_manglik == second_manglik,
+            },
+        }
@@ -0,0 +1,928 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.houses import ascendant_longitude
+from yaegi.core.mathutils import calculate_house_position
+from yaegi.data.constants import (
+    DEBILITATION_SIGNS,
+    EXALTATION_SIGNS,
+    OWN_SIGNS,
+    PLANET_NAMES,
+    RASHI_LORDS,
+)
+from yaegi.models.chart import KundaliChart
+
+DEFAULT_YOGA_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "yogas.json",
+)
+
+HOUSE_GROUPS: Dict[str, Tuple[int, ...]] = {
+    "kendra": (1, 4, 7, 10),
+    "trikona": (1, 5, 9),
+    "dusthana": (6, 8, 12),
+    "upachaya": (3, 6, 10, 11),
+    "dosha_houses": (1, 4, 7, 8, 12),
+}
+
+# Houses (counted from the planet, inclusive) aspected besides the 7th
+SPECIAL_ASPECTS: Dict[str, Tuple[int, ...]] = {
+    "Mars": (4, 8),
+    "Jupiter": (5, 9),
+    "Saturn": (3, 10),
+}
+
+# Distance from the Sun, in degrees, within which a planet is combust
+COMBUSTION_ORBS: Dict[str, float] = {
+    "Moon": 12.0,
+    "Mars": 17.0,
+    "Mercury": 14.0,
+    "Jupiter": 11.0,
+    "Venus": 10.0,
+    "Saturn": 15.0,
+}
+
+KAAL_SARPA_PLANETS: Tuple[str, ...] = (
+    "Sun",
+    "Moon",
+    "Mars",
+    "Mercury",
+    "Jupiter",
+    "Venus",
+    "Saturn",
+)
+
+STRONG_SIGNS: Dict[str, Tuple[int, ...]] = {
+    planet: tuple(OWN_SIGNS.get(planet, [])) + (EXALTATION_SIGNS[planet],)
+    for planet in EXALTATION_SIGNS
+}
+EXALTED_IN_SIGN: Dict[int, str] = {
+    sign: planet for planet, sign in EXALTATION_SIGNS.items() if planet in OWN_SIGNS
+}
+KNOWN_PLANETS: Dict[str, str] = {name.lower(): name for name in PLANET_NAMES["en"]}
+MALEFIC_STRENGTHS = ("negative", "challenging")
+
+# Batch columns follow PLANET_NAMES; one extra trailing column is always
+# empty, so looking up a missing planet (index ABSENT) reads as "absent".
+BATCH_PLANETS: Tuple[str, ...] = tuple(PLANET_NAMES["en"])
+PLANET_INDEX: Dict[str, int] = {name: i for i, name in enumerate(BATCH_PLANETS)}
+ABSENT: int = len(BATCH_PLANETS)
+BATCH_CHUNK_SIZE: int = 65536
+
+# Fact key for the house lords; planet facts are keyed "<planet>.<field>"
+LORDS_KEY: str = "lords"
+FACT_FIELDS: Tuple[str, ...] = ("house", "rashi", "longitude")
+
+
+def _planet_table(entries: Iterable[Tuple[str, int]], size: int) -> np.ndarray:
+    """Boolean lookup table indexed by [planet column, value]"""
+    table = np.zeros((ABSENT + 1, size), dtype=bool)
+    for planet, value in entries:
+        table[PLANET_INDEX[planet], value] = True
+    return table
+
+
+STRONG_TABLE = _planet_table(
+    ((planet, sign) for planet, signs in STRONG_SIGNS.items() for sign in signs), 13
+)
+DEBILITATED_TABLE = _planet_table(DEBILITATION_SIGNS.items(), 13)
+ASPECT_TABLE = _planet_table(
+    [(planet, 7) for planet in BATCH_PLANETS]
+    + [
+        (planet, distance)
+        for planet, distances in SPECIAL_ASPECTS.items()
+        for distance in distances
+    ],
+    13,
+)
+SIGN_LORD_COLUMN = np.array(
+    [ABSENT] + [PLANET_INDEX[RASHI_LORDS[sign]] for sign in range(1, 13)]
+)
+EXALTED_COLUMN = np.array(
+    [ABSENT]
+    + [PLANET_INDEX.get(EXALTED_IN_SIGN.get(sign, ""), ABSENT) for sign in range(1, 13)]
+)
+
+
+def _equal_house_lords(ascendant: float) -> Tuple[str, ...]:
+    lagna = int(ascendant // 30)
+    return tuple(RASHI_LORDS[(lagna + n) % 12 + 1] for n in range(12))
+
+
+@dataclass
+class ChartFacts:
+    """Per-chart values shared by every yoga condition.
+
+    ``house``, ``rashi`` and ``longitude`` are keyed by planet name and only
+    hold the planets present in the chart; ``lords[n - 1]`` is the lord of
+    house n.
+    """
+
+    house: Dict[str, int]
+    rashi: Dict[str, int]
+    longitude: Dict[str, float]
+    lords: Tuple[str, ...]
+    ascendant: Optional[float] = None
+
+    @classmethod
+    def from_chart(cls, chart: KundaliChart) -> "ChartFacts":
+        planets = [planet for planet in chart.planets if planet.name != "Ascendant"]
+        if len(chart.houses) == 12:
+            ordered = sorted(chart.houses, key=lambda house: house.number)
+            lords = tuple(house.lord for house in ordered)
+        else:
+            lords = _equal_house_lords(chart.ascendant)
+        return cls(
+            house={planet.name: planet.house for planet in planets},
+            rashi={planet.name: planet.rashi for planet in planets},
+            longitude={planet.name: planet.longitude for planet in planets},
+            lords=lords,
+            ascendant=chart.ascendant,
+        )
+
+    def moved(self, positions: Dict[str, float]) -> "ChartFacts":
+        """Facts after some bodies move to new sidereal longitudes.
+
+        ``positions`` may include ``"Ascendant"``. Moved planets are placed
+        in equal houses from the ascendant; a new ascendant re-houses every
+        planet and resets the house lords.
+        """
+        ascendant = positions.get("Ascendant", self.ascendant)
+        if ascendant is None:
+            raise ValueError("Moving chart facts requires their ascendant")
+        ascendant %= 360.0
+        rehouse_all = ascendant != self.ascendant
+        longitude = dict(self.longitude)
+        longitude.update(
+            (planet, value % 360.0)
+            for planet, value in positions.items()
+            if planet != "Ascendant"
+        )
+        house, rashi = dict(self.house), dict(self.rashi)
+        for planet, value in longitude.items():
+            if rehouse_all or planet in positions:
+                house[planet] = calculate_house_position(value, ascendant)
+                rashi[planet] = int(value // 30) + 1
+        return ChartFacts(
+            house=house,
+            rashi=rashi,
+            longitude=longitude,
+            lords=_equal_house_lords(ascendant) if rehouse_all else self.lords,
+            ascendant=ascendant,
+        )
+
+    def changed_keys(self, other: "ChartFacts") -> Set[str]:
+        """Fact keys (``"Moon.house"``, ``"lords"``, ...) that differ from other"""
+        changed = set()
+        for field in FACT_FIELDS:
+            mine, theirs = getattr(self, field), getattr(other, field)
+            changed.update(
+                f"{planet}.{field}"
+                for planet in mine.keys() | theirs.keys()
+                if mine.get(planet) != theirs.get(planet)
+            )
+        if self.lords != other.lords:
+            changed.add(LORDS_KEY)
+        return changed
+
+    def lord(self, house: int) -> str:
+        return self.lords[house - 1]
+
+    def aspects(self, source: str, target: str) -> bool:
+        """Whether ``source`` casts its graha drishti on ``target``'s house"""
+        if source not in self.house or target not in self.house:
+            return False
+        distance = (self.house[target] - self.house[source]) % 12 + 1
+        return distance == 7 or distance in SPECIAL_ASPECTS.get(source, ())
+
+
+@dataclass
+class ChartBatch:
+    """Many charts as aligned arrays with one column per ``BATCH_PLANETS`` entry.
+
+    ``house`` and ``rashi`` are 1-12 (0 when the chart lacks the planet),
+    ``longitude`` is NaN for missing planets, ``lords[:, n - 1]`` holds
+    the column of the lord of house n and ``ascendant`` is NaN when unknown.
+    """
+
+    house: np.ndarray
+    rashi: np.ndarray
+    longitude: np.ndarray
+    lords: np.ndarray
+    ascendant: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.house)
+
+    def slice(self, start: int, stop: int) -> "ChartBatch":
+        return ChartBatch(
+            **{
+                name: getattr(self, name)[start:stop]
+                for name in self.__dataclass_fields__
+            }
+        )
+
+    def lord(self, house: int) -> np.ndarray:
+        return self.lords[:, house - 1]
+
+    def take(self, values: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Per-chart lookup ``values[i, columns[i]]``; ``columns`` may be 2-D"""
+        columns = np.asarray(columns)
+        if columns.ndim == 1:
+            return values[np.arange(len(values)), columns]
+        return np.take_along_axis(values, columns, axis=1)
+
+    def facts(self, row: int) -> ChartFacts:
+        """The chart in one row, as used by the per-chart evaluation"""
+        present = np.flatnonzero(self.house[row, :ABSENT])
+        ascendant = float(self.ascendant[row])
+        return ChartFacts(
+            house={BATCH_PLANETS[i]: int(self.house[row, i]) for i in present},
+            rashi={BATCH_PLANETS[i]: int(self.rashi[row, i]) for i in present},
+            longitude={
+                BATCH_PLANETS[i]: float(self.longitude[row, i]) for i in present
+            },
+            lords=tuple(BATCH_PLANETS[i] for i in self.lords[row]),
+            ascendant=ascendant if np.isfinite(ascendant) else None,
+        )
+
+    @classmethod
+    def from_facts(cls, facts: List[ChartFacts]) -> "ChartBatch":
+        house = np.zeros((len(facts), ABSENT + 1), dtype=np.int8)
+        rashi = np.zeros_like(house)
+        longitude = np.full(house.shape, np.nan)
+        lords = np.empty((len(facts), 12), dtype=np.int8)
+        ascendant = np.array(
+            [np.nan if chart.ascendant is None else chart.ascendant for chart in facts]
+        )
+        for row, chart in enumerate(facts):
+            for planet, value in chart.house.items():
+                column = PLANET_INDEX[planet]
+                house[row, column] = value
+                rashi[row, column] = chart.rashi[planet]
+                longitude[row, column] = chart.longitude[planet]
+            lords[row] = [PLANET_INDEX[lord] for lord in chart.lords]
+        return cls(
+            house=house,
+            rashi=rashi,
+            longitude=longitude,
+            lords=lords,
+            ascendant=ascendant,
+        )
+
+    @classmethod
+    def from_charts(cls, charts: Iterable[KundaliChart]) -> "ChartBatch":
+        return cls.from_facts([ChartFacts.from_chart(chart) for chart in charts])
+
+    @classmethod
+    def from_longitudes(
+        cls,
+        longitudes: Dict[str, np.ndarray],
+        ascendant: np.ndarray,
+        whole_sign: bool = False,
+    ) -> "ChartBatch":
+        """Batch of equal (or whole-sign) house charts from sidereal longitudes"""
+        ascendant = np.asarray(ascendant, dtype=float)
+        longitude = np.full((len(ascendant), ABSENT + 1), np.nan)
+        for planet, values in longitudes.items():
+            longitude[:, PLANET_INDEX[planet]] = values
+        present = np.isfinite(longitude)
+        filled = np.where(present, longitude, 0.0)
+        rashi = np.where(present, filled // 30 + 1, 0).astype(np.int8)
+        first_cusp = ascendant // 30 * 30 if whole_sign else ascendant
+        offset = (filled - first_cusp[:, None]) % 360.0
+        house = np.where(present, offset // 30 + 1, 0).astype(np.int8)
+        lagna = (ascendant // 30).astype(int)
+        lords = SIGN_LORD_COLUMN[(lagna[:, None] + np.arange(12)) % 12 + 1]
+        return cls(
+            house=house,
+            rashi=rashi,
+            longitude=longitude,
+            lords=lords.astype(np.int8),
+            ascendant=ascendant,
+        )
+
+    @classmethod
+    def from_julian_days(
+        cls,
+        julian_days: np.ndarray,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        astronomy: Optional[AstronomyEngine] = None,
+    ) -> "ChartBatch":
+        """Equal-house birth charts computed directly as arrays"""
+        astronomy = astronomy or AstronomyEngine()
+        jd = np.asarray(julian_days, dtype=float)
+        lst = astronomy.get_local_sidereal_time(jd, np.asarray(longitudes, dtype=float))
+        tropical = ascendant_longitude(
+            lst, np.asarray(latitudes, dtype=float), astronomy.get_obliquity(jd)
+        )
+        ascendant = (tropical - astronomy.get_ayanamsa(jd)) % 360.0
+        positions = {
+            planet: astronomy.get_sidereal_longitude(planet, jd)
+            for planet in astronomy.PLANET_SPEEDS
+        }
+        positions["Rahu"] = astronomy.get_lunar_node(jd)
+        positions["Ketu"] = (positions["Rahu"] + 180.0) % 360.0
+        return cls.from_longitudes(positions, ascendant)
+
+
+class CompiledCondition(NamedTuple):
+    """A yoga condition for one chart and for a whole batch.
+
+    ``witness`` returns the planets that satisfy the condition (an empty
+    tuple when it fails); ``mask`` returns a boolean per chart of a batch.
+    """
+
+    witness: Callable[[ChartFacts], Tuple[str, ...]]
+    mask: Callable[[ChartBatch], np.ndarray]
+    depends: FrozenSet[str]
+
+
+def _keys(field: str, planets: Iterable[str]) -> FrozenSet[str]:
+    """Fact keys such as ``"Moon.house"`` read by a condition"""
+    return frozenset(f"{planet}.{field}" for planet in planets)
+
+
+# Lord-based conditions read the lords and whichever planets they turn out to be
+LORD_PLANETS: Tuple[str, ...] = tuple(dict.fromkeys(RASHI_LORDS.values()))
+LORD_HOUSE_KEYS = _keys("house", LORD_PLANETS) | {LORDS_KEY}
+LORD_RASHI_KEYS = _keys("rashi", LORD_PLANETS) | {LORDS_KEY}
+
+
+def _planet(token: str) -> str:
+    if token not in KNOWN_PLANETS:
+        raise ValueError(f"Unknown planet in yoga condition: {token}")
+    return KNOWN_PLANETS[token]
+
+
+def _in_houses(planet: str, houses: Tuple[int, ...]) -> CompiledCondition:
+    column = PLANET_INDEX[planet]
+
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        return (planet,) if facts.house.get(planet) in houses else ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        return np.isin(batch.house[:, column], houses)
+
+    return CompiledCondition(witness, mask, _keys("house", [planet]))
+
+
+def _in_strong_sign(planet: str) -> CompiledCondition:
+    signs = STRONG_SIGNS.get(planet, ())
+    column = PLANET_INDEX[planet]
+
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        return (planet,) if facts.rashi.get(planet) in signs else ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        return STRONG_TABLE[column, batch.rashi[:, column]]
+
+    return CompiledCondition(witness, mask, _keys("rashi", [planet]))
+
+
+def _conjunction(first: str, second: str) -> CompiledCondition:
+    a, b = PLANET_INDEX[first], PLANET_INDEX[second]
+
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        rashi = facts.rashi.get(first)
+        if rashi is not None and rashi == facts.rashi.get(second):
+            return (first, second)
+        return ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        rashi = batch.rashi[:, a]
+        return (rashi > 0) & (rashi == batch.rashi[:, b])
+
+    return CompiledCondition(witness, mask, _keys("rashi", [first, second]))
+
+
+def _mutual_kendra(first: str, second: str) -> CompiledCondition:
+    a, b = PLANET_INDEX[first], PLANET_INDEX[second]
+
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        if first not in facts.house or second not in facts.house:
+            return ()
+        if (facts.house[first] - facts.house[second]) % 3 == 0:
+            return (first, second)
+        return ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        house_a, house_b = batch.house[:, a], batch.house[:, b]
+        return (house_a > 0) & (house_b > 0) & ((house_a - house_b) % 3 == 0)
+
+    return CompiledCondition(witness, mask, _keys("house", [first, second]))
+
+
+def _not_combust(planet: str) -> CompiledCondition:
+    orb = COMBUSTION_ORBS.get(planet, 0.0)
+    column, sun = PLANET_INDEX[planet], PLANET_INDEX["Sun"]
+
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        if planet not in facts.longitude or "Sun" not in facts.longitude:
+            return ()
+        distance = abs(facts.longitude[planet] - facts.longitude["Sun"]) % 360.0
+        return (planet,) if min(distance, 360.0 - distance) > orb else ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        distance = np.abs(batch.longitude[:, column] - batch.longitude[:, sun]) % 360.0
+        return np.minimum(distance, 360.0 - distance) > orb
+
+    return CompiledCondition(witness, mask, _keys("longitude", [planet, "Sun"]))
+
+
+def _lords_together(first: int, second: int) -> CompiledCondition:
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        lords = (facts.lord(first), facts.lord(second))
+        houses = [facts.house.get(lord) for lord in lords]
+        if houses[0] is not None and houses[0] == houses[1]:
+            return tuple(dict.fromkeys(lords))
+        return ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        house_a = batch.take(batch.house, batch.lord(first))
+        house_b = batch.take(batch.house, batch.lord(second))
+        return (house_a > 0) & (house_a == house_b)
+
+    return CompiledCondition(witness, mask, LORD_HOUSE_KEYS)
+
+
+def _lords_mutual_aspect(first: int, second: int) -> CompiledCondition:
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        a, b = facts.lord(first), facts.lord(second)
+        if a != b and facts.aspects(a, b) and facts.aspects(b, a):
+            return (a, b)
+        return ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        lord_a, lord_b = batch.lord(first), batch.lord(second)
+        house_a = batch.take(batch.house, lord_a).astype(int)
+        house_b = batch.take(batch.house, lord_b).astype(int)
+        present = (house_a > 0) & (house_b > 0) & (lord_a != lord_b)
+        return (
+            present
+            & ASPECT_TABLE[lord_a, (house_b - house_a) % 12 + 1]
+            & ASPECT_TABLE[lord_b, (house_a - house_b) % 12 + 1]
+        )
+
+    return CompiledCondition(witness, mask, LORD_HOUSE_KEYS)
+
+
+def _lords_exchange(first: int, second: int) -> CompiledCondition:
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        a, b = facts.lord(first), facts.lord(second)
+        if facts.house.get(a) == second and facts.house.get(b) == first:
+            return (a, b)
+        return ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        return (batch.take(batch.house, batch.lord(first)) == second) & (
+            batch.take(batch.house, batch.lord(second)) == first
+        )
+
+    return CompiledCondition(witness, mask, LORD_HOUSE_KEYS)
+
+
+def _lord_strong(house: int) -> CompiledCondition:
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        lord = facts.lord(house)
+        return (lord,) if facts.rashi.get(lord) in STRONG_SIGNS.get(lord, ()) else ()
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        lord = batch.lord(house)
+        return STRONG_TABLE[lord, batch.take(batch.rashi, lord)]
+
+    return CompiledCondition(witness, mask, LORD_RASHI_KEYS)
+
+
+def _lords_in_houses(
+    sources: Tuple[int, ...], targets: Tuple[int, ...], require_all: bool
+) -> CompiledCondition:
+    def witness(facts: ChartFacts) -> Tuple[str, ...]:
+        lords = tuple(dict.fromkeys(facts.lord(house) for house in sources))
+        placed = tuple(lord for lord in lords if facts.house.get(lord) in targets)
+        if require_all and len(placed) < len(lords):
+            return ()
+        return placed
+
+    def mask(batch: ChartBatch) -> np.ndarray:
+        placed = np.column_stack(
+            [
+                np.isin(batch.take(batch.house, batch.lord(house)), targets)
+                for house in sources
+            ]
+        )
+        return placed.all(axis=1) if require_all else placed.any(axis=1)
+
+    return CompiledCondition(witness, mask, LORD_HOUSE_KEYS)
+
+
+def _between_nodes_witness(facts: ChartFacts) -> Tuple[str, ...]:
+    if "Rahu" in facts.longitude:
+        rahu = facts.longitude["Rahu"]
+    elif "Ketu" in facts.longitude:
+        rahu = facts.longitude["Ketu"] + 180.0
+    else:
+        return ()
+    if any(planet not in facts.longitude for planet in KAAL_SARPA_PLANETS):
+        return ()
+    sides = {
+        (facts.longitude[planet] - rahu) % 360.0 < 180.0
+        for planet in KAAL_SARPA_PLANETS
+    }
+    return KAAL_SARPA_PLANETS if len(sides) == 1 else ()
+
+
+def _between_nodes_mask(batch: ChartBatch) -> np.ndarray:
+    rahu = batch.longitude[:, PLANET_INDEX["Rahu"]]
+    rahu = np.where(
+        np.isnan(rahu), batch.longitude[:, PLANET_INDEX["Ketu"]] + 180.0, rahu
+    )
+    planets = batch.longitude[:, [PLANET_INDEX[name] for name in KAAL_SARPA_PLANETS]]
+    present = np.isfinite(rahu) & np.isfinite(planets).all(axis=1)
+    ahead = (planets - rahu[:, None]) % 360.0 < 180.0
+    return present & (ahead.all(axis=1) | ~ahead.any(axis=1))
+
+
+def _debilitated_witness(facts: ChartFacts) -> Tuple[str, ...]:
+    return tuple(
+        planet
+        for planet, rashi in facts.rashi.items()
+        if DEBILITATION_SIGNS.get(planet) == rashi
+    )
+
+
+def _debilitated_columns(batch: ChartBatch) -> np.ndarray:
+    """(N, planets) mask of debilitated planets"""
+    return DEBILITATED_TABLE[np.arange(ABSENT), batch.rashi[:, :ABSENT]]
+
+
+def _cancelled_witness(facts: ChartFacts) -> Tuple[str, ...]:
+    """Debilitated planets whose sign lord or exalted planet sits in a kendra"""
+    cancelled = []
+    for planet in _debilitated_witness(facts):
+        sign = facts.rashi[planet]
+        helpers = (RASHI_LORDS[sign], EXALTED_IN_SIGN.get(sign))
+        if any(facts.house.get(helper) in HOUSE_GROUPS["kendra"] for helper in helpers):
+            cancelled.append(planet)
+    return tuple(cancelled)
+
+
+def _cancelled_mask(batch: ChartBatch) -> np.ndarray:
+    signs = batch.rashi[:, :ABSENT]
+    kendra = HOUSE_GROUPS["kendra"]
+    rescued = np.isin(batch.take(batch.house, SIGN_LORD_COLUMN[signs]), kendra)
+    rescued |= np.isin(batch.take(batch.house, EXALTED_COLUMN[signs]), kendra)
+    return (_debilitated_columns(batch) & rescued).any(axis=1)
+
+
+def _exchange_witness(facts: ChartFacts) -> Tuple[str, ...]:
+    exchanged = []
+    for planet, rashi in facts.rashi.items():
+        lord = RASHI_LORDS[rashi]
+        if lord != planet and RASHI_LORDS.get(facts.rashi.get(lord, 0)) == planet:
+            exchanged.append(planet)
+    return tuple(exchanged)
+
+
+def _exchange_mask(batch: ChartBatch) -> np.ndarray:
+    columns = np.arange(ABSENT)
+    lords = SIGN_LORD_COLUMN[batch.rashi[:, :ABSENT]]
+    returned = SIGN_LORD_COLUMN[batch.take(batch.rashi, lords)]
+    return ((lords != columns) & (returned == columns)).any(axis=1)
+
+
+_ORDINAL = r"(\d+)(?:st|nd|rd|th)"
+_GROUP = "(" + "|".join(HOUSE_GROUPS) + ")"
+
+NAMED_CONDITIONS: Dict[str, CompiledCondition] = {
+    "trikona_lord_in_kendra": _lords_in_houses(
+        HOUSE_GROUPS["trikona"], HOUSE_GROUPS["kendra"], require_all=False
+    ),
+    "dusthana_lords_in_dusthana": _lords_in_houses(
+        HOUSE_GROUPS["dusthana"], HOUSE_GROUPS["dusthana"], require_all=False
+    ),
+    "wealth_lords_well_placed": _lords_in_houses(
+        (2, 5, 11),
+        HOUSE_GROUPS["kendra"] + HOUSE_GROUPS["trikona"],
+        require_all=True,
+    ),
+    "planets_between_rahu_ketu": CompiledCondition(
+        _between_nodes_witness,
+        _between_nodes_mask,
+        _keys("longitude", KAAL_SARPA_PLANETS + ("Rahu", "Ketu")),
+    ),
+    "debilitated_planet": CompiledCondition(
+        _debilitated_witness,
+        lambda batch: _debilitated_columns(batch).any(axis=1),
+        _keys("rashi", BATCH_PLANETS),
+    ),
+    "cancellation_present": CompiledCondition(
+        _cancelled_witness,
+        _cancelled_mask,
+        _keys("rashi", BATCH_PLANETS) | _keys("house", BATCH_PLANETS),
+    ),
+    "mutual_exchange": CompiledCondition(
+        _exchange_witness, _exchange_mask, _keys("rashi", BATCH_PLANETS)
+    ),
+}
+
+# Parametrised conditions, tried in order; planet tokens are validated so
+# that e.g. "mars_in_kendra" never reads as a two-planet pattern.
+CONDITION_PATTERNS: List[Tuple[str, Callable[..., CompiledCondition]]] = [
+    (r"([a-z]+)_in_own_exalt", lambda p: _in_strong_sign(_planet(p))),
+    (rf"([a-z]+)_in_{_GROUP}", lambda p, g: _in_houses(_planet(p), HOUSE_GROUPS[g])),
+    (r"([a-z]+)_not_combusted", lambda p: _not_combust(_planet(p))),
+    (
+        r"([a-z]+)_([a-z]+)_conjunction",
+        lambda a, b: _conjunction(_planet(a), _planet(b)),
+    ),
+    (r"([a-z]+)_([a-z]+)_kendra", lambda a, b: _mutual_kendra(_planet(a), _planet(b))),
+    (
+        rf"{_ORDINAL}_lord_with_{_ORDINAL}_lord",
+        lambda a, b: _lords_together(int(a), int(b)),
+    ),
+    (rf"{_ORDINAL}_lord_strong", lambda h: _lord_strong(int(h))),
+    (r"mutual_aspect_(\d+)_(\d+)", lambda a, b: _lords_mutual_aspect(int(a), int(b))),
+    (r"lords_exchange_(\d+)_(\d+)", lambda a, b: _lords_exchange(int(a), int(b))),
+]
+
+
+def compile_condition(token: str) -> CompiledCondition:
+    """Turn a symbolic condition from yogas.json into a compiled condition"""
+    if token in NAMED_CONDITIONS:
+        return NAMED_CONDITIONS[token]
+    for pattern, build in CONDITION_PATTERNS:
+        match = re.fullmatch(pattern, token)
+        if match:
+            return build(*match.groups())
+    raise ValueError(f"Unknown yoga condition: {token}")
+
+
+@dataclass(frozen=True)
+class YogaRule:
+    """One yoga with its conditions as indices into the engine's condition list"""
+
+    name: str
+    category: str
+    description: str
+    result: str
+    strength: str
+    type: str
+    conditions: Tuple[int, ...]
+    mask: int
+    match_any: bool
+
+    def matches(self, bits: int) -> bool:
+        if self.match_any:
+            return bool(bits & self.mask)
+        return bits & self.mask == self.mask
+
+
+class YogaRuleEngine:
+    """Yoga rules compiled once from data and evaluated together per chart.
+
+    Every distinct condition token is compiled a single time and shared by
+    all the rules using it; evaluation runs each condition once, packs the
+    outcomes into a bitmask and matches every rule against it. Batches run
+    the same conditions as NumPy masks and combine them with one matrix
+    product.
+    """
+
+    def __init__(self, data: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.tokens: List[str] = []
+        self.conditions: List[CompiledCondition] = []
+        self.rules: List[YogaRule] = []
+        index: Dict[str, int] = {}
+
+        for category, entries in data.items():
+            for entry in entries:
+                positions = []
+                for token in entry["conditions"]:
+                    if token not in index:
+                        index[token] = len(self.tokens)
+                        self.tokens.append(token)
+                        self.conditions.append(compile_condition(token))
+                    positions.append(index[token])
+                match = entry.get("match", "all")
+                if match not in ("all", "any"):
+                    raise ValueError(f"Unknown match mode for {entry['name']}: {match}")
+                strength = entry.get("strength", "medium")
+                self.rules.append(
+                    YogaRule(
+                        name=entry["name"],
+                        category=category,
+                        description=entry.get("description", entry.get("result", "")),
+                        result=entry.get("result", ""),
+                        strength=strength,
+                        type=entry.get(
+                            "type",
+                            "malefic" if strength in MALEFIC_STRENGTHS else "benefic",
+                        ),
+                        conditions=tuple(positions),
+                        mask=sum(1 << position for position in set(positions)),
+                        match_any=match == "any",
+                    )
+                )
+
+        # Rule r holds when at least required[r] of its member conditions do
+        self._members = np.zeros((len(self.tokens), len(self.rules)), dtype=np.float32)
+        for column, rule in enumerate(self.rules):
+            self._members[list(rule.conditions), column] = 1.0
+        self._required = np.where(
+            [rule.match_any for rule in self.rules], 1.0, self._members.sum(axis=0)
+        )
+
+        # Dependency graph for incremental updates: fact key -> conditions
+        # reading it, and condition -> rules using it
+        self._readers: Dict[str, List[int]] = {}
+        for position, condition in enumerate(self.conditions):
+            for key in condition.depends:
+                self._readers.setdefault(key, []).append(position)
+        self._users: List[List[int]] = [[] for _ in self.conditions]
+        for column, rule in enumerate(self.rules):
+            for position in set(rule.conditions):
+                self._users[position].append(column)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_YOGA_PATH) -> "YogaRuleEngine":
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    @property
+    def rule_names(self) -> List[str]:
+        return [rule.name for rule in self.rules]
+
+    def evaluate_facts(self, facts: ChartFacts) -> List[Dict[str, Any]]:
+        """Every rule matching the given chart facts"""
+        witnesses = [condition.witness(facts) for condition in self.conditions]
+        bits = 0
+        for position, planets in enumerate(witnesses):
+            if planets:
+                bits |= 1 << position
+        return [
+            self._describe(rule, facts, witnesses)
+            for rule in self.rules
+            if rule.matches(bits)
+        ]
+
+    def evaluate(
+        self, chart: KundaliChart, category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Yogas present in a chart, optionally restricted to one category"""
+        yogas = self.evaluate_facts(ChartFacts.from_chart(chart))
+        if category is not None:
+            yogas = [yoga for yoga in yogas if yoga["category"] == category]
+        return yogas
+
+    def affected(self, keys: Iterable[str]) -> Tuple[List[int], List[int]]:
+        """Conditions reading any of the fact keys, and the rules using them"""
+        conditions = sorted(
+            {position for key in keys for position in self._readers.get(key, ())}
+        )
+        rules = sorted({column for p in conditions for column in self._users[p]})
+        return conditions, rules
+
+    def track(self, chart: Union[KundaliChart, ChartFacts]) -> "YogaTracker":
+        """Incrementally updatable yoga state for a moving chart"""
+        if isinstance(chart, KundaliChart):
+            chart = ChartFacts.from_chart(chart)
+        return YogaTracker(self, chart)
+
+    def evaluate_batch(
+        self, batch: ChartBatch, chunk_size: int = BATCH_CHUNK_SIZE
+    ) -> np.ndarray:
+        """Boolean matrix of shape (charts, rules); columns follow ``rules``"""
+        matrix = np.empty((len(batch), len(self.rules)), dtype=bool)
+        for start in range(0, len(batch), chunk_size):
+            chunk = batch.slice(start, start + chunk_size)
+            held = np.column_stack(
+                [condition.mask(chunk) for condition in self.conditions]
+            )
+            counts = held.astype(np.float32) @ self._members
+            matrix[start : start + len(chunk)] = counts >= self._required
+        return matrix
+
+    def detect_batch(
+        self, batch: ChartBatch, chunk_size: int = BATCH_CHUNK_SIZE
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Yoga matrix plus detail records, built only for the hits.
+
+        Each record is the per-chart description with a ``chart`` key giving
+        its row in the batch.
+        """
+        matrix = self.evaluate_batch(batch, chunk_size)
+        records = []
+        for row in np.flatnonzero(matrix.any(axis=1)):
+            facts = batch.facts(int(row))
+            witnesses = [condition.witness(facts) for condition in self.conditions]
+            for column in np.flatnonzero(matrix[row]):
+                record = self._describe(self.rules[column], facts, witnesses)
+                record["chart"] = int(row)
+                records.append(record)
+        return matrix, records
+
+    def _describe(
+        self, rule: YogaRule, facts: ChartFacts, witnesses: List[Tuple[str, ...]]
+    ) -> Dict[str, Any]:
+        planets = list(
+            dict.fromkeys(
+                planet for position in rule.conditions for planet in witnesses[position]
+            )
+        )
+        houses = list(dict.fromkeys(facts.house[planet] for planet in planets))
+        return {
+            "name": rule.name,
+            "category": rule.category,
+            "type": rule.type,
+            "description": rule.description,
+            "result": rule.result,
+            "strength": rule.strength,
+            "planets": planets,
+            "houses": houses,
+        }
+
+
+class YogaTracker:
+    """Yogas of one chart kept current while a few of its bodies move.
+
+    ``update`` diffs the chart facts, re-runs only the conditions reading a
+    changed fact and re-matches only the rules using those conditions.
+    """
+
+    def __init__(self, engine: YogaRuleEngine, facts: ChartFacts) -> None:
+        self.engine = engine
+        self.facts = facts
+        self._witnesses = [condition.witness(facts) for condition in engine.conditions]
+        self._bits = 0
+        for position, planets in enumerate(self._witnesses):
+            if planets:
+                self._bits |= 1 << position
+        self._records: Dict[int, Dict[str, Any]] = {
+            column: engine._describe(rule, facts, self._witnesses)
+            for column, rule in enumerate(engine.rules)
+            if rule.matches(self._bits)
+        }
+
+    @property
+    def yogas(self) -> List[Dict[str, Any]]:
+        """Yogas currently present, in rule order"""
+        return [self._records[column] for column in sorted(self._records)]
+
+    def update(
+        self, positions: Dict[str, float]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Move bodies (``"Ascendant"`` included) and return (added, removed) yogas"""
+        facts = self.facts.moved(positions)
+        changed = self.facts.changed_keys(facts)
+        conditions, rules = self.engine.affected(changed)
+        self.facts = facts
+        for position in conditions:
+            planets = self.engine.conditions[position].witness(facts)
+            self._witnesses[position] = planets
+            if planets:
+                self._bits |= 1 << position
+            else:
+                self._bits &= ~(1 << position)
+
+        added, removed = [], []
+        for column in rules:
+            rule = self.engine.rules[column]
+            if rule.matches(self._bits):
+                record = self.engine._describe(rule, facts, self._witnesses)
+                if column not in self._records:
+                    added.append(record)
+                self._records[column] = record
+            elif column in self._records:
+                removed.append(self._records.pop(column))
+
+        # Yogas still present whose planets changed house only need new details
+        for column, record in self._records.items():
+            if any(f"{planet}.house" in changed for planet in record["planets"]):
+                rule = self.engine.rules[column]
+                self._records[column] = self.engine._describe(
+                    rule, facts, self._witnesses
+                )
+        return added, removed
+
+
+YOGA_RULES = YogaRuleEngine.from_file()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 import argparse
 import json
+import os
 from datetime import datetime
 from yaegi.calculations.kundali import KundaliGenerator
 from yaegi.calculations.panchang import PanchangGenerator
 from yaegi.calculations.yogas import YogaDetector
 from yaegi.calculations.compatibility import CompatibilityAnalyzer
-from yaegi.calculations.dasha import DashaCalculator
+from yaegi.calculations.dasha import DASHA_LEVELS, DashaCalculator
+from yaegi.core.almanac import DEFAULT_ALMANAC_PATH, Almanac
 
 
 def parse_datetime(date_str: str, time_str: str) -> datetime:
@@ -63,6 +65,8 @@ def panchang_command(args):
             print(f"Karana: {panchang['karana']['name']}")
             print(f"Sunrise: {panchang['sunrise']}")
             print(f"Sunset: {panchang['sunset']}")
+            print(f"Moonrise: {panchang['moonrise']}")
+            print(f"Moonset: {panchang['moonset']}")
     except Exception as e:
         print(f"Error generating Panchang: {e}")
 
@@ -105,7 +109,7 @@ def dasha_command(args):
         )
         calculator = DashaCalculator()
         dasha_system = calculator.calculate_vimshottari_dasha(chart)
-        current_dasha = calculator.get_current_dasha(dasha_system)
+        current_dasha = calculator.get_current_dasha(dasha_system, depth=args.depth)
         if args.format == "json":
             print(json.dumps(current_dasha, indent=2, default=str))
         else:
@@ -118,6 +122,13 @@ def dasha_command(args):
                 antar = current_dasha["antardasha"]
                 print(f"\nCurrent Antardasha: {antar['planet']}")
                 print(f"Period: {antar['start_date'][:10]} to {antar['end_date'][:10]}")
+            for level in DASHA_LEVELS[2 : args.depth]:
+                if current_dasha[level]:
+                    period = current_dasha[level]
+                    print(f"\nCurrent {level.capitalize()}: {period['planet']}")
+                    print(
+                        f"Period: {period['start_date'][:16]} to {period['end_date'][:16]}"
+                    )
     except Exception as e:
         print(f"Error calculating Dasha: {e}")
 
@@ -157,6 +168,36 @@ def compatibility_command(args):
         print(f"Error analyzing compatibility: {e}")
 
 
+def almanac_command(args):
+    """Generate or extend the precomputed Panchang almanac file"""
+    try:
+        if args.extend and os.path.exists(args.output):
+            almanac = Almanac.load(args.output).extended(args.start_year, args.end_year)
+        else:
+            almanac = Almanac.build(args.start_year, args.end_year)
+        almanac.save(args.output)
+        counts = {name: len(ticks) for name, ticks in almanac.ticks.items()}
+        if args.format == "json":
+            print(
+                json.dumps(
+                    {
+                        "output": args.output,
+                        "start_year": almanac.start_year,
+                        "end_year": almanac.end_year,
+                        "boundaries": counts,
+                    },
+                    indent=2,
+                )
+            )
+        else:
+            print(f"Almanac written to {args.output}")
+            print(f"Coverage: {almanac.start_year} to {almanac.end_year}")
+            for name, count in counts.items():
+                print(f"{name.title()} boundaries: {count}")
+    except Exception as e:
+        print(f"Error generating almanac: {e}")
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(description="Yaegi - Vedic Astrology CLI")
@@ -203,6 +244,13 @@ def main():
         "--longitude", type=float, required=True, help="Longitude"
     )
     dasha_parser.add_argument("--timezone", default="UTC", help="Timezone")
+    dasha_parser.add_argument(
+        "--depth",
+        type=int,
+        default=2,
+        choices=range(1, len(DASHA_LEVELS) + 1),
+        help="Dasha levels to show (1=mahadasha .. 5=prana)",
+    )
 
     comp_parser = subparsers.add_parser("compatibility", help="Analyze compatibility")
     comp_parser.add_argument(
@@ -231,6 +279,24 @@ def main():
     )
     comp_parser.add_argument("--timezone", default="UTC", help="Timezone")
 
+    almanac_parser = subparsers.add_parser(
+        "almanac", help="Generate or extend the Panchang almanac file"
+    )
+    almanac_parser.add_argument(
+        "--start-year", type=int, default=1900, help="First year covered"
+    )
+    almanac_parser.add_argument(
+        "--end-year", type=int, default=2100, help="Last year covered"
+    )
+    almanac_parser.add_argument(
+        "--output", default=DEFAULT_ALMANAC_PATH, help="Almanac file path"
+    )
+    almanac_parser.add_argument(
+        "--extend",
+        action="store_true",
+        help="Extend an existing file, solving only the missing years",
+    )
+
     args = parser.parse_args()
 
     if args.command == "kundali":
@@ -243,6 +309,8 @@ def main():
         dasha_command(args)
     elif args.command == "compatibility":
         compatibility_command(args)
+    elif args.command == "almanac":
+        almanac_command(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,263 @@
+import json
+import math
+import os
+import struct
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from yaegi.core.astronomy import AstronomyEngine
+from yaegi.core.boundaries import (
+    PANCHANG_ELEMENTS,
+    ElementTimeline,
+    solve_panchang_timelines,
+)
+from yaegi.core.conversions import datetime_to_julian_day
+
+ALMANAC_MAGIC: bytes = b"YAEGIALM"
+ALMANAC_VERSION: int = 1
+# Boundaries are packed as unsigned 32-bit ticks from the file epoch; two
+# second ticks keep one-second rounding and cover 272 years per file.
+TICK_SECONDS: float = 2.0
+TICKS_PER_DAY: float = 86400.0 / TICK_SECONDS
+MAX_TICK: int = 2**32 - 1
+SEAM_TOLERANCE: float = 60.0 / 86400.0
+
+DEFAULT_ALMANAC_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "almanac.bin",
+)
+
+_HEADER = struct.Struct("<8sHI")
+
+
+def _year_start_jd(year: int) -> float:
+    return datetime_to_julian_day(datetime(year, 1, 1, tzinfo=timezone.utc))
+
+
+class Almanac:
+    """Sorted start instants of every tithi, nakshatra, yoga and karana.
+
+    Each element is stored as a ``uint32`` array of packed start ticks and a
+    ``uint8`` array of 0-based segment indices. Files written by ``save`` are
+    opened with ``numpy.memmap`` by ``load``, so a lookup is a binary search
+    over mapped pages rather than an ephemeris evaluation.
+    """
+
+    def __init__(
+        self,
+        start_year: int,
+        end_year: int,
+        epoch_jd: float,
+        ticks: Dict[str, np.ndarray],
+        indices: Dict[str, np.ndarray],
+    ) -> None:
+        self.start_year: int = start_year
+        self.end_year: int = end_year
+        self.epoch_jd: float = epoch_jd
+        self.ticks: Dict[str, np.ndarray] = ticks
+        self.indices: Dict[str, np.ndarray] = indices
+        self.start_jd: float = _year_start_jd(start_year)
+        self.end_jd: float = _year_start_jd(end_year + 1)
+
+    @classmethod
+    def build(
+        cls,
+        start_year: int,
+        end_year: int,
+        engine: Optional[AstronomyEngine] = None,
+    ) -> "Almanac":
+        """Solve every element boundary from Jan 1 of start_year to Dec 31 of end_year"""
+        if end_year < start_year:
+            raise ValueError("end_year must not precede start_year")
+        engine = engine or AstronomyEngine()
+        start_jd = _year_start_jd(start_year)
+        end_jd = _year_start_jd(end_year + 1)
+        if (end_jd - start_jd + 2) * TICKS_PER_DAY > MAX_TICK:
+            raise ValueError("Almanac range too long for 32-bit packed ticks")
+
+        timelines = solve_panchang_timelines(engine, start_jd, end_jd)
+        # A nakshatra can outlast a day, so the first solved start may fall
+        # more than a day before start_jd
+        epoch_jd = float(
+            np.floor(min(timeline.starts[0] for timeline in timelines.values()))
+        )
+        ticks: Dict[str, np.ndarray] = {}
+        indices: Dict[str, np.ndarray] = {}
+        for name, timeline in timelines.items():
+            ticks[name] = cls._pack(timeline.starts, epoch_jd)
+            indices[name] = timeline.indices.astype(np.uint8)
+        return cls(start_year, end_year, epoch_jd, ticks, indices)
+
+    @staticmethod
+    def _pack(julian_days: np.ndarray, epoch_jd: float) -> np.ndarray:
+        ticks = np.round((julian_days - epoch_jd) * TICKS_PER_DAY)
+        if len(ticks) and (ticks.min() < 0 or ticks.max() > MAX_TICK):
+            raise ValueError("Boundary outside the 32-bit tick range of the epoch")
+        return ticks.astype(np.uint32)
+
+    def covers(self, start_jd: float, end_jd: Optional[float] = None) -> bool:
+        """Whether the almanac holds every boundary needed for a JD range"""
+        end_jd = start_jd if end_jd is None else end_jd
+        return self.start_jd <= start_jd and end_jd < self.end_jd
+
+    def timeline(self, element: str, start_jd: float, end_jd: float) -> ElementTimeline:
+        """Slice of an element's boundaries covering [start_jd, end_jd]"""
+        if not self.covers(start_jd, end_jd):
+            raise ValueError("Requested range outside almanac coverage")
+        ticks = self.ticks[element]
+        lo = int(np.searchsorted(ticks, self._tick(start_jd), side="right")) - 1
+        hi = int(np.searchsorted(ticks, self._tick(end_jd), side="right")) + 1
+        rows = slice(max(lo, 0), min(hi, len(ticks)))
+        return ElementTimeline(
+            spec=PANCHANG_ELEMENTS[element],
+            starts=self.epoch_jd + np.asarray(ticks[rows], dtype=float) / TICKS_PER_DAY,
+            indices=np.asarray(self.indices[element][rows], dtype=np.int16),
+        )
+
+    def timelines(self, start_jd: float, end_jd: float) -> Dict[str, ElementTimeline]:
+        """Timelines for all four elements, like ``solve_panchang_timelines``"""
+        return {
+            name: self.timeline(name, start_jd, end_jd) for name in PANCHANG_ELEMENTS
+        }
+
+    def element_at(self, element: str, julian_day: float) -> Tuple[int, float, float]:
+        """Segment index (0-based), start and end Julian Day at an instant"""
+        if not self.covers(julian_day):
+            raise ValueError("Requested instant outside almanac coverage")
+        ticks = self.ticks[element]
+        row = int(ticks.searchsorted(self._tick(julian_day), side="right")) - 1
+        return (
+            int(self.indices[element][row]),
+            self.epoch_jd + int(ticks[row]) / TICKS_PER_DAY,
+            self.epoch_jd + int(ticks[row + 1]) / TICKS_PER_DAY,
+        )
+
+    def _tick(self, julian_day: float) -> np.uint32:
+        # Whole ticks keep searchsorted on the uint32 arrays free of casts
+        tick = math.floor((julian_day - self.epoch_jd) * TICKS_PER_DAY)
+        return np.uint32(min(max(tick, 0), MAX_TICK))
+
+    def extended(
+        self,
+        start_year: int,
+        end_year: int,
+        engine: Optional[AstronomyEngine] = None,
+    ) -> "Almanac":
+        """Return an almanac also covering start_year..end_year.
+
+        Only the missing years are solved; existing boundaries are reused and
+        repacked against the new epoch.
+        """
+        start_year = min(start_year, self.start_year)
+        end_year = max(end_year, self.end_year)
+        parts = []
+        if start_year < self.start_year:
+            parts.append(Almanac.build(start_year, self.start_year - 1, engine))
+        parts.append(self)
+        if end_year > self.end_year:
+            parts.append(Almanac.build(self.end_year + 1, end_year, engine))
+
+        epoch_jd = min(part.epoch_jd for part in parts)
+        ticks: Dict[str, np.ndarray] = {}
+        indices: Dict[str, np.ndarray] = {}
+        for name in PANCHANG_ELEMENTS:
+            starts_parts = []
+            index_parts = []
+            for part in parts:
+                starts = (
+                    part.epoch_jd + np.asarray(part.ticks[name], float) / TICKS_PER_DAY
+                )
+                idx = np.asarray(part.indices[name])
+                if starts_parts:
+                    # Adjacent parts both hold the boundaries around their seam
+                    keep = starts > starts_parts[-1][-1] + SEAM_TOLERANCE
+                    starts, idx = starts[keep], idx[keep]
+                starts_parts.append(starts)
+                index_parts.append(idx)
+            ticks[name] = self._pack(np.concatenate(starts_parts), epoch_jd)
+            indices[name] = np.concatenate(index_parts).astype(np.uint8)
+        return Almanac(start_year, end_year, epoch_jd, ticks, indices)
+
+    def save(self, path: str) -> None:
+        """Write the almanac as a header followed by 8-byte aligned arrays"""
+        layout: Dict[str, Dict[str, int]] = {}
+        blobs = []
+        offset = 0
+        for name in PANCHANG_ELEMENTS:
+            for kind, array in (
+                ("ticks", self.ticks[name]),
+                ("indices", self.indices[name]),
+            ):
+                data = np.ascontiguousarray(array).tobytes()
+                layout[f"{name}.{kind}"] = {"offset": offset, "count": len(array)}
+                padding = (-len(data)) % 8
+                blobs.append(data + b"\0" * padding)
+                offset += len(data) + padding
+
+        header = json.dumps(
+            {
+                "start_year": self.start_year,
+                "end_year": self.end_year,
+                "epoch_jd": self.epoch_jd,
+                "tick_seconds": TICK_SECONDS,
+                "arrays": layout,
+            }
+        ).encode("utf-8")
+        header += b" " * ((-(_HEADER.size + len(header))) % 8)
+        # Write beside the target and swap, so a mapped copy is never truncated
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(_HEADER.pack(ALMANAC_MAGIC, ALMANAC_VERSION, len(header)))
+            handle.write(header)
+            for blob in blobs:
+                handle.write(blob)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Almanac":
+        """Memory-map an almanac file written by ``save``"""
+        with open(path, "rb") as handle:
+            magic, version, header_size = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != ALMANAC_MAGIC or version != ALMANAC_VERSION:
+                raise ValueError(f"Not a yaegi almanac file: {path}")
+            header = json.loads(handle.read(header_size).decode("utf-8"))
+        if header["tick_seconds"] != TICK_SECONDS:
+            raise ValueError(f"Unsupported almanac tick size in {path}")
+
+        base = _HEADER.size + header_size
+        ticks: Dict[str, np.ndarray] = {}
+        indices: Dict[str, np.ndarray] = {}
+        for name in PANCHANG_ELEMENTS:
+            for kind, dtype, target in (
+                ("ticks", np.uint32, ticks),
+                ("indices", np.uint8, indices),
+            ):
+                entry = header["arrays"][f"{name}.{kind}"]
+                mapped = np.memmap(
+                    path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=base + entry["offset"],
+                    shape=(entry["count"],),
+                )
+                # Plain ndarray view of the mapping avoids memmap overhead
+                target[name] = mapped.view(np.ndarray)
+        return cls(
+            header["start_year"], header["end_year"], header["epoch_jd"], ticks, indices
+        )
+
+
+_DEFAULT_ALMANAC: Dict[str, Optional[Almanac]] = {}
+
+
+def get_default_almanac() -> Optional[Almanac]:
+    """The packaged almanac if it has been generated, loaded once"""
+    if DEFAULT_ALMANAC_PATH not in _DEFAULT_ALMANAC:
+        almanac = None
+        if os.path.exists(DEFAULT_ALMANAC_PATH):
+            almanac = Almanac.load(DEFAULT_ALMANAC_PATH)
+        _DEFAULT_ALMANAC[DEFAULT_ALMANAC_PATH] = almanac
+    return _DEFAULT_ALMANAC[DEFAULT_ALMANAC_PATH]
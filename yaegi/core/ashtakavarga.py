@@ -0,0 +1,166 @@
+from typing import Dict, Mapping, Tuple, Union
+
+import numpy as np
+
+ASHTAKAVARGA_PLANETS: Tuple[str, ...] = (
+    "Sun",
+    "Moon",
+    "Mars",
+    "Mercury",
+    "Jupiter",
+    "Venus",
+    "Saturn",
+)
+REFERENCES: Tuple[str, ...] = ASHTAKAVARGA_PLANETS + ("Ascendant",)
+
+# Houses, counted from each reference, in which a planet receives a bindu
+# (Brihat Parashara Hora Shastra). Keys are planet, then reference.
+BINDU_HOUSES: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    "Sun": {
+        "Sun": (1, 2, 4, 7, 8, 9, 10, 11),
+        "Moon": (3, 6, 10, 11),
+        "Mars": (1, 2, 4, 7, 8, 9, 10, 11),
+        "Mercury": (3, 5, 6, 9, 10, 11, 12),
+        "Jupiter": (5, 6, 9, 11),
+        "Venus": (6, 7, 12),
+        "Saturn": (1, 2, 4, 7, 8, 9, 10, 11),
+        "Ascendant": (3, 4, 6, 10, 11, 12),
+    },
+    "Moon": {
+        "Sun": (3, 6, 7, 8, 10, 11),
+        "Moon": (1, 3, 6, 7, 10, 11),
+        "Mars": (2, 3, 5, 6, 9, 10, 11),
+        "Mercury": (1, 3, 4, 5, 7, 8, 10, 11),
+        "Jupiter": (1, 4, 7, 8, 10, 11, 12),
+        "Venus": (3, 4, 5, 7, 9, 10, 11),
+        "Saturn": (3, 5, 6, 11),
+        "Ascendant": (3, 6, 10, 11),
+    },
+    "Mars": {
+        "Sun": (3, 5, 6, 10, 11),
+        "Moon": (3, 6, 11),
+        "Mars": (1, 2, 4, 7, 8, 10, 11),
+        "Mercury": (3, 5, 6, 11),
+        "Jupiter": (6, 10, 11, 12),
+        "Venus": (6, 8, 11, 12),
+        "Saturn": (1, 4, 7, 8, 9, 10, 11),
+        "Ascendant": (1, 3, 6, 10, 11),
+    },
+    "Mercury": {
+        "Sun": (5, 6, 9, 11, 12),
+        "Moon": (2, 4, 6, 8, 10, 11),
+        "Mars": (1, 2, 4, 7, 8, 9, 10, 11),
+        "Mercury": (1, 3, 5, 6, 9, 10, 11, 12),
+        "Jupiter": (6, 8, 11, 12),
+        "Venus": (1, 2, 3, 4, 5, 8, 9, 11),
+        "Saturn": (1, 2, 4, 7, 8, 9, 10, 11),
+        "Ascendant": (1, 2, 4, 6, 8, 10, 11),
+    },
+    "Jupiter": {
+        "Sun": (1, 2, 3, 4, 7, 8, 9, 10, 11),
+        "Moon": (2, 5, 7, 9, 11),
+        "Mars": (1, 2, 4, 7, 8, 10, 11),
+        "Mercury": (1, 2, 4, 5, 6, 9, 10, 11),
+        "Jupiter": (1, 2, 3, 4, 7, 8, 10, 11),
+        "Venus": (2, 5, 6, 9, 10, 11),
+        "Saturn": (3, 5, 6, 12),
+        "Ascendant": (1, 2, 4, 5, 6, 7, 9, 10, 11),
+    },
+    "Venus": {
+        "Sun": (8, 11, 12),
+        "Moon": (1, 2, 3, 4, 5, 8, 9, 11, 12),
+        "Mars": (3, 5, 6, 9, 11, 12),
+        "Mercury": (3, 5, 6, 9, 11),
+        "Jupiter": (5, 8, 9, 10, 11),
+        "Venus": (1, 2, 3, 4, 5, 8, 9, 10, 11),
+        "Saturn": (3, 4, 5, 8, 9, 10, 11),
+        "Ascendant": (1, 2, 3, 4, 5, 8, 9, 11),
+    },
+    "Saturn": {
+        "Sun": (1, 2, 4, 7, 8, 10, 11),
+        "Moon": (3, 6, 11),
+        "Mars": (3, 5, 6, 10, 11, 12),
+        "Mercury": (6, 8, 9, 10, 11, 12),
+        "Jupiter": (5, 6, 11, 12),
+        "Venus": (6, 11, 12),
+        "Saturn": (3, 5, 6, 11),
+        "Ascendant": (1, 3, 4, 6, 10, 11),
+    },
+}
+
+SIGN_BITS = np.arange(12, dtype=np.uint16)
+FULL_MASK = (1 << 12) - 1
+
+
+def house_mask(houses: Tuple[int, ...]) -> int:
+    """12-bit mask with bit h - 1 set for each house h"""
+    return sum(1 << (house - 1) for house in houses)
+
+
+# (planet, reference) masks; bit n marks the (n + 1)th house from the reference
+BINDU_MASKS: np.ndarray = np.array(
+    [
+        [house_mask(BINDU_HOUSES[planet][reference]) for reference in REFERENCES]
+        for planet in ASHTAKAVARGA_PLANETS
+    ],
+    dtype=np.uint16,
+)
+
+
+def rotate_masks(masks: np.ndarray, signs: np.ndarray) -> np.ndarray:
+    """Rotate 12-bit house masks so bit n marks sign n (0 = Aries)"""
+    masks = np.asarray(masks, dtype=np.uint16)
+    signs = np.asarray(signs, dtype=np.uint16) % 12
+    return ((masks << signs) | (masks >> (12 - signs))) & FULL_MASK
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits in each 12-bit mask"""
+    return ((np.asarray(masks, dtype=np.uint16)[..., None] >> SIGN_BITS) & 1).sum(
+        axis=-1
+    )
+
+
+# Bindus each planet receives over the whole chart, whatever the positions
+BINDU_TOTALS: np.ndarray = popcount(BINDU_MASKS).sum(axis=1)
+
+
+def reference_signs(
+    positions: Mapping[str, Union[float, np.ndarray]],
+) -> np.ndarray:
+    """Signs (0 = Aries) of the eight references, shape (..., 8).
+
+    ``positions`` maps every name in ``REFERENCES`` to sidereal longitudes.
+    """
+    return np.stack(
+        [np.asarray(positions[name]) // 30 % 12 for name in REFERENCES], axis=-1
+    ).astype(np.uint16)
+
+
+def sign_masks(signs: np.ndarray) -> np.ndarray:
+    """Rotated masks of every (planet, reference), shape (..., 7, 8).
+
+    Bit s of entry [p, r] is set when reference r gives planet p a bindu
+    in sign s.
+    """
+    return rotate_masks(BINDU_MASKS, np.asarray(signs)[..., None, :])
+
+
+def bhinnashtakavarga(signs: np.ndarray) -> np.ndarray:
+    """Bindus per planet and sign, shape (..., 7, 12), from reference signs"""
+    masks = sign_masks(signs)
+    return ((masks[..., None] >> SIGN_BITS) & 1).sum(axis=-2).astype(np.int8)
+
+
+def sarvashtakavarga(bhinna: np.ndarray) -> np.ndarray:
+    """Total bindus per sign, shape (..., 12)"""
+    return np.asarray(bhinna).sum(axis=-2, dtype=np.int16)
+
+
+def transit_bindus(bhinna: np.ndarray, transit_signs: np.ndarray) -> np.ndarray:
+    """Bindus each planet holds in its own table at the sign it transits.
+
+    ``transit_signs`` has shape (..., 7) in ``ASHTAKAVARGA_PLANETS`` order.
+    """
+    signs = np.asarray(transit_signs, dtype=np.intp)[..., None]
+    return np.take_along_axis(np.asarray(bhinna), signs, axis=-1)[..., 0]
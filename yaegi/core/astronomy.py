@@ -1,17 +1,27 @@
-import math
-from typing import Dict, List
+from typing import Dict, List, Optional
+import numpy as np
 from yaegi.core.conversions import datetime_to_julian_day
+from yaegi.core.houses import (
+    TABLE_MAX_LATITUDE,
+    TABLE_OBLIQUITY_STEP,
+    ascendant_and_midheaven,
+    compute_house_cusps,
+    cusps_to_list,
+    get_cusp_table,
+)
 from yaegi.config.settings import DEFAULT_AYANAMSA
 
 
 class AstronomyEngine:
     """Core astronomical calculations using simplified ephemeris"""
 
+    # Mean daily motion (degrees) of the longitudes below; Mercury's mean
+    # element runs at its heliocentric rate in this simplified model.
     PLANET_SPEEDS: Dict[str, float] = {
         "Sun": 0.9856,
         "Moon": 13.1763,
         "Mars": 0.5240,
-        "Mercury": 1.3833,
+        "Mercury": 4.0923,
         "Jupiter": 0.0831,
         "Venus": 1.6022,
         "Saturn": 0.0334,
@@ -46,32 +56,32 @@ class AstronomyEngine:
         ayanamsa: float = self.get_ayanamsa(julian_day)
         return (tropical_lon - ayanamsa) % 360.0
 
-    def calculate_ascendant(
-        self, julian_day: float, latitude: float, longitude: float
-    ) -> float:
-        """Calculate ascendant for given coordinates and time"""
+    def get_lunar_node(self, julian_day: float) -> float:
+        """Calculate sidereal longitude of the mean ascending node (Rahu)"""
         t: float = (julian_day - 2451545.0) / 36525.0
-        gmst: float = 280.46061837 + 360.98564736629 * (julian_day - 2451545.0)
-        gmst %= 360.0
+        node: float = 125.0445479 - 1934.1362891 * t
+        return (node - self.get_ayanamsa(julian_day)) % 360.0
 
-        lst: float = (gmst + longitude) % 360.0
-
-        epsilon: float = 23.4393 - 0.0130 * t
-        epsilon_rad: float = math.radians(epsilon)
-        lat_rad: float = math.radians(latitude)
-        lst_rad: float = math.radians(lst)
+    def get_obliquity(self, julian_day: float) -> float:
+        """Calculate mean obliquity of the ecliptic in degrees"""
+        t: float = (julian_day - 2451545.0) / 36525.0
+        return 23.4393 - 0.0130 * t
 
-        y: float = math.sin(lst_rad)
-        x: float = math.cos(lst_rad) * math.cos(epsilon_rad) + math.tan(
-            lat_rad
-        ) * math.sin(epsilon_rad)
-        ascendant: float = math.degrees(math.atan2(y, x))
+    def get_local_sidereal_time(self, julian_day: float, longitude: float) -> float:
+        """Calculate local sidereal time (RAMC) in degrees"""
+        gmst: float = 280.46061837 + 360.98564736629 * (julian_day - 2451545.0)
+        return (gmst + longitude) % 360.0
 
-        if ascendant < 0:
-            ascendant += 360.0
+    def calculate_ascendant(
+        self, julian_day: float, latitude: float, longitude: float
+    ) -> float:
+        """Calculate ascendant for given coordinates and time"""
+        lst: float = self.get_local_sidereal_time(julian_day, longitude)
+        epsilon: float = self.get_obliquity(julian_day)
+        ascendant, _ = ascendant_and_midheaven(lst, latitude, epsilon)
 
         ayanamsa: float = self.get_ayanamsa(julian_day)
-        return (ascendant - ayanamsa) % 360.0
+        return (float(ascendant) - ayanamsa) % 360.0
 
     def get_all_planets(self, julian_day: float) -> Dict[str, float]:
         """Get sidereal longitudes for all major planets"""
@@ -81,7 +91,77 @@ class AstronomyEngine:
         }
 
     def calculate_houses(
-        self, ascendant: float, method: str = "placidus"
+        self,
+        ascendant: float,
+        method: str = "equal",
+        julian_day: Optional[float] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        use_table: bool = False,
     ) -> List[float]:
-        """Calculate house cusps using equal house system"""
-        return [(ascendant + i * 30) % 360.0 for i in range(12)]
+        """Calculate sidereal house cusps using the requested house system.
+
+        Equal and whole-sign houses only need the sidereal ascendant.
+        Placidus, Koch and Sripati/Porphyry also need the Julian Day and
+        location; ``use_table`` reads them from the interpolated cusp table.
+        The default stays equal houses so ascendant-only calls keep working.
+        """
+        method = method.lower()
+        if method == "equal":
+            return [(ascendant + i * 30) % 360.0 for i in range(12)]
+        if method == "whole_sign":
+            return [(ascendant // 30 * 30 + i * 30) % 360.0 for i in range(12)]
+        if julian_day is None or latitude is None or longitude is None:
+            raise ValueError(
+                f"{method} houses require julian_day, latitude and longitude"
+            )
+
+        cusps = self.calculate_houses_batch(
+            np.array([julian_day]),
+            np.array([latitude]),
+            np.array([longitude]),
+            method=method,
+            use_table=use_table,
+        )
+        return cusps_to_list(cusps[0])
+
+    def calculate_houses_batch(
+        self,
+        julian_days: np.ndarray,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        method: str = "placidus",
+        use_table: bool = False,
+    ) -> np.ndarray:
+        """Calculate sidereal cusps for many charts at once, shape (N, 12).
+
+        With ``use_table`` rows within ±``TABLE_MAX_LATITUDE`` are read from
+        the cusp table of their own obliquity (rounded to
+        ``TABLE_OBLIQUITY_STEP``, one table per epoch in the batch); rows at
+        higher latitudes are computed exactly.
+        """
+        jd, lat, lon = np.broadcast_arrays(
+            np.asarray(julian_days, dtype=float),
+            np.asarray(latitudes, dtype=float),
+            np.asarray(longitudes, dtype=float),
+        )
+        lst = self.get_local_sidereal_time(jd, lon)
+        obliquity = self.get_obliquity(jd)
+
+        if not use_table:
+            tropical = compute_house_cusps(lst, lat, obliquity, method)
+        else:
+            tropical = np.empty(jd.shape + (12,))
+            in_table = np.abs(lat) <= TABLE_MAX_LATITUDE
+            exact = ~in_table
+            if exact.any():
+                tropical[exact] = compute_house_cusps(
+                    lst[exact], lat[exact], obliquity[exact], method
+                )
+            epochs = np.round(obliquity / TABLE_OBLIQUITY_STEP)
+            for epoch in np.unique(epochs[in_table]):
+                rows = in_table & (epochs == epoch)
+                table = get_cusp_table(method, float(epoch) * TABLE_OBLIQUITY_STEP)
+                tropical[rows] = table.lookup(lst[rows], lat[rows])
+
+        return (tropical - self.get_ayanamsa(jd)[..., None]) % 360.0
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from yaegi.core.astronomy import AstronomyEngine
+
+AngleFunction = Callable[[np.ndarray], np.ndarray]
+
+NEWTON_ITERATIONS: int = 8
+NEWTON_TOLERANCE: float = 1e-7  # days, about 10 ms
+DERIVATIVE_STEP: float = 1e-3  # days
+
+
+@dataclass(frozen=True)
+class ElementSpec:
+    """An angular quantity divided into ``count`` equal segments of ``span``"""
+
+    name: str
+    span: float
+    count: int
+    rate: float  # mean angular speed in degrees per day
+
+
+PANCHANG_ELEMENTS: Dict[str, ElementSpec] = {
+    "tithi": ElementSpec("tithi", 12.0, 30, 12.1907),
+    "nakshatra": ElementSpec("nakshatra", 360.0 / 27, 27, 13.1763),
+    "yoga": ElementSpec("yoga", 360.0 / 27, 27, 14.1619),
+    "karana": ElementSpec("karana", 6.0, 60, 12.1907),
+}
+
+
+def panchang_angles(
+    engine: AstronomyEngine, julian_days: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Sidereal angles driving each Panchang element, from one Sun/Moon evaluation"""
+    sun = engine.get_sidereal_longitude("Sun", julian_days)
+    moon = engine.get_sidereal_longitude("Moon", julian_days)
+    elongation = (moon - sun) % 360.0
+    return {
+        "tithi": elongation,
+        "nakshatra": moon % 360.0,
+        "yoga": (sun + moon) % 360.0,
+        "karana": elongation,
+    }
+
+
+def element_angle_function(engine: AstronomyEngine, element: str) -> AngleFunction:
+    """Angle function of time for a single Panchang element"""
+    return lambda jd: panchang_angles(engine, jd)[element]
+
+
+def _wrap(delta: np.ndarray) -> np.ndarray:
+    return (delta + 180.0) % 360.0 - 180.0
+
+
+def solve_crossings(
+    angle: AngleFunction, targets: np.ndarray, guesses: np.ndarray
+) -> np.ndarray:
+    """Newton-solve ``angle(t) == target (mod 360)`` for every guess at once"""
+    jd = np.array(guesses, dtype=float)
+    for _ in range(NEWTON_ITERATIONS):
+        residual = _wrap(angle(jd) - targets)
+        slope = _wrap(angle(jd + DERIVATIVE_STEP) - angle(jd - DERIVATIVE_STEP)) / (
+            2 * DERIVATIVE_STEP
+        )
+        step = residual / slope
+        jd = jd - step
+        if np.all(np.abs(step) < NEWTON_TOLERANCE):
+            break
+    return jd
+
+
+@dataclass(frozen=True)
+class ElementTimeline:
+    """Sorted start instants of consecutive element segments.
+
+    ``starts[i]`` is the Julian Day at which segment ``indices[i]`` (0-based)
+    begins; it ends at ``starts[i + 1]``. The first start is at or before the
+    requested range and the last one after it, so every instant in the range
+    maps to a segment with known start and end.
+    """
+
+    spec: ElementSpec
+    starts: np.ndarray
+    indices: np.ndarray
+
+    def position(self, julian_day: np.ndarray) -> np.ndarray:
+        """Row of the segment containing each Julian Day"""
+        rows = np.searchsorted(self.starts, julian_day, side="right") - 1
+        if np.any((rows < 0) | (rows >= len(self.starts) - 1)):
+            raise ValueError("Julian Day outside solved element timeline")
+        return rows
+
+    def at(self, julian_day: float) -> Tuple[int, float, float]:
+        """Segment index (0-based), start and end Julian Day at an instant"""
+        row = int(self.position(np.asarray(julian_day)))
+        return (
+            int(self.indices[row]),
+            float(self.starts[row]),
+            float(self.starts[row + 1]),
+        )
+
+
+def solve_element_timeline(
+    angle: AngleFunction, spec: ElementSpec, start_jd: float, end_jd: float
+) -> ElementTimeline:
+    """Find every segment boundary of an element covering [start_jd, end_jd]"""
+    first_angle = float(angle(np.asarray(start_jd)))
+    first = int(np.floor(first_angle / spec.span))
+    count = int(np.ceil((end_jd - start_jd) * spec.rate / spec.span)) + 3
+    steps = np.arange(first, first + count)
+    targets = (steps * spec.span) % 360.0
+    guesses = start_jd + (steps * spec.span - first_angle) / spec.rate
+    starts = solve_crossings(angle, targets, guesses)
+
+    # Drop surplus boundaries beyond the first one past end_jd
+    last = int(np.searchsorted(starts, end_jd, side="right")) + 1
+    return ElementTimeline(
+        spec=spec,
+        starts=starts[:last],
+        indices=(steps[:last] % spec.count).astype(np.int16),
+    )
+
+
+def solve_panchang_timelines(
+    engine: AstronomyEngine, start_jd: float, end_jd: float
+) -> Dict[str, ElementTimeline]:
+    """Boundary timelines for tithi, nakshatra, yoga and karana over a range"""
+    return {
+        name: solve_element_timeline(
+            element_angle_function(engine, name), spec, start_jd, end_jd
+        )
+        for name, spec in PANCHANG_ELEMENTS.items()
+    }
+
+
+def solve_transit_timeline(
+    engine: AstronomyEngine, planet: str, start_jd: float, end_jd: float
+) -> ElementTimeline:
+    """Sidereal sign ingresses of a planet over a range (indices are rashi 0-11)"""
+    spec = ElementSpec(planet, 30.0, 12, engine.PLANET_SPEEDS[planet])
+    return solve_element_timeline(
+        lambda jd: engine.get_sidereal_longitude(planet, jd), spec, start_jd, end_jd
+    )
+
+
+def solve_sign_timeline(
+    angle: AngleFunction, start_jd: float, end_jd: float, step: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sign boundaries of any angle over a range and the sign (0-11) after each.
+
+    Changes are bracketed on a grid of ``step`` days, then Newton-refined,
+    so the angle may move either way (the ascendant, the lunar nodes) but
+    must not cross two signs within one step. The boundaries start with
+    ``start_jd`` and end with ``end_jd``, whose label repeats the last sign.
+    """
+    grid = np.arange(start_jd, end_jd + step, step)
+    signs = (angle(grid) // 30).astype(int)
+    change = np.flatnonzero(signs[1:] != signs[:-1])
+    before, after = signs[change], signs[change + 1]
+    forward = (after - before) % 12 < 6
+    crossings = solve_crossings(
+        angle, np.where(forward, after, before) * 30.0, grid[change] + step / 2
+    )
+    crossings = np.clip(crossings, grid[change], grid[change + 1])
+    starts = np.concatenate(([start_jd], crossings, [end_jd]))
+    labels = np.concatenate((signs[:1], after, signs[-1:]))
+    return starts, labels
@@ -0,0 +1,287 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+HOUSE_SYSTEMS: Tuple[str, ...] = (
+    "placidus",
+    "koch",
+    "porphyry",
+    "sripati",
+    "equal",
+    "whole_sign",
+)
+
+QUADRANT_SYSTEMS: Tuple[str, ...] = ("placidus", "koch", "porphyry", "sripati")
+
+# The semi-arc fixed point converges more slowly towards the polar circle
+# (about 60 iterations at 66° latitude)
+PLACIDUS_TOLERANCE: float = 1e-9
+PLACIDUS_MAX_ITERATIONS: int = 200
+
+# Above this latitude some ecliptic degrees never rise or set and the
+# semi-arc based systems (Placidus, Koch) are undefined.
+POLAR_LATITUDE_LIMIT: float = 66.0
+
+TABLE_MAX_LATITUDE: float = 60.0
+TABLE_OBLIQUITY_STEP: float = 0.01
+
+
+def _ascendant_at(ramc: np.ndarray, lat_rad: np.ndarray, eps: np.ndarray) -> np.ndarray:
+    """Tropical longitude rising on the eastern horizon for a given RAMC"""
+    ramc_rad = np.radians(ramc)
+    y = np.cos(ramc_rad)
+    x = -(np.sin(eps) * np.tan(lat_rad) + np.cos(eps) * np.sin(ramc_rad))
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def _midheaven_at(ramc: np.ndarray, eps: np.ndarray) -> np.ndarray:
+    """Tropical longitude culminating on the meridian for a given RAMC"""
+    ramc_rad = np.radians(ramc)
+    return (
+        np.degrees(np.arctan2(np.sin(ramc_rad), np.cos(ramc_rad) * np.cos(eps))) % 360.0
+    )
+
+
+def ascendant_longitude(
+    ramc: ArrayLike, latitude: ArrayLike, obliquity: ArrayLike
+) -> np.ndarray:
+    """Tropical ascendant alone, for callers that sample it densely"""
+    return _ascendant_at(
+        np.asarray(ramc, dtype=float),
+        np.radians(np.asarray(latitude, dtype=float)),
+        np.radians(np.asarray(obliquity, dtype=float)),
+    )
+
+
+def ascendant_and_midheaven(
+    ramc: ArrayLike, latitude: ArrayLike, obliquity: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Tropical ascendant and midheaven for RAMC, latitude and obliquity in degrees"""
+    ramc_arr = np.asarray(ramc, dtype=float)
+    lat_rad = np.radians(np.asarray(latitude, dtype=float))
+    eps = np.radians(np.asarray(obliquity, dtype=float))
+    return _ascendant_at(ramc_arr, lat_rad, eps), _midheaven_at(ramc_arr, eps)
+
+
+def _assemble(
+    asc: np.ndarray,
+    mc: np.ndarray,
+    c11: np.ndarray,
+    c12: np.ndarray,
+    c2: np.ndarray,
+    c3: np.ndarray,
+) -> np.ndarray:
+    """Order the six independent cusps and their opposites as houses 1-12"""
+    cusps = [asc, c2, c3, mc + 180.0, c11 + 180.0, c12 + 180.0]
+    cusps += [asc + 180.0, c2 + 180.0, c3 + 180.0, mc, c11, c12]
+    return np.stack(cusps, axis=-1) % 360.0
+
+
+def _porphyry(asc: np.ndarray, mc: np.ndarray) -> np.ndarray:
+    upper = (asc - mc) % 360.0
+    lower = (mc + 180.0 - asc) % 360.0
+    return _assemble(
+        asc,
+        mc,
+        (mc + upper / 3.0) % 360.0,
+        (mc + 2.0 * upper / 3.0) % 360.0,
+        (asc + lower / 3.0) % 360.0,
+        (asc + 2.0 * lower / 3.0) % 360.0,
+    )
+
+
+def _koch(
+    ramc: np.ndarray, lat_rad: np.ndarray, eps: np.ndarray, mc: np.ndarray
+) -> np.ndarray:
+    decl_mc = np.arcsin(np.sin(eps) * np.sin(np.radians(mc)))
+    ad3 = np.degrees(np.arcsin(np.clip(np.tan(lat_rad) * np.tan(decl_mc), -1, 1))) / 3
+    return _assemble(
+        _ascendant_at(ramc, lat_rad, eps),
+        mc,
+        _ascendant_at(ramc - 60.0 - 2.0 * ad3, lat_rad, eps),
+        _ascendant_at(ramc - 30.0 - ad3, lat_rad, eps),
+        _ascendant_at(ramc + 30.0 + ad3, lat_rad, eps),
+        _ascendant_at(ramc + 60.0 + 2.0 * ad3, lat_rad, eps),
+    )
+
+
+def _placidus_cusp(
+    ramc: np.ndarray,
+    lat_rad: np.ndarray,
+    eps: np.ndarray,
+    fraction: float,
+    nocturnal: bool,
+) -> np.ndarray:
+    """Solve one Placidus cusp by fixed-point iteration on the semi-arc.
+
+    Iterates until every cusp within ``POLAR_LATITUDE_LIMIT`` moves by less
+    than ``PLACIDUS_TOLERANCE`` degrees; raises ``ValueError`` otherwise.
+    """
+    tan_lat = np.tan(lat_rad)
+    within = np.abs(lat_rad) <= np.radians(POLAR_LATITUDE_LIMIT)
+    offset = 180.0 if nocturnal else 0.0
+    ra = ramc + offset + (-1.0 if nocturnal else 1.0) * 90.0 * fraction
+    for _ in range(PLACIDUS_MAX_ITERATIONS):
+        ra_rad = np.radians(ra)
+        lon = np.arctan2(np.sin(ra_rad), np.cos(ra_rad) * np.cos(eps))
+        decl = np.arcsin(np.sin(eps) * np.sin(lon))
+        diurnal = np.degrees(np.arccos(np.clip(-tan_lat * np.tan(decl), -1, 1)))
+        if nocturnal:
+            solved = ramc + 180.0 - fraction * (180.0 - diurnal)
+        else:
+            solved = ramc + fraction * diurnal
+        delta = np.abs(solved - ra)
+        ra = solved
+        if not np.any(delta[within] > PLACIDUS_TOLERANCE):
+            break
+    else:
+        raise ValueError("Placidus cusps did not converge at this latitude")
+    ra_rad = np.radians(ra)
+    return np.degrees(np.arctan2(np.sin(ra_rad), np.cos(ra_rad) * np.cos(eps))) % 360.0
+
+
+def _placidus(
+    ramc: np.ndarray, lat_rad: np.ndarray, eps: np.ndarray, mc: np.ndarray
+) -> np.ndarray:
+    return _assemble(
+        _ascendant_at(ramc, lat_rad, eps),
+        mc,
+        _placidus_cusp(ramc, lat_rad, eps, 1.0 / 3.0, nocturnal=False),
+        _placidus_cusp(ramc, lat_rad, eps, 2.0 / 3.0, nocturnal=False),
+        _placidus_cusp(ramc, lat_rad, eps, 2.0 / 3.0, nocturnal=True),
+        _placidus_cusp(ramc, lat_rad, eps, 1.0 / 3.0, nocturnal=True),
+    )
+
+
+def compute_house_cusps(
+    ramc: ArrayLike,
+    latitude: ArrayLike,
+    obliquity: ArrayLike,
+    method: str = "placidus",
+) -> np.ndarray:
+    """Compute tropical house cusps, vectorized over any broadcastable inputs.
+
+    ``ramc`` (local sidereal time in degrees), ``latitude`` and ``obliquity``
+    may be scalars or arrays; the result has shape ``broadcast + (12,)`` with
+    cusp 1 (ascendant) first. Placidus and Koch fall back to Porphyry beyond
+    ``POLAR_LATITUDE_LIMIT`` where their semi-arcs are undefined.
+    """
+    method = method.lower()
+    if method not in HOUSE_SYSTEMS:
+        raise ValueError(f"Unknown house system: {method}")
+
+    ramc_arr, lat_arr, eps_arr = np.broadcast_arrays(
+        np.asarray(ramc, dtype=float) % 360.0,
+        np.asarray(latitude, dtype=float),
+        np.asarray(obliquity, dtype=float),
+    )
+    lat_rad = np.radians(lat_arr)
+    eps = np.radians(eps_arr)
+    asc = _ascendant_at(ramc_arr, lat_rad, eps)
+    mc = _midheaven_at(ramc_arr, eps)
+
+    if method == "equal":
+        return (asc[..., None] + 30.0 * np.arange(12)) % 360.0
+    if method == "whole_sign":
+        return (np.floor(asc / 30.0)[..., None] * 30.0 + 30.0 * np.arange(12)) % 360.0
+
+    porphyry = _porphyry(asc, mc)
+    if method in ("porphyry", "sripati"):
+        return porphyry
+
+    if method == "koch":
+        cusps = _koch(ramc_arr, lat_rad, eps, mc)
+    else:
+        cusps = _placidus(ramc_arr, lat_rad, eps, mc)
+    polar = np.abs(lat_arr) > POLAR_LATITUDE_LIMIT
+    return np.where(polar[..., None], porphyry, cusps)
+
+
+def house_of(longitude: ArrayLike, cusps: np.ndarray) -> np.ndarray:
+    """House number (1-12) containing each longitude for the given cusps"""
+    lon = np.asarray(longitude, dtype=float)
+    cusps = np.asarray(cusps, dtype=float)
+    offsets = (cusps - cusps[..., :1]) % 360.0
+    relative = (lon - cusps[..., 0]) % 360.0
+    return np.sum(offsets <= relative[..., None], axis=-1)
+
+
+def _unwrap_delta(hi: np.ndarray, lo: np.ndarray) -> np.ndarray:
+    return (hi - lo + 180.0) % 360.0 - 180.0
+
+
+class CuspTable:
+    """Precomputed cusp grid indexed by (latitude band, local sidereal time).
+
+    Cusps are tabulated once on a regular ``lat_step`` x ``lst_step`` grid for
+    a fixed obliquity and read back with bilinear interpolation. With the
+    default 0.5° grid and |latitude| <= 60° the interpolation error is below
+    0.02° for Placidus and Porphyry and below 0.05° for Koch; at 63° it grows
+    to about 0.07° and 0.25° respectively. Cusps are also sensitive to the
+    obliquity (about 0.05°-0.12° per 0.026°, i.e. two centuries of drift), so
+    shared tables are keyed by obliquity rounded to ``TABLE_OBLIQUITY_STEP``.
+    """
+
+    def __init__(
+        self,
+        method: str = "placidus",
+        obliquity: float = 23.4393,
+        lat_step: float = 0.5,
+        lst_step: float = 0.5,
+        max_latitude: float = TABLE_MAX_LATITUDE,
+    ) -> None:
+        self.method: str = method.lower()
+        self.obliquity: float = obliquity
+        self.lat_step: float = lat_step
+        self.lst_step: float = lst_step
+        self.max_latitude: float = max_latitude
+        self.latitudes: np.ndarray = np.arange(
+            -max_latitude, max_latitude + lat_step / 2, lat_step
+        )
+        self.lsts: np.ndarray = np.arange(0.0, 360.0 + lst_step / 2, lst_step)
+        self.table: np.ndarray = compute_house_cusps(
+            self.lsts[None, :], self.latitudes[:, None], obliquity, self.method
+        )
+
+    def lookup(self, lst: ArrayLike, latitude: ArrayLike) -> np.ndarray:
+        """Interpolated tropical cusps with shape ``broadcast + (12,)``"""
+        lst_arr, lat_arr = np.broadcast_arrays(
+            np.asarray(lst, dtype=float) % 360.0, np.asarray(latitude, dtype=float)
+        )
+        if np.any(np.abs(lat_arr) > self.max_latitude):
+            raise ValueError(f"Latitude outside cusp table range ±{self.max_latitude}°")
+
+        lat_pos = (lat_arr + self.max_latitude) / self.lat_step
+        lst_pos = lst_arr / self.lst_step
+        i = np.clip(np.floor(lat_pos).astype(int), 0, len(self.latitudes) - 2)
+        j = np.clip(np.floor(lst_pos).astype(int), 0, len(self.lsts) - 2)
+        fi = (lat_pos - i)[..., None]
+        fj = (lst_pos - j)[..., None]
+
+        c00 = self.table[i, j]
+        d01 = _unwrap_delta(self.table[i, j + 1], c00)
+        d10 = _unwrap_delta(self.table[i + 1, j], c00)
+        d11 = _unwrap_delta(self.table[i + 1, j + 1], c00)
+        delta = (1 - fi) * fj * d01 + fi * (1 - fj) * d10 + fi * fj * d11
+        return (c00 + delta) % 360.0
+
+
+_CUSP_TABLES: Dict[Tuple[str, float], CuspTable] = {}
+
+
+def get_cusp_table(method: str = "placidus", obliquity: float = 23.4393) -> CuspTable:
+    """Return the shared cusp table for a house system, building it on first use"""
+    key = (
+        method.lower(),
+        round(round(obliquity / TABLE_OBLIQUITY_STEP) * TABLE_OBLIQUITY_STEP, 6),
+    )
+    if key not in _CUSP_TABLES:
+        _CUSP_TABLES[key] = CuspTable(key[0], obliquity=key[1])
+    return _CUSP_TABLES[key]
+
+
+def cusps_to_list(cusps: np.ndarray) -> List[float]:
+    """Convert a single (12,) cusp array to a plain list of floats"""
+    return [float(c) for c in np.asarray(cusps).reshape(12)]
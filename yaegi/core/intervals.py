@@ -0,0 +1,175 @@
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+# Interval sets are float arrays of shape (N, 2) holding [start, end) Julian
+# Day pairs. Functions returning a set keep it normalized: sorted by start,
+# non-empty and pairwise disjoint, which lets every operation run in a single
+# vectorized pass.
+
+
+def empty() -> np.ndarray:
+    """An interval set with no intervals"""
+    return np.empty((0, 2), dtype=float)
+
+
+def span(start: float, end: float) -> np.ndarray:
+    """Interval set holding the single interval [start, end)"""
+    if end <= start:
+        return empty()
+    return np.array([[start, end]], dtype=float)
+
+
+def merge(intervals: np.ndarray) -> np.ndarray:
+    """Normalize arbitrary intervals: drop empty ones, sort and join overlaps"""
+    intervals = np.asarray(intervals, dtype=float).reshape(-1, 2)
+    intervals = intervals[intervals[:, 1] > intervals[:, 0]]
+    if len(intervals) == 0:
+        return empty()
+    intervals = intervals[np.argsort(intervals[:, 0], kind="stable")]
+    starts = intervals[:, 0]
+    reach = np.maximum.accumulate(intervals[:, 1])
+    opens = np.ones(len(intervals), dtype=bool)
+    opens[1:] = starts[1:] > reach[:-1]
+    first = np.flatnonzero(opens)
+    last = np.append(first[1:] - 1, len(intervals) - 1)
+    return np.column_stack((starts[first], reach[last]))
+
+
+def segments_where(
+    starts: np.ndarray, labels: np.ndarray, allowed: Iterable[int]
+) -> np.ndarray:
+    """Segments [starts[i], starts[i + 1]) whose label is in ``allowed``.
+
+    ``starts`` are sorted boundaries such as an ``ElementTimeline``'s; the
+    final boundary only closes the last segment.
+    """
+    starts = np.asarray(starts, dtype=float)
+    keep = np.isin(np.asarray(labels)[:-1], list(allowed))
+    return merge(np.column_stack((starts[:-1][keep], starts[1:][keep])))
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairs (i, k) for every k in range(lo[i], hi[i]), fully vectorized"""
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    owners = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, np.repeat(lo, counts) + offsets
+
+
+def intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection of two normalized interval sets"""
+    if len(a) == 0 or len(b) == 0:
+        return empty()
+    # For each interval of a, the run of b intervals overlapping it
+    lo = np.searchsorted(b[:, 1], a[:, 0], side="right")
+    hi = np.searchsorted(b[:, 0], a[:, 1], side="left")
+    a_rows, b_rows = _expand_ranges(lo, hi)
+    starts = np.maximum(a[a_rows, 0], b[b_rows, 0])
+    ends = np.minimum(a[a_rows, 1], b[b_rows, 1])
+    keep = ends > starts
+    return np.column_stack((starts[keep], ends[keep]))
+
+
+def intersect_all(sets: Sequence[np.ndarray]) -> np.ndarray:
+    """Intersection of several normalized interval sets, smallest first"""
+    ordered = sorted(sets, key=len)
+    result = ordered[0]
+    for other in ordered[1:]:
+        result = intersect(result, other)
+    return result
+
+
+def complement(intervals: np.ndarray, start: float, end: float) -> np.ndarray:
+    """Gaps of a normalized interval set within [start, end)"""
+    starts = np.concatenate(([start], intervals[:, 1]))
+    ends = np.concatenate((intervals[:, 0], [end]))
+    starts = np.maximum(starts, start)
+    ends = np.minimum(ends, end)
+    keep = ends > starts
+    return np.column_stack((starts[keep], ends[keep]))
+
+
+def subtract(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Parts of a normalized set a not covered by normalized set b"""
+    if len(a) == 0 or len(b) == 0:
+        return a
+    return intersect(a, complement(b, a[0, 0], a[-1, 1]))
+
+
+def durations(intervals: np.ndarray) -> np.ndarray:
+    """Length of every interval, in days"""
+    return intervals[:, 1] - intervals[:, 0]
+
+
+class IntervalIndex:
+    """Possibly overlapping intervals with payload columns, sorted by start.
+
+    Unlike the normalized sets above, intervals here keep their identity:
+    every query returns row numbers, and ``columns`` holds per-row arrays
+    (chart id, dasha lords, transit sign, ...) aligned with those rows.
+    """
+
+    def __init__(
+        self, starts: np.ndarray, ends: np.ndarray, **columns: np.ndarray
+    ) -> None:
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        keep = np.flatnonzero(ends > starts)
+        order = keep[np.argsort(starts[keep], kind="stable")]
+        self.starts: np.ndarray = starts[order]
+        self.ends: np.ndarray = ends[order]
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.asarray(values)[order] for name, values in columns.items()
+        }
+        lengths = self.ends - self.starts
+        self.max_length: float = float(lengths.max()) if len(lengths) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def from_segments(
+        cls, starts: np.ndarray, labels: np.ndarray, name: str = "label"
+    ) -> "IntervalIndex":
+        """Index consecutive segments [starts[i], starts[i + 1]) labelled by ``name``"""
+        starts = np.asarray(starts, dtype=float)
+        return cls(starts[:-1], starts[1:], **{name: np.asarray(labels)[:-1]})
+
+    def select(self, mask: np.ndarray) -> "IntervalIndex":
+        """Sub-index of the rows where ``mask`` is true"""
+        return IntervalIndex(
+            self.starts[mask],
+            self.ends[mask],
+            **{name: values[mask] for name, values in self.columns.items()},
+        )
+
+    def overlapping(self, start: float, end: float) -> np.ndarray:
+        """Rows of the intervals overlapping [start, end)"""
+        # Rows starting inside the query, then earlier rows still running at
+        # its start; the latter can begin at most max_length before it.
+        first = int(np.searchsorted(self.starts, start, side="left"))
+        last = int(np.searchsorted(self.starts, end, side="left"))
+        earliest = int(
+            np.searchsorted(self.starts, start - self.max_length, side="left")
+        )
+        running = np.arange(earliest, first)
+        running = running[self.ends[running] > start]
+        return np.concatenate((running, np.arange(first, last)))
+
+    def join(self, other: "IntervalIndex") -> Tuple[np.ndarray, np.ndarray]:
+        """All overlapping pairs as aligned row arrays (rows of self, rows of other).
+
+        Sweep-line join on the start-sorted arrays: an overlapping pair is
+        found either when the other interval starts inside this one, or when
+        this one starts strictly inside the other. Each pair is reported
+        once and the cost is O((n + m) log(n + m) + pairs).
+        """
+        lo = np.searchsorted(other.starts, self.starts, side="left")
+        hi = np.searchsorted(other.starts, self.ends, side="left")
+        left_a, left_b = _expand_ranges(lo, hi)
+        lo = np.searchsorted(self.starts, other.starts, side="right")
+        hi = np.searchsorted(self.starts, other.ends, side="left")
+        right_b, right_a = _expand_ranges(lo, hi)
+        return np.concatenate((left_a, right_a)), np.concatenate((left_b, right_b))
@@ -1,5 +1,24 @@
 import math
-from typing import Dict
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from yaegi.core.ashtakavarga import (
+    ASHTAKAVARGA_PLANETS,
+    bhinnashtakavarga,
+    reference_signs,
+    sarvashtakavarga,
+)
+
+# Exact angle and default orb of each aspect, as used by the predicates below
+ASPECT_ORBS: Dict[str, Tuple[float, float]] = {
+    "conjunction": (0.0, 8.0),
+    "sextile": (60.0, 6.0),
+    "square": (90.0, 8.0),
+    "trine": (120.0, 8.0),
+    "opposition": (180.0, 8.0),
+}
+ASPECT_NAMES: Tuple[str, ...] = tuple(ASPECT_ORBS)
 
 
 def angular_distance(lon1: float, lon2: float) -> float:
@@ -8,54 +27,87 @@ def angular_distance(lon1: float, lon2: float) -> float:
     return min(diff, 360 - diff)
 
 
+def angular_separation(
+    lon1: Union[float, np.ndarray], lon2: Union[float, np.ndarray]
+) -> np.ndarray:
+    """Angular distance (0-180) between longitudes, broadcast over arrays"""
+    return np.abs((np.asarray(lon1) - lon2 + 180.0) % 360.0 - 180.0)
+
+
+def classify_separation(
+    separation: np.ndarray, orbs: Optional[Dict[str, float]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Aspect of each separation as an index into ``ASPECT_NAMES`` and its orb.
+
+    ``orbs`` overrides the default orb per aspect name. Separations outside
+    every orb (or NaN) get index -1 and orb NaN; when orbs overlap the
+    closest aspect wins.
+    """
+    angles = np.array([angle for angle, _ in ASPECT_ORBS.values()])
+    limits = np.array(
+        [(orbs or {}).get(name, orb) for name, (_, orb) in ASPECT_ORBS.items()]
+    )
+    deviation = np.abs(np.asarray(separation, dtype=float)[..., None] - angles)
+    deviation = np.where(deviation <= limits, deviation, np.inf)
+    aspect = deviation.argmin(axis=-1)
+    orb = np.take_along_axis(deviation, aspect[..., None], axis=-1)[..., 0]
+    found = np.isfinite(orb)
+    return np.where(found, aspect, -1).astype(np.int8), np.where(found, orb, np.nan)
+
+
+def aspect_matrix(
+    longitudes: np.ndarray, orbs: Optional[Dict[str, float]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Aspects between every pair of bodies, over any leading batch axes.
+
+    ``longitudes`` has shape (..., bodies). Each pairwise separation is
+    computed once over the upper triangle and mirrored. Returns aspect
+    indices into ``ASPECT_NAMES`` (int8, -1 for none and on the diagonal)
+    and exact orbs (float32, NaN where there is no aspect), both of shape
+    (..., bodies, bodies).
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    bodies = longitudes.shape[-1]
+    first, second = np.triu_indices(bodies, 1)
+    pair_aspect, pair_orb = classify_separation(
+        angular_separation(longitudes[..., first], longitudes[..., second]), orbs
+    )
+    aspect = np.full(longitudes.shape + (bodies,), -1, dtype=np.int8)
+    orb = np.full(aspect.shape, np.nan, dtype=np.float32)
+    for rows, columns in ((first, second), (second, first)):
+        aspect[..., rows, columns] = pair_aspect
+        orb[..., rows, columns] = pair_orb
+    return aspect, orb
+
+
+def aspect_orb(lon1: float, lon2: float, aspect: str) -> float:
+    """Distance of two longitudes from the exact angle of an aspect"""
+    return abs(angular_distance(lon1, lon2) - ASPECT_ORBS[aspect][0])
+
+
 def is_conjunction(lon1: float, lon2: float, orb: float = 8.0) -> bool:
     """Check if two planets are in conjunction within given orb"""
-    return angular_distance(lon1, lon2) <= orb
+    return aspect_orb(lon1, lon2, "conjunction") <= orb
 
 
 def is_opposition(lon1: float, lon2: float, orb: float = 8.0) -> bool:
     """Check if two planets are in opposition within given orb"""
-    diff: float = abs(lon1 - lon2)
-    opposition_angle: float = min(
-        abs(diff - 180), abs(diff - 180 + 360), abs(diff - 180 - 360)
-    )
-    return opposition_angle <= orb
+    return aspect_orb(lon1, lon2, "opposition") <= orb
 
 
 def is_trine(lon1: float, lon2: float, orb: float = 8.0) -> bool:
     """Check if two planets are in trine (120° aspect) within given orb"""
-    diff: float = abs(lon1 - lon2)
-    for angle in (120, 240):
-        aspect_diff: float = min(
-            abs(diff - angle), abs(diff - angle + 360), abs(diff - angle - 360)
-        )
-        if aspect_diff <= orb:
-            return True
-    return False
+    return aspect_orb(lon1, lon2, "trine") <= orb
 
 
 def is_square(lon1: float, lon2: float, orb: float = 8.0) -> bool:
     """Check if two planets are in square (90° aspect) within given orb"""
-    diff: float = abs(lon1 - lon2)
-    for angle in (90, 270):
-        aspect_diff: float = min(
-            abs(diff - angle), abs(diff - angle + 360), abs(diff - angle - 360)
-        )
-        if aspect_diff <= orb:
-            return True
-    return False
+    return aspect_orb(lon1, lon2, "square") <= orb
 
 
 def is_sextile(lon1: float, lon2: float, orb: float = 6.0) -> bool:
     """Check if two planets are in sextile (60° aspect) within given orb"""
-    diff: float = abs(lon1 - lon2)
-    for angle in (60, 300):
-        aspect_diff: float = min(
-            abs(diff - angle), abs(diff - angle + 360), abs(diff - angle - 360)
-        )
-        if aspect_diff <= orb:
-            return True
-    return False
+    return aspect_orb(lon1, lon2, "sextile") <= orb
 
 
 def calculate_house_position(planet_lon: float, ascendant: float) -> int:
@@ -92,24 +144,14 @@ def get_planetary_strength(longitude: float, rashi: int) -> float:
 def calculate_ashtakavarga_points(
     planet_positions: Dict[str, float], house: int
 ) -> int:
-    """Simplified Ashtakavarga calculation"""
-    points: int = 0
-    base_points: Dict[str, int] = {
-        "Sun": 4,
-        "Moon": 5,
-        "Mars": 3,
-        "Mercury": 4,
-        "Jupiter": 5,
-        "Venus": 4,
-        "Saturn": 2,
-    }
-
-    asc: float = planet_positions.get("Ascendant", 0.0)
-
-    for planet, position in planet_positions.items():
-        if planet in base_points:
-            planet_house: int = calculate_house_position(position, asc)
-            if abs(planet_house - house) <= 1 or abs(planet_house - house) >= 11:
-                points += base_points[planet]
-
-    return min(points, 8)
+    """Sarvashtakavarga bindus of a house counted from the ascendant.
+
+    ``planet_positions`` needs the seven planets; a missing ``"Ascendant"``
+    is taken as 0° (start of Aries).
+    """
+    missing = [name for name in ASHTAKAVARGA_PLANETS if name not in planet_positions]
+    if missing:
+        raise ValueError(f"Missing positions for: {', '.join(missing)}")
+    signs = reference_signs({"Ascendant": 0.0, **planet_positions})
+    sarva = sarvashtakavarga(bhinnashtakavarga(signs))
+    return int(sarva[(int(signs[-1]) + house - 1) % 12])
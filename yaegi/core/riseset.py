@@ -0,0 +1,297 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Tuple, Union
+
+import numpy as np
+
+from yaegi.config.settings import CONFIG
+from yaegi.core.conversions import datetime_to_julian_day, julian_day_to_datetime
+
+ArrayLike = Union[float, np.ndarray]
+
+# Standard altitude of the Sun's upper limb at rise/set: 34' of horizontal
+# refraction plus 16' of semi-diameter.
+SUN_STANDARD_ALTITUDE: float = -0.8333
+# Moon altitude is 0.7275 * parallax - 34' (refraction), see _moon_altitude.
+MOON_REFRACTION: float = 0.5667
+
+SIDEREAL_RATE: float = 360.98564736629
+SOLAR_HOUR_ANGLE_RATE: float = SIDEREAL_RATE - 0.9856
+LUNAR_HOUR_ANGLE_RATE: float = SIDEREAL_RATE - 13.1764
+
+SOLVER_ITERATIONS: int = 5
+LOCATION_PRECISION: int = 2
+RISE_SET_CACHE_SIZE: int = 1024
+
+
+def _centuries(jd: np.ndarray) -> np.ndarray:
+    return (jd - 2451545.0) / 36525.0
+
+
+def _gmst(jd: np.ndarray) -> np.ndarray:
+    return (280.46061837 + SIDEREAL_RATE * (jd - 2451545.0)) % 360.0
+
+
+def _ecliptic_to_equatorial(
+    lon: np.ndarray, lat: np.ndarray, t: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    eps = np.radians(23.4393 - 0.0130 * t)
+    lon_rad = np.radians(lon)
+    lat_rad = np.radians(lat)
+    ra = np.arctan2(
+        np.sin(lon_rad) * np.cos(eps) - np.tan(lat_rad) * np.sin(eps),
+        np.cos(lon_rad),
+    )
+    decl = np.arcsin(
+        np.sin(lat_rad) * np.cos(eps) + np.cos(lat_rad) * np.sin(eps) * np.sin(lon_rad)
+    )
+    return np.degrees(ra) % 360.0, np.degrees(decl)
+
+
+def sun_equatorial(jd: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """Apparent right ascension and declination of the Sun in degrees.
+
+    Low-precision solar theory (mean longitude plus equation of centre),
+    good to about 0.01° for dates within a few centuries of J2000.
+    """
+    t = _centuries(np.asarray(jd, dtype=float))
+    mean_lon = 280.46646 + 36000.76983 * t
+    anomaly = np.radians(357.52911 + 35999.05029 * t)
+    centre = (
+        (1.914602 - 0.004817 * t) * np.sin(anomaly)
+        + (0.019993 - 0.000101 * t) * np.sin(2 * anomaly)
+        + 0.000289 * np.sin(3 * anomaly)
+    )
+    node = np.radians(125.04 - 1934.136 * t)
+    apparent = mean_lon + centre - 0.00569 - 0.00478 * np.sin(node)
+    return _ecliptic_to_equatorial(apparent, np.zeros_like(apparent), t)
+
+
+def _moon_arguments(t: np.ndarray) -> Tuple[np.ndarray, ...]:
+    elongation = np.radians(297.8501921 + 445267.1114034 * t)
+    sun_anomaly = np.radians(357.5291092 + 35999.0502909 * t)
+    moon_anomaly = np.radians(134.9633964 + 477198.8675055 * t)
+    latitude_arg = np.radians(93.2720950 + 483202.0175233 * t)
+    return elongation, sun_anomaly, moon_anomaly, latitude_arg
+
+
+def moon_equatorial(jd: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """Right ascension and declination of the Moon in degrees.
+
+    Uses the six largest longitude and four largest latitude terms of the
+    lunar theory, accurate to roughly 0.3°, i.e. about a minute of rise time.
+    """
+    t = _centuries(np.asarray(jd, dtype=float))
+    d, m, mp, f = _moon_arguments(t)
+    lon = (
+        218.3164477
+        + 481267.88123421 * t
+        + 6.289 * np.sin(mp)
+        + 1.274 * np.sin(2 * d - mp)
+        + 0.658 * np.sin(2 * d)
+        + 0.214 * np.sin(2 * mp)
+        - 0.186 * np.sin(m)
+        - 0.114 * np.sin(2 * f)
+    )
+    lat = (
+        5.128 * np.sin(f)
+        + 0.280 * np.sin(mp + f)
+        + 0.277 * np.sin(mp - f)
+        + 0.173 * np.sin(2 * d - f)
+    )
+    return _ecliptic_to_equatorial(lon, lat, t)
+
+
+def _sun_altitude(jd: np.ndarray) -> np.ndarray:
+    return np.full_like(jd, SUN_STANDARD_ALTITUDE)
+
+
+def _moon_altitude(jd: np.ndarray) -> np.ndarray:
+    d, _, mp, _ = _moon_arguments(_centuries(jd))
+    parallax = (
+        0.9508
+        + 0.0518 * np.cos(mp)
+        + 0.0095 * np.cos(2 * d - mp)
+        + 0.0078 * np.cos(2 * d)
+        + 0.0028 * np.cos(2 * mp)
+    )
+    return 0.7275 * parallax - MOON_REFRACTION
+
+
+def _solve_events(
+    day_start: np.ndarray,
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    position: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    altitude: Callable[[np.ndarray], np.ndarray],
+    rate: float,
+    rising: bool,
+) -> np.ndarray:
+    """Solve for the first rise (or set) after each ``day_start``.
+
+    All arguments broadcast together; the result holds Julian Days, with NaN
+    where the body does not rise (set) within the following day.
+    """
+    sign = -1.0 if rising else 1.0
+    lat_rad = np.radians(latitude)
+    jd = np.array(day_start, dtype=float)
+    for iteration in range(SOLVER_ITERATIONS):
+        ra, decl = position(jd)
+        decl_rad = np.radians(decl)
+        cos_h0 = (
+            np.sin(np.radians(altitude(jd))) - np.sin(lat_rad) * np.sin(decl_rad)
+        ) / (np.cos(lat_rad) * np.cos(decl_rad))
+        target = sign * np.degrees(np.arccos(np.clip(cos_h0, -1.0, 1.0)))
+        hour_angle = _gmst(jd) + longitude - ra
+        if iteration == 0:
+            jd = day_start + ((target - hour_angle) % 360.0) / rate
+        else:
+            jd = jd + ((target - hour_angle + 180.0) % 360.0 - 180.0) / rate
+
+    never = np.abs(cos_h0) > 1.0
+    outside = (jd < day_start) | (jd >= day_start + 1.0)
+    return np.where(never | outside, np.nan, jd)
+
+
+def local_day_start(jd_utc_midnight: ArrayLike, longitude: ArrayLike) -> np.ndarray:
+    """Julian Day of local mean midnight for a civil date at a longitude"""
+    return np.asarray(jd_utc_midnight, dtype=float) - np.asarray(longitude) / 360.0
+
+
+def sunrise_sunset(
+    day_start: ArrayLike, latitude: ArrayLike, longitude: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized sunrise and sunset Julian Days after each local ``day_start``"""
+    args = np.broadcast_arrays(
+        np.asarray(day_start, dtype=float),
+        np.asarray(latitude, dtype=float),
+        np.asarray(longitude, dtype=float),
+    )
+    rise = _solve_events(
+        *args, sun_equatorial, _sun_altitude, SOLAR_HOUR_ANGLE_RATE, True
+    )
+    fall = _solve_events(
+        *args, sun_equatorial, _sun_altitude, SOLAR_HOUR_ANGLE_RATE, False
+    )
+    return rise, fall
+
+
+def moonrise_moonset(
+    day_start: ArrayLike, latitude: ArrayLike, longitude: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized moonrise and moonset Julian Days (NaN on days without one)"""
+    args = np.broadcast_arrays(
+        np.asarray(day_start, dtype=float),
+        np.asarray(latitude, dtype=float),
+        np.asarray(longitude, dtype=float),
+    )
+    rise = _solve_events(
+        *args, moon_equatorial, _moon_altitude, LUNAR_HOUR_ANGLE_RATE, True
+    )
+    fall = _solve_events(
+        *args, moon_equatorial, _moon_altitude, LUNAR_HOUR_ANGLE_RATE, False
+    )
+    return rise, fall
+
+
+@dataclass(frozen=True)
+class YearlyRiseSet:
+    """Rise and set Julian Days for every local day of one year at one place"""
+
+    latitude: float
+    longitude: float
+    year: int
+    day_start: np.ndarray
+    sunrise: np.ndarray
+    sunset: np.ndarray
+    moonrise: np.ndarray
+    moonset: np.ndarray
+
+    def day_index(self, julian_day: float) -> int:
+        """Index of the local day containing ``julian_day``"""
+        index = int(np.floor(julian_day - self.day_start[0]))
+        if not 0 <= index < len(self.day_start):
+            raise ValueError(f"Julian Day {julian_day} outside year {self.year}")
+        return index
+
+
+def _compute_year(latitude: float, longitude: float, year: int) -> YearlyRiseSet:
+    first = datetime_to_julian_day(datetime(year, 1, 1, tzinfo=timezone.utc))
+    last = datetime_to_julian_day(datetime(year + 1, 1, 1, tzinfo=timezone.utc))
+    day_start = local_day_start(np.arange(first, last), longitude)
+    sunrise, sunset = sunrise_sunset(day_start, latitude, longitude)
+    moonrise, moonset = moonrise_moonset(day_start, latitude, longitude)
+    return YearlyRiseSet(
+        latitude=latitude,
+        longitude=longitude,
+        year=year,
+        day_start=day_start,
+        sunrise=sunrise,
+        sunset=sunset,
+        moonrise=moonrise,
+        moonset=moonset,
+    )
+
+
+_cached_year = lru_cache(maxsize=RISE_SET_CACHE_SIZE)(_compute_year)
+
+
+def get_yearly_rise_set(latitude: float, longitude: float, year: int) -> YearlyRiseSet:
+    """Rise/set tables for a location-year, solved once and cached.
+
+    The location is rounded to ``LOCATION_PRECISION`` decimals (about 1 km,
+    a few seconds of sunrise) so nearby requests share one cache entry.
+    """
+    lat = round(float(latitude), LOCATION_PRECISION)
+    lon = round(float(longitude), LOCATION_PRECISION)
+    if not CONFIG.get("cache_enabled", True):
+        return _compute_year(lat, lon, year)
+    return _cached_year(lat, lon, year)
+
+
+def rise_set_for_day(
+    julian_day: float, latitude: float, longitude: float
+) -> Tuple[YearlyRiseSet, int]:
+    """Cached yearly table and day index for the local day containing a JD"""
+    year = julian_day_to_datetime(julian_day + longitude / 360.0).year
+    table = get_yearly_rise_set(latitude, longitude, year)
+    index = int(np.floor(julian_day - table.day_start[0]))
+    if not 0 <= index < len(table.day_start):
+        # Within a few seconds of New Year the rounded table location can put
+        # the day in the adjacent year
+        table = get_yearly_rise_set(
+            latitude, longitude, year + (1 if index > 0 else -1)
+        )
+    return table, table.day_index(julian_day)
+
+
+def sunrise_sunset_for_days(
+    julian_days: np.ndarray, latitude: float, longitude: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cached sunrise and sunset of the local day containing each JD.
+
+    Reads the same yearly tables as ``rise_set_for_day``, one vectorized
+    lookup per year spanned; NaN where the Sun does not rise or set.
+    """
+    jd = np.asarray(julian_days, dtype=float)
+    sunrise = np.full(jd.shape, np.nan)
+    sunset = np.full(jd.shape, np.nan)
+    if jd.size == 0:
+        return sunrise, sunset
+    found = np.zeros(jd.shape, dtype=bool)
+    first = julian_day_to_datetime(float(jd.min()) + longitude / 360.0).year
+    last = julian_day_to_datetime(float(jd.max()) + longitude / 360.0).year
+    for year in range(first, last + 1):
+        table = get_yearly_rise_set(latitude, longitude, year)
+        index = np.floor(jd - table.day_start[0]).astype(int)
+        rows = ~found & (index >= 0) & (index < len(table.day_start))
+        sunrise[rows] = table.sunrise[index[rows]]
+        sunset[rows] = table.sunset[index[rows]]
+        found |= rows
+    # Days the rounded table location moves across New Year
+    for position in zip(*np.nonzero(~found)):
+        table, index = rise_set_for_day(float(jd[position]), latitude, longitude)
+        sunrise[position] = table.sunrise[index]
+        sunset[position] = table.sunset[index]
+    return sunrise, sunset
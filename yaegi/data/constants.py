@@ -280,6 +280,37 @@ KARANA_NAMES = {
     ],
 }
 
+MASA_NAMES = {
+    "en": [
+        "Chaitra",
+        "Vaishakha",
+        "Jyeshtha",
+        "Ashadha",
+        "Shravana",
+        "Bhadrapada",
+        "Ashwin",
+        "Kartika",
+        "Margashirsha",
+        "Pausha",
+        "Magha",
+        "Phalguna",
+    ],
+    "hi": [
+        "चैत्र",
+        "वैशाख",
+        "ज्येष्ठ",
+        "आषाढ़",
+        "श्रावण",
+        "भाद्रपद",
+        "आश्विन",
+        "कार्तिक",
+        "मार्गशीर्ष",
+        "पौष",
+        "माघ",
+        "फाल्गुन",
+    ],
+}
+
 RASHI_LORDS = {
     1: "Mars",
     2: "Venus",
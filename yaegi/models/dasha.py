@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 
 @dataclass
@@ -16,29 +16,37 @@ class DashaPeriod:
     def duration_days(self) -> int:
         return (self.end_date - self.start_date).days
 
+    def _now(self) -> datetime:
+        return datetime.now(self.start_date.tzinfo)
+
+    def remaining_days_at(self, as_of: datetime) -> int:
+        if as_of > self.end_date:
+            return 0
+        return (self.end_date - max(as_of, self.start_date)).days
+
+    def is_active_at(self, as_of: datetime) -> bool:
+        return self.start_date <= as_of < self.end_date
+
     @property
     def remaining_days(self) -> int:
-        now = datetime.now()
-        if now > self.end_date:
-            return 0
-        return (self.end_date - now).days
+        return self.remaining_days_at(self._now())
 
     @property
     def is_active(self) -> bool:
-        now = datetime.now()
-        return self.start_date <= now <= self.end_date
+        return self.is_active_at(self._now())
 
-    def to_dict(self) -> dict[str, any]:
+    def to_dict(self, as_of: Optional[datetime] = None) -> dict[str, any]:
+        as_of = as_of or self._now()
         return {
             "planet": self.planet,
             "start_date": self.start_date.isoformat(),
             "end_date": self.end_date.isoformat(),
             "duration_years": self.duration_years,
             "duration_days": self.duration_days,
-            "remaining_days": self.remaining_days,
+            "remaining_days": self.remaining_days_at(as_of),
             "level": self.level,
             "parent_dasha": self.parent_dasha,
-            "is_active": self.is_active,
+            "is_active": self.is_active_at(as_of),
         }
 
 
@@ -47,12 +55,22 @@ class VimshottariDasha:
     birth_date: datetime
     moon_nakshatra: int
     periods: list[DashaPeriod]
+    # Table-driven system the periods follow: vimshottari, yogini or ashtottari
+    system: str = "vimshottari"
+    # Compact DashaTimeline of the mahadashas and the lazily built DashaTree
+    # of nested periods, see DashaCalculator.get_dasha_tree
+    timeline: Optional[Any] = field(default=None, repr=False, compare=False)
+    tree: Optional[Any] = field(default=None, repr=False, compare=False)
 
-    def get_current_mahadasha(self) -> Optional[DashaPeriod]:
+    def get_current_mahadasha(
+        self, as_of: Optional[datetime] = None
+    ) -> Optional[DashaPeriod]:
+        as_of = as_of or datetime.now(self.birth_date.tzinfo)
         for period in self.periods:
-            if period.is_active and period.level == "mahadasha":
+            if period.is_active_at(as_of) and period.level == "mahadasha":
                 return period
         return None
 
-    def get_active_periods(self) -> list[DashaPeriod]:
-        return [period for period in self.periods if period.is_active]
+    def get_active_periods(self, as_of: Optional[datetime] = None) -> list[DashaPeriod]:
+        as_of = as_of or datetime.now(self.birth_date.tzinfo)
+        return [period for period in self.periods if period.is_active_at(as_of)]